@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import time
+from typing import List
+
+from logic_toolkit import batch
+
+
+def random_formula(rng: random.Random, depth: int, variables: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        return f"x{rng.randrange(variables)}"
+    if rng.random() < 0.2:
+        return f"¬{random_formula(rng, depth - 1, variables)}"
+    operator = rng.choice(['∧', '∨', '→'])
+    return f"({random_formula(rng, depth - 1, variables)} {operator} {random_formula(rng, depth - 1, variables)})"
+
+
+def main(worker_counts: List[int], cases: int = 2000) -> None:
+    rng = random.Random(0)
+    formulas = [random_formula(rng, 5, 12) for _ in range(cases)]
+
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    baseline = None
+    expected = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = list(batch.map('cnf', formulas, workers=workers, chunksize=32))
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            baseline, expected = elapsed, results
+        assert results == expected
+        print(f"{workers:>8}{elapsed:>10.2f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]]
+    if not counts:
+        cpus = os.cpu_count() or 1
+        counts = sorted({1, 2, 4, 8, 16, 32, 64, cpus} & set(range(1, cpus + 1)))
+    main(counts)
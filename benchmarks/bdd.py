@@ -0,0 +1,55 @@
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from logic_toolkit import bdd, evaluate
+from logic_toolkit.wff import WellFormedFormula
+
+
+def pairs(n: int) -> str:
+    # (x0 ↔ y0) ∧ ... : linear with x and y interleaved, exponential with
+    # all x above all y.
+    return ' ∧ '.join(f'((x{i} → y{i}) ∧ (y{i} → x{i}))' for i in range(n))
+
+
+def distributed(n: int) -> Tuple[str, str]:
+    # a ∧ (b0 ∨ ... ∨ bn) against its distributed form.
+    return f"a ∧ ({' ∨ '.join(f'b{i}' for i in range(n))})", ' ∨ '.join(f'(a ∧ b{i})' for i in range(n))
+
+
+def timed(action: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'pairs':>6}{'ordering':>12}{'nodes':>9}{'build':>12}{'sifted':>9}{'sift':>12}")
+    for n in sizes:
+        tree = WellFormedFormula(pairs(n))
+        blocked = [f'x{i}' for i in range(n)] + [f'y{i}' for i in range(n)]
+        counts = set()
+        for name, variables in [('blocked', blocked)] + [(heuristic, bdd.ordering([tree], heuristic)) for heuristic in bdd.Manager.ORDERINGS]:
+            manager = bdd.Manager(variables)
+            function, built = timed(lambda: manager.compile(tree))
+            nodes = function.size
+            _, sifted = timed(manager.sift)
+            counts.add(function.sat_count())
+            print(f"{n:>6}{name:>12}{nodes:>9}{built * 1000:>9.1f} ms{function.size:>9}{sifted * 1000:>9.1f} ms")
+        assert counts == {2 ** n}
+
+    print(f"\n{'terms':>6}{'bdd':>12}{'truth table':>14}")
+    for n in sizes:
+        left, right = distributed(2 * n)
+        same, elapsed = timed(lambda: bdd.equivalent(left, right))
+        assert same
+        if 2 * n + 1 <= 20:
+            _, table = timed(lambda: evaluate.equivalent(left, right))
+            table_text = f"{table * 1000:>11.1f} ms"
+        else:
+            table_text = f"{'-':>14}"
+        print(f"{2 * n:>6}{elapsed * 1000:>9.1f} ms{table_text}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [4, 6, 8, 10])
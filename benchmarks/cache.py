@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+from logic_toolkit.cache import ResultCache
+from logic_toolkit.tasks import TASKS
+
+
+def random_formula(rng: random.Random, depth: int, variables: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        return f"x{rng.randrange(variables)}"
+    if rng.random() < 0.2:
+        return f"¬{random_formula(rng, depth - 1, variables)}"
+    operator = rng.choice([' ∧ ', ' ∨ ', ' → '])
+    return f"({random_formula(rng, depth - 1, variables)}{operator}{random_formula(rng, depth - 1, variables)})"
+
+
+def spellings(rng: random.Random, formula: str) -> str:
+    # The same formula with different spacing, so repeats only hit the
+    # cache after compaction.
+    if rng.random() < 0.5:
+        formula = formula.replace(' ', '')
+    return formula.replace(' ', '  ') if rng.random() < 0.5 else formula
+
+
+def main(distinct_counts: List[int], cases: int = 4000) -> None:
+    print(f"{'distinct':>9}{'uncached':>11}{'memory':>11}{'cold disk':>11}{'warm disk':>11}{'hit rate':>10}")
+    for distinct in distinct_counts:
+        rng = random.Random(distinct)
+        formulas = [random_formula(rng, 5, 10) for _ in range(distinct)]
+        chosen = [rng.choice(formulas) for _ in range(cases)]
+        inputs = [spellings(rng, formula) for formula in chosen]
+
+        start = time.perf_counter()
+        expected = [TASKS['cnf'](text) for text in inputs]
+        uncached = time.perf_counter() - start
+
+        timings = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.db')
+            for cache in [ResultCache(), ResultCache(path=path), ResultCache(path=path)]:
+                task = cache.cached('cnf')(TASKS['cnf'])
+                start = time.perf_counter()
+                results = [task(text) for text in inputs]
+                timings.append(time.perf_counter() - start)
+                assert results == expected
+                if cache.store is not None:
+                    cache.store.close()
+            hit_rate = cache.stats['hits'] / cases
+
+        print(f"{distinct:>9}" + ''.join(f"{seconds * 1000:>8.0f} ms" for seconds in [uncached] + timings) + f"{hit_rate:>9.0%}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
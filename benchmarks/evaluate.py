@@ -0,0 +1,43 @@
+import glob
+import itertools
+import sys
+import time
+from typing import List
+
+from logic_toolkit.cnf import CNF
+from logic_toolkit.evaluate import TruthTable, equivalent
+from logic_toolkit.wff import WellFormedFormula
+
+
+def formula(n: int) -> str:
+    # Valid for every n: some neighbouring pair differs, or all agree.
+    names = [f'x{i}' for i in range(n)]
+    pairs = ' ∨ '.join(f'({names[i]} ∧ ¬{names[(i + 1) % n]})' for i in range(n))
+    return f"{pairs} ∨ ({' ∧ '.join(names)}) ∨ ({' ∧ '.join('¬' + name for name in names)})"
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'variables':>10}{'bit-parallel':>16}{'per assignment':>18}")
+    for n in sizes:
+        table = TruthTable(formula(n))
+        start = time.perf_counter()
+        assert table.is_tautology()
+        parallel = time.perf_counter() - start
+
+        single = None
+        if n <= 14:
+            start = time.perf_counter()
+            assert all(table.evaluate(dict(zip(table.variables, bits))) for bits in itertools.product([False, True], repeat=n))
+            single = time.perf_counter() - start
+        print(f"{n:>10}{parallel * 1000:>13.1f} ms" + (f"{single * 1000:>15.1f} ms" if single is not None else f"{'skipped':>18}"))
+
+    start = time.perf_counter()
+    for path in sorted(glob.glob('tests/test2*.txt')):
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = WellFormedFormula(f.read().split('\n')[1].strip())
+        assert equivalent(CNF(tree), tree), path
+    print(f"CNF(f) ≡ f for tests/test2*: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 14, 18, 22, 25])
@@ -0,0 +1,79 @@
+import random
+from typing import List
+
+from logic_toolkit.clauses import ClauseSet
+
+# Every generator takes an explicit seed, so a size sweep produces the same
+# inputs on every run and on every machine.
+
+
+def random_formula(depth: int, variables: int, width: int = 2, seed: int = 0) -> str:
+    # A full tree: every operator below depth has children, ∧ and ∨ take
+    # width operands, so the size grows like width ** depth.
+    rng = random.Random(seed)
+
+    def build(level: int) -> str:
+        if level == 0:
+            return f'x{rng.randrange(variables)}'
+        choice = rng.random()
+        if choice < 0.15:
+            return f'¬{build(level - 1)}'
+        if choice < 0.35:
+            return f'({build(level - 1)} → {build(level - 1)})'
+        operator = ' ∧ ' if choice < 0.675 else ' ∨ '
+        return f'({operator.join(build(level - 1) for _ in range(width))})'
+
+    return build(depth)
+
+
+def distribution_family(n: int) -> str:
+    # (a0 ∧ b0) ∨ ... ∨ (an ∧ bn): distributing gives 2 ** n clauses.
+    return ' ∨ '.join(f'(a{i} ∧ b{i})' for i in range(n))
+
+
+def random_cnf(variables: int, ratio: float = 4.26, k: int = 3, seed: int = 0) -> ClauseSet:
+    # Uniform random k-SAT; 4.26 clauses per variable is where 3-SAT is
+    # hardest.
+    rng = random.Random(seed)
+    clause_set = ClauseSet([f'x{i}' for i in range(variables)])
+    for _ in range(int(variables * ratio)):
+        clause_set.add_clause([(v + 1) * rng.choice([1, -1]) for v in rng.sample(range(variables), k)])
+    return clause_set
+
+
+def horn_rule_base(rules: int, variables: int = 0, seed: int = 0) -> str:
+    # Definite rules with one to three premises over random variables,
+    # plus a fact (⊤ → x) for roughly one rule in ten.
+    rng = random.Random(seed)
+    variables = variables or max(rules // 4, 2)
+    names = [f'x{i}' for i in range(variables)]
+    parts: List[str] = [f'(⊤ → {name})' for name in rng.sample(names, max(rules // 10, 1))]
+    for _ in range(rules):
+        body = ' ∧ '.join(rng.sample(names, rng.randint(1, min(3, variables))))
+        parts.append(f'({body} → {rng.choice(names)})')
+    return ' ∧ '.join(parts)
+
+
+def nested_proof(blocks: int, depth: int = 3) -> str:
+    # A valid proof in the tests/test5*.txt layout: one premise, then per
+    # block depth nested assumptions q<b>_<j>, the conjunction of the
+    # premise with the innermost one, and →i discharging each box in turn.
+    lines = ['input:', f"{1:>2}    p        Premise"]
+    number = 1
+    for block in range(blocks):
+        starts = []
+        for level in range(depth):
+            lines.append(f"{'':6}{'  ' * level}BeginScope")
+            number += 1
+            starts.append(number)
+            lines.append(f"{number:>2}    {'  ' * (level + 1)}q{block}_{level}        Assumption")
+        number += 1
+        conclusion = f'p ∧ q{block}_{depth - 1}'
+        lines.append(f"{number:>2}    {'  ' * depth}{conclusion}        ∧i, 1, {starts[-1]}")
+        for level in reversed(range(depth)):
+            lines.append(f"{'':6}{'  ' * level}EndScope")
+            conclusion = f'q{block}_{level} → ({conclusion})'
+            number += 1
+            lines.append(f"{number:>2}    {'  ' * level}{conclusion}        →i, {starts[level]}-{number - 1}")
+    lines += ['', 'output:', 'Valid Deduction']
+    return '\n'.join(lines)
@@ -0,0 +1,71 @@
+import gc
+import random
+import sys
+import time
+from typing import List, Set, Tuple
+
+from logic_toolkit.horn import HornFormula
+
+
+# The previous fixpoint loop, kept here only as the benchmark reference.
+def fixpoint(clauses: List[Tuple[Set[str], str]]) -> Tuple[bool, Set[str]]:
+    true_vars = {'⊤'}
+    changed = True
+    while changed:
+        changed = False
+        for antecedent, consequent in clauses:
+            if antecedent and antecedent.issubset(true_vars):
+                if consequent == '⊥':
+                    return False, set()
+                if consequent not in true_vars:
+                    true_vars.add(consequent)
+                    changed = True
+    true_vars.discard('⊤')
+    return True, true_vars
+
+
+def rule_base(size: int, seed: int = 0) -> Tuple[str, List[Tuple[Set[str], str]]]:
+    # A chain x1 → x2 → ... over half the clauses, listed back to front so
+    # the fixpoint loop needs one pass per link, padded with rules whose
+    # premise y<i> is never derived.
+    rng = random.Random(seed)
+    length = max(size // 2, 1)
+    chain = [({'⊤'}, 'x1')] + [({f'x{i}'}, f'x{i + 1}') for i in range(1, length)]
+    clauses = list(reversed(chain))
+    while len(clauses) < size:
+        premises = {f'y{rng.randrange(length)}', f'x{rng.randrange(1, length + 1)}'}
+        clauses.append((premises, f'x{rng.randrange(1, length + 1)}'))
+
+    formulas = [f"({' ∧ '.join(sorted(premises))} → {consequent})" for premises, consequent in clauses]
+    while len(formulas) > 1:
+        formulas = [f"({formulas[i]} ∧ {formulas[i + 1]})" if i + 1 < len(formulas) else formulas[i] for i in range(0, len(formulas), 2)]
+    return formulas[0], clauses
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'clauses':>10}{'counters':>14}{'fixpoint':>14}")
+    for size in sizes:
+        formula, _ = rule_base(size)
+        horn = HornFormula(formula)
+
+        # Like timeit, keep the collector out of the measurement; both
+        # columns include clause extraction from the tree.
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        result = horn.check_satisfiability()
+        counters = time.perf_counter() - start
+
+        loop = None
+        if size <= 16000:
+            start = time.perf_counter()
+            clauses = horn._HornFormula__extract_horn_clauses(horn.root)
+            assert fixpoint(clauses) == result
+            loop = time.perf_counter() - start
+        gc.enable()
+
+        print(f"{size:>10}{counters * 1000:>11.1f} ms" + (f"{loop * 1000:>11.1f} ms" if loop is not None else f"{'skipped':>14}"))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 4000, 16000, 100000])
@@ -0,0 +1,35 @@
+import random
+import sys
+import time
+from typing import List
+
+from benchmarks.batch import random_formula
+from logic_toolkit import instrument
+from logic_toolkit.tasks import TASKS
+
+
+def run(formulas: List[str]) -> float:
+    start = time.perf_counter()
+    for formula in formulas:
+        TASKS['cnf'](formula)
+        TASKS['sat'](formula)
+    return time.perf_counter() - start
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'formulas':>9}{'off':>12}{'on':>12}{'overhead':>10}")
+    for size in sizes:
+        rng = random.Random(size)
+        formulas = [random_formula(rng, 5, 8) for _ in range(size)]
+        off = run(formulas)
+        with instrument.profiling() as report:
+            on = run(formulas)
+        print(f"{size:>9}{off * 1000:>9.1f} ms{on * 1000:>9.1f} ms{on / off - 1:>9.1%}")
+    for name, timer in report['timers'].items():
+        print(f"  {name:<28}{timer['calls']:>8} calls{timer['seconds'] * 1000:>10.1f} ms")
+    for name, value in report['counters'].items():
+        print(f"  {name:<28}{value:>8}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000])
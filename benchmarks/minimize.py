@@ -0,0 +1,48 @@
+import random
+import sys
+import time
+from typing import List
+
+from logic_toolkit import bdd
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.cnf import CNF
+from logic_toolkit.minimize import Minimizer, minimize
+
+
+def planted(clauses: int, variables: int, seed: int = 0) -> ClauseSet:
+    # Random 3-clauses all satisfied by one hidden assignment, so the set
+    # stays satisfiable however dense it gets, and dense sets have many
+    # clauses that merge or follow from others.
+    rng = random.Random(seed)
+    hidden = [rng.random() < 0.5 for _ in range(variables)]
+    clause_set = ClauseSet([f'x{i}' for i in range(variables)])
+    while len(clause_set) < clauses:
+        chosen = rng.sample(range(variables), 3)
+        literals = [(i + 1) * rng.choice([1, -1]) for i in chosen]
+        if any((literal > 0) == hidden[abs(literal) - 1] for literal in literals):
+            clause_set.add_clause(literals)
+    return clause_set
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'vars':>6}{'clauses':>9}{'literals':>10}{'exact':>12}{'time':>11}{'heuristic':>14}{'time':>11}")
+    for variables in (10, 24):
+        for clauses in sizes:
+            formula = CNF(planted(clauses, variables, seed=clauses))
+            row = []
+            for limit in (variables, 0):
+                if limit > 12:
+                    row.append(f"{'-':>12}{'-':>11}")
+                    continue
+                minimizer = Minimizer(exact_limit=limit)
+                start = time.perf_counter()
+                minimized = minimize(formula, minimizer)
+                elapsed = time.perf_counter() - start
+                assert bdd.equivalent(formula, minimized)
+                output = minimizer.report['output']
+                row.append(f"{output['clauses']:>6}/{output['literals']:<5}{elapsed * 1000:>8.0f} ms")
+            print(f"{variables:>6}{clauses:>9}{3 * clauses:>10}{row[0]}{'':>3}{row[1]}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [25, 50, 100, 200, 400])
@@ -0,0 +1,107 @@
+import sys
+import time
+from typing import Callable, List
+
+from logic_toolkit.base import Node
+from logic_toolkit.wff import WellFormedFormula
+
+# The previous slicing parser, kept here only as the benchmark reference.
+class SlicingParser:
+    def parse(self, formula: str) -> Node:
+        formula = formula.replace(' ', '')
+        if not formula:
+            raise ValueError("Empty formula")
+        return self.__parse_expression(formula)
+
+    def __parse_expression(self, formula: str) -> Node:
+        if not formula:
+            raise ValueError("Empty expression")
+
+        while formula.startswith('(') and formula.endswith(')') and self.__matching_parenthesis(formula, 0) == len(formula) - 1:
+            formula = formula[1:-1]
+
+        main_op_pos = self.__find_main_operator(formula)
+
+        if main_op_pos == -1:
+            if formula.startswith('¬'):
+                if not formula[1:]:
+                    raise ValueError("Missing operand for negation")
+                return Node('¬', right=self.__parse_expression(formula[1:]))
+            elif formula in ['⊤', '⊥'] or (len(formula) == 1 and formula.isalpha()):
+                return Node(formula)
+            raise ValueError(f"Invalid expression: {formula}")
+
+        left_expr = formula[:main_op_pos]
+        right_expr = formula[main_op_pos + 1:]
+        if not left_expr or not right_expr:
+            raise ValueError(f"Missing operand for operator {formula[main_op_pos]}")
+
+        return Node(formula[main_op_pos], left=self.__parse_expression(left_expr), right=self.__parse_expression(right_expr))
+
+    def __find_main_operator(self, formula: str) -> int:
+        precedence = {'→': 1, '∨': 2, '∧': 3}
+        main_op_pos = -1
+        main_op_precedence = float('inf')
+        paren_level = 0
+        for i, char in enumerate(formula):
+            if char == '(':
+                paren_level += 1
+            elif char == ')':
+                paren_level -= 1
+            elif paren_level == 0 and char in precedence:
+                if precedence[char] < main_op_precedence:
+                    main_op_pos = i
+                    main_op_precedence = precedence[char]
+                elif precedence[char] == main_op_precedence and char != '→':
+                    main_op_pos = i
+        return main_op_pos
+
+    def __matching_parenthesis(self, formula: str, start: int) -> int:
+        paren_count = 1
+        for i in range(start + 1, len(formula)):
+            if formula[i] == '(':
+                paren_count += 1
+            elif formula[i] == ')':
+                paren_count -= 1
+                if paren_count == 0:
+                    return i
+        return -1
+
+
+def chain(size: int) -> str:
+    return ' ∧ '.join('p' for _ in range(size // 2 + 1))
+
+def nested(size: int) -> str:
+    depth = size // 4
+    return '(' * depth + 'p' + ''.join(' ∨ q)' for _ in range(depth))
+
+def balanced(size: int) -> str:
+    formulas = ['p', 'q', 'r', 's'] * (size // 8 + 1)
+    while len(formulas) > 1:
+        formulas = [f"({formulas[i]} → ¬{formulas[i + 1]})" if i + 1 < len(formulas) else formulas[i] for i in range(0, len(formulas), 2)]
+    return formulas[0]
+
+
+def measure(parse: Callable[[str], object], formula: str) -> str:
+    start = time.perf_counter()
+    try:
+        parse(formula)
+    except RecursionError:
+        return "RecursionError"
+    return f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+
+def main(sizes: List[int]) -> None:
+    slicing = SlicingParser()
+    print(f"{'family':<10}{'symbols':>10}{'tokenizer':>16}{'slicing':>18}")
+    for name, family in [('chain', chain), ('nested', nested), ('balanced', balanced)]:
+        for size in sizes:
+            formula = family(size)
+            symbols = len(formula.replace(' ', ''))
+            new = measure(WellFormedFormula, formula)
+            old = measure(slicing.parse, formula) if symbols <= 20000 else "skipped"
+            print(f"{name:<10}{symbols:>10}{new:>16}{old:>18}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
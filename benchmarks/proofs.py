@@ -0,0 +1,75 @@
+import gc
+import sys
+import time
+from typing import List, Tuple, Union
+
+from logic_toolkit.natural_deduction import NaturalDeduction, ProofChecker
+from logic_toolkit.proof import Proof
+from logic_toolkit.wff import WellFormedFormula
+
+
+def proof(boxes: int) -> List[Union[str, Tuple]]:
+    # One premise, then per box: assume q<i>, conjoin it with the premise and
+    # discharge with →i, so every box is closed by the time the next opens.
+    events: List[Union[str, Tuple]] = [(1, WellFormedFormula('p'), 'Premise', [])]
+    number = 1
+    for i in range(boxes):
+        assumption, conjunction = number + 1, number + 2
+        events += [
+            'BeginScope',
+            (assumption, WellFormedFormula(f'q{i}'), 'Assumption', []),
+            (conjunction, WellFormedFormula(f'p ∧ q{i}'), '∧i', [1, assumption]),
+            'EndScope',
+            (number + 3, WellFormedFormula(f'q{i} → p ∧ q{i}'), '→i', [(assumption, conjunction)]),
+        ]
+        number += 3
+    return events
+
+
+def check_incremental(events: List[Union[str, Tuple]]) -> bool:
+    checker = ProofChecker()
+    for event in events:
+        if event == 'BeginScope':
+            checker.begin_scope()
+        elif event == 'EndScope':
+            checker.end_scope()
+        elif not checker.add_line(*event):
+            return False
+    return True
+
+
+# The phase5 loop: every line goes back through check_rule, which scans
+# the list of scopes seen so far for each reference.
+def check_rescan(events: List[Union[str, Tuple]]) -> bool:
+    nd = NaturalDeduction()
+    proof = Proof()
+    for event in events:
+        if event == 'BeginScope':
+            proof.begin_scope()
+        elif event == 'EndScope':
+            proof.end_scope()
+        else:
+            number, formula, rule, refs = event
+            proof.add_line(number, formula, rule, list(refs))
+            if not nd.check_rule(number, proof):
+                return False
+    return True
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'lines':>10}{'checker':>14}{'rescan':>14}")
+    for boxes in sizes:
+        events = proof(boxes)
+        timings = []
+        for check in [check_incremental, check_rescan]:
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            assert check(events)
+            timings.append(time.perf_counter() - start)
+            gc.enable()
+        print(f"{3 * boxes + 1:>10}" + ''.join(f"{t * 1000:>11.1f} ms" for t in timings))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [300, 1000, 3000, 10000])
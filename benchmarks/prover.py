@@ -0,0 +1,39 @@
+import sys
+import time
+from typing import List, Tuple
+
+from logic_toolkit.natural_deduction import ProofChecker
+from logic_toolkit.proof import Proof
+from logic_toolkit.prover import ProofSearch
+
+SEQUENTS: List[Tuple[List[str], str]] = [
+    (['p → q', 'q → r'], 'p → r'),
+    ([], 'p ∨ ¬p'),
+    ([], '((p → q) → p) → p'),
+    (['¬(p ∧ q)'], '¬p ∨ ¬q'),
+    (['p ∧ (q ∨ r)'], '(p ∧ q) ∨ (p ∧ r)'),
+    (['(p ∨ q) ∨ r'], 'p ∨ (q ∨ r)'),
+    ([], '(p → q) ∨ (q → p)'),
+    (['¬(p ∧ q ∧ r)'], '¬p ∨ ¬q ∨ ¬r'),
+    (['(p ∨ q) ∧ (r ∨ s)'], '(p ∧ r) ∨ (p ∧ s) ∨ (q ∧ r) ∨ (q ∧ s)'),
+]
+
+
+def main(timeout: float) -> None:
+    print(f"{'sequent':<60}{'lines':>7}{'nodes':>9}{'time':>12}")
+    for premises, goal in SEQUENTS:
+        search = ProofSearch(timeout=timeout)
+        start = time.perf_counter()
+        text = search.search(premises, goal)
+        elapsed = time.perf_counter() - start
+        sequent = f"{', '.join(premises)} ⊢ {goal}"
+        if text is None:
+            print(f"{sequent:<60}{'-':>7}{search.nodes:>9}{elapsed * 1000:>9.1f} ms")
+            continue
+        proof = Proof.parse(text)
+        assert ProofChecker().check(proof)
+        print(f"{sequent:<60}{len(proof):>7}{search.nodes:>9}{elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
@@ -0,0 +1,102 @@
+import argparse
+import os
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from logic_toolkit import dimacs
+from logic_toolkit.sat import Solver
+
+Instance = Tuple[int, List[List[int]]]
+
+
+def random_ksat(variables: int, ratio: float = 4.26, k: int = 3, seed: int = 0) -> Instance:
+    rng = random.Random(seed)
+    clauses = [[rng.choice([-1, 1]) * v for v in rng.sample(range(1, variables + 1), k)] for _ in range(int(ratio * variables))]
+    return variables, clauses
+
+
+def pigeonhole(holes: int, seed: int = 0) -> Instance:
+    # holes + 1 pigeons into holes holes: unsatisfiable, and hard for
+    # resolution, so conflicts grow exponentially with the size.
+    pigeons = holes + 1
+    var = lambda p, h: p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    for h in range(holes):
+        for a in range(pigeons):
+            for b in range(a + 1, pigeons):
+                clauses.append([-var(a, h), -var(b, h)])
+    return pigeons * holes, clauses
+
+
+def parity_chain(length: int, seed: int = 0) -> Instance:
+    # Two XOR chains over the same inputs, taken in different orders, are
+    # required to disagree: unsatisfiable, but only visibly so once the
+    # solver has related every gate of one chain to the other.
+    rng = random.Random(seed)
+    xs = list(range(1, length + 1))
+    clauses: List[List[int]] = []
+    outputs = []
+    for chain in range(2):
+        order = xs[:]
+        rng.shuffle(order)
+        base = length * (chain + 1)
+        previous = order[0]
+        for i, x in enumerate(order[1:], 1):
+            g = base + i
+            clauses += [[-g, previous, x], [-g, -previous, -x], [g, -previous, x], [g, previous, -x]]
+            previous = g
+        outputs.append(previous)
+    clauses += [[outputs[0], outputs[1]], [-outputs[0], -outputs[1]]]
+    return 3 * length, clauses
+
+
+FAMILIES: Dict[str, Callable[..., Instance]] = {
+    'random-3sat': random_ksat,
+    'pigeonhole': pigeonhole,
+    'parity': parity_chain,
+}
+
+SUITE = [
+    ('random-3sat', 50), ('random-3sat', 100), ('random-3sat', 150),
+    ('pigeonhole', 5), ('pigeonhole', 6), ('pigeonhole', 7),
+    ('parity', 12), ('parity', 16), ('parity', 20),
+]
+
+
+def instances(args: argparse.Namespace) -> Iterator[Tuple[str, Instance]]:
+    if args.files:
+        for path in args.files:
+            with dimacs.DimacsReader(path, use_mmap=True) as reader:
+                yield os.path.basename(path), (reader.num_variables, list(reader))
+    else:
+        for family, size in SUITE:
+            yield f'{family}-{size}', FAMILIES[family](size, seed=args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the CDCL solver on generated instances.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write', metavar='DIR', help="also write every instance as DIMACS into DIR")
+    parser.add_argument('files', nargs='*', metavar='CNF', help="solve these DIMACS files instead of the generated suite")
+    args = parser.parse_args()
+
+    print(f"{'instance':<20}{'vars':>7}{'clauses':>9}{'result':>8}{'conflicts':>11}{'time':>12}")
+    for name, instance in instances(args):
+        if args.write:
+            os.makedirs(args.write, exist_ok=True)
+            dimacs.write(instance[1], os.path.join(args.write, f'{name}.cnf'), num_variables=instance[0])
+
+        variables, clauses = instance
+        start = time.perf_counter()
+        solver = Solver(clauses, variables)
+        result = solver.solve()
+        elapsed = time.perf_counter() - start
+        if result:
+            model = set(solver.model)
+            assert all(any(literal in model for literal in clause) for clause in clauses)
+        print(f"{name:<20}{variables:>7}{len(clauses):>9}{'SAT' if result else 'UNSAT':>8}{solver.conflicts:>11}{elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import random
+import sys
+import time
+from typing import List
+
+from logic_toolkit.cnf import CNF
+from logic_toolkit.simplify import Simplifier
+from logic_toolkit.wff import WellFormedFormula
+
+
+def dnf(terms: int, variables: int, seed: int = 0) -> str:
+    # Distributing a DNF yields 2**terms clauses that repeat literals and
+    # duplicate or subsume one another.
+    rng = random.Random(seed)
+    names = [f'x{i}' for i in range(variables)]
+    return ' ∨ '.join(f"({' ∧ '.join(rng.sample(names, 2))})" for _ in range(terms))
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'terms':>6}{'clauses':>10}{'simplified':>12}{'literals':>10}{'simplified':>12}{'convert':>11}{'simplify':>11}")
+    for terms in sizes:
+        tree = WellFormedFormula(dnf(terms, variables=terms // 2 + 2, seed=terms))
+        start = time.perf_counter()
+        plain = CNF(tree)
+        converted = time.perf_counter() - start
+        start = time.perf_counter()
+        simplifier = Simplifier(units=True)
+        simplified = CNF(tree, simplify=simplifier)
+        elapsed = time.perf_counter() - start - converted
+
+        before = plain.to_clause_set()
+        after = simplified.to_clause_set()
+        raw = str(plain).count(' ∧ ') + 1
+        print(f"{terms:>6}{raw:>10}{len(after):>12}{str(plain).count(' ∨ ') + raw:>10}{after.num_literals:>12}"
+              f"{converted * 1000:>8.1f} ms{max(elapsed, 0) * 1000:>8.1f} ms")
+        for stage, removed in simplifier.report.items():
+            if removed['clauses'] or removed['literals']:
+                print(f"{'':>8}{stage:<18}-{removed['clauses']} clauses, -{removed['literals']} literals")
+        assert len(after) <= len(before)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [6, 8, 10, 12])
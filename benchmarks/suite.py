@@ -0,0 +1,131 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from benchmarks.generators import distribution_family, horn_rule_base, nested_proof, random_cnf, random_formula
+from benchmarks.minimize import planted
+from logic_toolkit import bdd
+from logic_toolkit.cnf import CNF
+from logic_toolkit.horn import HornFormula
+from logic_toolkit.minimize import minimize
+from logic_toolkit.natural_deduction import ProofChecker
+from logic_toolkit.proof import Proof
+from logic_toolkit.sat import Solver
+from logic_toolkit.wff import WellFormedFormula
+
+FORMAT = 1
+
+
+class Case(NamedTuple):
+    # setup builds the input for one size outside the timed region; run is
+    # what gets timed, repeat times on the same input.
+    unit: str
+    setup: Callable[[int, int], Any]
+    run: Callable[[Any], Any]
+    quick: List[int]
+    full: List[int]
+
+
+def _formulas(depth: int, seed: int, count: int = 20) -> List[str]:
+    return [random_formula(depth, 8, 3, seed + i) for i in range(count)]
+
+
+CASES: Dict[str, Case] = {
+    'parse': Case('depth', _formulas, lambda texts: [WellFormedFormula(text) for text in texts], [2, 3, 4], [2, 3, 4, 5]),
+    'cnf.distribute': Case('terms', lambda n, seed: distribution_family(n), CNF, [6, 8, 10], [6, 8, 10, 12]),
+    'cnf.tseitin': Case('depth', _formulas, lambda texts: [CNF(text, encoding='tseitin') for text in texts], [2, 3, 4], [2, 3, 4, 5]),
+    'horn': Case('rules', horn_rule_base, lambda text: HornFormula(text).check_satisfiability(), [100, 500, 2000], [100, 1000, 5000, 20000]),
+    'sat': Case('vars', lambda n, seed: random_cnf(n, seed=seed), lambda clause_set: Solver(clause_set).solve(), [20, 40, 60], [20, 50, 80, 110]),
+    'proof': Case('blocks', lambda n, seed: Proof.parse(nested_proof(n, 4)), lambda proof: ProofChecker().check(proof), [10, 50, 200], [10, 100, 500, 2000]),
+    'bdd': Case('terms', lambda n, seed: distribution_family(n), bdd.build, [8, 16, 32], [8, 16, 32, 64]),
+    'minimize': Case('clauses', lambda n, seed: CNF(planted(n, 10, seed)), minimize, [25, 50], [25, 50, 100, 200]),
+}
+
+
+def measure(case: Case, size: int, repeat: int, seed: int) -> float:
+    # The fastest of the repeats: the others only add scheduling noise.
+    data = case.setup(size, seed)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(names: Sequence[str], quick: bool = False, repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names:
+        case = CASES[name]
+        results[name] = {}
+        for size in case.quick if quick else case.full:
+            seconds = measure(case, size, repeat, seed)
+            results[name][str(size)] = seconds
+            print(f"{name:<16}{case.unit:>8}{size:>7}{seconds * 1000:>12.2f} ms", flush=True)
+    return {
+        'format': FORMAT,
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'quick': quick,
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float, floor: float = 0.001) -> List[str]:
+    # A row regresses when it is more than threshold slower than the
+    # baseline and by more than floor seconds, so sub-millisecond jitter
+    # never fails the run. Rows missing from either side are skipped.
+    if baseline.get('format') != FORMAT:
+        raise ValueError(f"baseline format {baseline.get('format')} is not {FORMAT}")
+    regressions = []
+    print(f"\n{'case':<16}{'size':>7}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, sizes in report['results'].items():
+        for size, seconds in sizes.items():
+            before = baseline['results'].get(name, {}).get(size)
+            if before is None:
+                continue
+            change = seconds / before - 1 if before else 0.0
+            regressed = change > threshold and seconds - before > floor
+            print(f"{name:<16}{size:>7}{before * 1000:>9.2f} ms{seconds * 1000:>9.2f} ms{change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+            if regressed:
+                regressions.append(f'{name}[{size}]')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='Time each engine across size sweeps.')
+    parser.add_argument('cases', nargs='*', metavar='case', help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--quick', action='store_true', help='use the smaller size sweeps')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per size; the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against an earlier --output file')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before a row fails (default: 0.25)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    report = run(args.cases or list(CASES), args.quick, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import sys
+import time
+from typing import Callable, List
+
+from logic_toolkit.cnf import CNF
+from logic_toolkit.horn import HornFormula
+from logic_toolkit.wff import WellFormedFormula
+
+
+def chain(n: int, operator: str = '∧') -> str:
+    return f' {operator} '.join(f'p{i % 7}' for i in range(n))
+
+
+def timed(action: Callable[[], object], nodes: int) -> str:
+    start = time.perf_counter()
+    action()
+    return f'{(time.perf_counter() - start) / nodes * 1e6:>10.2f} µs'
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'conjuncts':>10}{'str':>13}{'==':>13}{'CNF':>13}{'Horn':>13}")
+    for n in sizes:
+        # Left-nested conjunctions and right-nested implications: both are
+        # chains as deep as the formula is long.
+        tree = WellFormedFormula(chain(n))
+        other = WellFormedFormula(chain(n))
+        implications = WellFormedFormula(chain(n, '→'))
+        horn = f"{chain(n)} ∧ ({chain(n)} → q)"
+        nodes = 2 * n - 1
+        print(f"{n:>10}"
+              f"{timed(lambda: str(tree), nodes)}"
+              f"{timed(lambda: tree == other, nodes)}"
+              f"{timed(lambda: CNF(implications), nodes)}"
+              f"{timed(lambda: HornFormula(horn).check_satisfiability(), 2 * nodes)}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000])
@@ -0,0 +1,51 @@
+import glob
+import sys
+import time
+from typing import Callable, List
+
+from logic_toolkit.cnf import CNF
+from logic_toolkit.natural_deduction import ProofChecker
+from logic_toolkit.proof import Proof
+from logic_toolkit.wff import WellFormedFormula
+
+
+def read_input(path: str) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        input_lines = f.read().split('\n')
+    return input_lines[1:input_lines.index('output:')]
+
+
+def cnf_workload(path: str) -> Callable[[], None]:
+    formula = WellFormedFormula(read_input(path)[0].strip())
+    return lambda: CNF(formula)
+
+
+def proof_workload(path: str) -> Callable[[], None]:
+    with open(path, 'r', encoding='utf-8') as f:
+        parsed = Proof.parse(f.read())
+
+    def run() -> None:
+        checker = ProofChecker()
+        checker.check(parsed)
+    return run
+
+
+def measure(run: Callable[[], None], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat: int) -> None:
+    for pattern, workload in [('tests/test2*.txt', cnf_workload), ('tests/test5*.txt', proof_workload)]:
+        total = 0.0
+        for path in sorted(glob.glob(pattern)):
+            elapsed = measure(workload(path), repeat)
+            total += elapsed
+            print(f"{path:<22}{elapsed:>10.1f} us")
+        print(f"{pattern:<22}{total:>10.1f} us total")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,5 @@
+import sys
+
+from logic_toolkit.cli import main
+
+sys.exit(main())
@@ -1,7 +1,63 @@
-from typing import Optional
-from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from weakref import WeakValueDictionary
+import sys
+
+from logic_toolkit.printer import printer
+
+def is_variable(value: str) -> bool:
+    return value[:1].isalpha() and all(char.isalnum() or char == '_' for char in value)
+
+class SymbolTable:
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.__ids: Dict[str, int] = {}
+        self.__names: List[str] = []
+        for name in names:
+            self.intern(name)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(symbols={len(self.__names)})'
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__names)
+
+    def __getitem__(self, name: str) -> int:
+        return self.__ids[name]
+
+    @property
+    def names(self) -> List[str]:
+        return self.__names
+
+    def intern(self, name: str) -> int:
+        symbol = self.__ids.get(name)
+        if symbol is None:
+            if not is_variable(name):
+                raise ValueError(f"Invalid variable name: {name}")
+            self.__names.append(sys.intern(name))
+            symbol = self.__ids[name] = len(self.__names)
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        if symbol < 1 or symbol > len(self.__names):
+            raise KeyError(f"Unknown symbol: {symbol}")
+        return self.__names[symbol - 1]
+
+    def fresh(self, prefix: str) -> str:
+        counter = len(self.__names) + 1
+        while f"{prefix}{counter}" in self.__ids:
+            counter += 1
+        name = f"{prefix}{counter}"
+        self.intern(name)
+        return name
 
 class Node:
+    __slots__ = ('value', '__left', '__right')
+
     def __init__(self, value: str,  left: Optional["Node"] = None, right: Optional["Node"] = None) -> None:
         self.value = value
         self.left = left
@@ -14,9 +70,22 @@ class Node:
         return self.value
     
     def __eq__(self, other: "Node") -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Node):
             return False
-        return self.value == other.value and self.left == other.left and self.right == other.right
+        pairs = [(self, other)]
+        while pairs:
+            a, b = pairs.pop()
+            if a is b:
+                continue
+            if a is None or b is None or a.value != b.value:
+                return False
+            if isinstance(a, InternedNode) and isinstance(b, InternedNode):
+                return False
+            pairs.append((a.right, b.right))
+            pairs.append((a.left, b.left))
+        return True
 
     @property
     def left(self) -> Optional["Node"]:
@@ -41,7 +110,164 @@ class Node:
             raise TypeError("Left child must be a Node instance or None.")
     
     def copy(self) -> "Node":
-        return deepcopy(self)
+        # Explicit-stack copy: avoids deepcopy's memo bookkeeping and shares
+        # interned subtrees, which are immutable.
+        root = Node(self.value)
+        stack = [(self, root)]
+        while stack:
+            source, target = stack.pop()
+            for side in ('left', 'right'):
+                child = getattr(source, side)
+                if child is None:
+                    continue
+                if isinstance(child, InternedNode):
+                    setattr(target, side, child)
+                else:
+                    duplicate = Node(child.value)
+                    setattr(target, side, duplicate)
+                    stack.append((child, duplicate))
+        return root
+
+    def intern(self) -> "InternedNode":
+        # Bottom-up, so InternedNode only ever receives interned children.
+        interned: Dict[int, InternedNode] = {}
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in interned:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                for child in (node.right, node.left):
+                    if child is not None and not isinstance(child, InternedNode):
+                        stack.append((child, False))
+                continue
+            left, right = node.left, node.right
+            if left is not None and not isinstance(left, InternedNode):
+                left = interned[id(left)]
+            if right is not None and not isinstance(right, InternedNode):
+                right = interned[id(right)]
+            interned[id(node)] = InternedNode(node.value, left, right)
+        return interned[id(self)]
+
+class InternedNode(Node):
+    __slots__ = ('__hash', '__weakref__')
+    __table: "WeakValueDictionary[Tuple, InternedNode]" = WeakValueDictionary()
+
+    def __new__(cls, value: str, left: Optional[Node] = None, right: Optional[Node] = None) -> "InternedNode":
+        if left is not None:
+            left = left.intern()
+        if right is not None:
+            right = right.intern()
+
+        key = (value, left, right)
+        node = cls.__table.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            object.__setattr__(node, 'value', value)
+            object.__setattr__(node, '_Node__left', left)
+            object.__setattr__(node, '_Node__right', right)
+            object.__setattr__(node, '_InternedNode__hash', hash(key))
+            cls.__table[key] = node
+        return node
+
+    def __init__(self, value: str, left: Optional[Node] = None, right: Optional[Node] = None) -> None:
+        pass
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("InternedNode is immutable.")
+
+    def __eq__(self, other: Node) -> bool:
+        if isinstance(other, InternedNode):
+            return self is other
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return self.__hash
+
+    def __reduce__(self) -> Tuple:
+        return (InternedNode, (self.value, self.left, self.right))
+
+    def __copy__(self) -> "InternedNode":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "InternedNode":
+        return self
+
+    def copy(self) -> "InternedNode":
+        return self
+
+    def intern(self) -> "InternedNode":
+        return self
+
+    @classmethod
+    def table_size(cls) -> int:
+        return len(cls.__table)
+
+def walk(root: Optional[Node]) -> Iterator[Tuple[Node, int]]:
+    # Pre-order (node, depth) pairs, left before right.
+    stack = [(root, 0)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        if node.right is not None:
+            stack.append((node.right, depth + 1))
+        if node.left is not None:
+            stack.append((node.left, depth + 1))
+
+class Revisit:
+    __slots__ = ('node',)
+
+    def __init__(self, node: Node) -> None:
+        self.node = node
+
+def rewrite(root: Optional[Node], leave: Callable[[Node, Any, Any], Any], enter: Optional[Callable[[Node], Node]] = None) -> Any:
+    # Post-order fold with an explicit stack. enter may replace a node before
+    # its children are visited; leave receives the node and the results for
+    # its children and returns the node's result, or Revisit(node) to have
+    # that node walked from scratch in its place. Results for interned nodes
+    # are remembered, so a shared subformula is only visited once.
+    if root is None:
+        return None
+    done: Dict[InternedNode, Any] = {}
+    results: List[Any] = []
+    # A frame is (node, None) before its children are visited, (node,
+    # entered node) after, and (node, Revisit) while a revisit stands in.
+    stack: List[Tuple[Node, Any]] = [(root, None)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        key, node = pop()
+        if node is None:
+            if key.__class__ is InternedNode and key in done:
+                results.append(done[key])
+                continue
+            node = enter(key) if enter is not None else key
+            left, right = node.left, node.right
+            if left is not None or right is not None:
+                push((key, node))
+                if right is not None:
+                    push((right, None))
+                if left is not None:
+                    push((left, None))
+                continue
+            result = leave(node, None, None)
+        elif node is Revisit:
+            if key.__class__ is InternedNode:
+                done[key] = results[-1]
+            continue
+        else:
+            right = results.pop() if node.right is not None else None
+            left = results.pop() if node.left is not None else None
+            result = leave(node, left, right)
+
+        if result.__class__ is Revisit:
+            push((key, Revisit))
+            push((result.node, None))
+        else:
+            if key.__class__ is InternedNode:
+                done[key] = result
+            results.append(result)
+    return results.pop()
 
 class ParseTree:
     def __init__(self, root: Optional[Node] = None) -> None:
@@ -64,51 +290,33 @@ class ParseTree:
         return self._root == other._root
 
     def _node_to_string(self, node: Node) -> str:
-        if node is None:
-            return ""
-        
-        if node.value == '¬':
-            operand = self._node_to_string(node.right)
-            if node.right and node.right.value in ['→', '∧', '∨', '¬']:
-                operand = f"({operand})"
-            return f"¬{operand}"
-        elif node.value in ['→', '∧', '∨']:
-            left = self._node_to_string(node.left)
-            right = self._node_to_string(node.right)
-            
-            precedence = {'→': 1, '∨': 2, '∧': 3}
-            current_prec = precedence[node.value]
-            
-            if (node.left and node.left.value in precedence):
-                left_prec = precedence[node.left.value]
-                if (left_prec < current_prec or 
-                    (left_prec == current_prec and node.value == '→')):
-                    left = f"({left})"
-           
-            if (node.right and node.right.value in precedence):
-                right_prec = precedence[node.right.value]
-                if right_prec < current_prec:
-                    right = f"({right})"
-            
-            return f"{left} {node.value} {right}"
-        else:
-            return node.value
+        return printer().render(node)
+
+    def render(self, format: str = 'unicode', exact: bool = False) -> str:
+        return printer(format, exact).render(self._root)
     
+    def variables(self) -> List[str]:
+        if not self.is_built:
+            return []
+
+        seen = {}
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.left is None and node.right is None:
+                if node.value not in ['⊤', '⊥']:
+                    seen.setdefault(node.value, None)
+                continue
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+        return list(seen)
+
     def preorder(self) -> str:
         if not self.is_built:
             return ""
-        
-        result = []
-        
-        def _preorder(node: Node, depth: int = 0):
-            if node is not None:
-                indent = "  " * depth
-                result.append(f"{indent}{node.value}")
-                _preorder(node.left, depth + 1)
-                _preorder(node.right, depth + 1)
-        
-        _preorder(self._root)
-        return "\n".join(result)
+        return "\n".join(f"{'  ' * depth}{node.value}" for node, depth in walk(self._root))
 
     @property
     def is_built(self) -> bool:
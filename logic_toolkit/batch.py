@@ -0,0 +1,96 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Union
+
+from logic_toolkit.base import Node, ParseTree
+from logic_toolkit.printer import render
+from logic_toolkit.tasks import TASKS
+
+class TaskError:
+    __slots__ = ('index', 'error_type', 'message')
+
+    def __init__(self, index: int, error_type: str, message: str) -> None:
+        self.index = index
+        self.error_type = error_type
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(index={self.index}, error_type={self.error_type!r}, message={self.message!r})'
+
+    def __str__(self) -> str:
+        return f'{self.error_type}: {self.message}'
+
+    def __eq__(self, other: "TaskError") -> bool:
+        if not isinstance(other, TaskError):
+            return False
+        return (self.index, self.error_type, self.message) == (other.index, other.error_type, other.message)
+
+    def __reduce__(self) -> tuple:
+        return (TaskError, (self.index, self.error_type, self.message))
+
+def map(task: Union[str, Callable[[Any], Any]], inputs: Iterable[Any], workers: Optional[int] = None, chunksize: int = 64, prefetch: int = 2, compact: bool = True) -> Iterator[Any]:
+    # With compact, trees come back as their exact infix string whatever
+    # the number of workers; without it they are returned as they are,
+    # pickled whole when they cross a process boundary.
+    function = TASKS[task] if isinstance(task, str) else task
+    workers = workers or os.cpu_count() or 1
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+
+    return _map(function, inputs, workers, chunksize, prefetch, compact)
+
+def _map(function: Callable[[Any], Any], inputs: Iterable[Any], workers: int, chunksize: int, prefetch: int, compact: bool) -> Iterator[Any]:
+    chunks = _chunks(inputs, chunksize)
+    if workers == 1:
+        for start, chunk in chunks:
+            yield from _run_chunk(function, start, chunk, compact)
+        return
+
+    # Only a bounded window of chunks is in flight, and they are drained
+    # oldest first, so output order matches input order and memory stays
+    # flat for unbounded input streams.
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future] = deque()
+    try:
+        for start, chunk in chunks:
+            pending.append(executor.submit(_run_chunk, function, start, chunk, compact))
+            if len(pending) >= workers * prefetch:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _chunks(inputs: Iterable[Any], chunksize: int) -> Iterator[tuple]:
+    iterator = iter(inputs)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+def _run_chunk(function: Callable[[Any], Any], start: int, chunk: List[Any], compact: bool) -> List[Any]:
+    results = []
+    for index, item in enumerate(chunk, start):
+        try:
+            result = function(item)
+            results.append(_compact(result) if compact else result)
+        except Exception as e:
+            results.append(TaskError(index, type(e).__name__, str(e)))
+    return results
+
+def _compact(value: Any) -> Any:
+    # Trees cross the process boundary as their exact infix string, which
+    # parses back to the same tree, rather than as a pickled graph of Node
+    # objects.
+    if isinstance(value, ParseTree):
+        return render(value.root, exact=True)
+    if isinstance(value, Node):
+        return render(value, exact=True)
+    return value
@@ -0,0 +1,503 @@
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from logic_toolkit import instrument
+from logic_toolkit.base import Node, ParseTree, rewrite, walk
+from logic_toolkit.wff import WellFormedFormula
+
+# Node ids 0 and 1 are the constants; their variable is -1, which indexes
+# the sentinel kept at the end of the level list.
+FALSE, TRUE = 0, 1
+_TERMINAL, _FREE = -1, -2
+
+class BDD:
+    # A handle on one node of a Manager. Handles keep their node alive, and
+    # nodes are unique per function, so two handles are equivalent exactly
+    # when they point at the same node.
+    __slots__ = ('manager', 'node', '__weakref__')
+
+    def __init__(self, manager: "Manager", node: int) -> None:
+        self.manager = manager
+        self.node = node
+        manager._reference(node)
+
+    def __del__(self) -> None:
+        self.manager._release(self.node)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(node={self.node}, size={self.size})'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BDD) and self.manager is other.manager and self.node == other.node
+
+    def __hash__(self) -> int:
+        return hash((id(self.manager), self.node))
+
+    def __invert__(self) -> "BDD":
+        return self.manager.ite(self, self.manager.false, self.manager.true)
+
+    def __and__(self, other: "BDD") -> "BDD":
+        return self.manager.ite(self, other, self.manager.false)
+
+    def __or__(self, other: "BDD") -> "BDD":
+        return self.manager.ite(self, self.manager.true, other)
+
+    def __xor__(self, other: "BDD") -> "BDD":
+        return self.manager.ite(self, ~other, other)
+
+    def implies(self, other: "BDD") -> "BDD":
+        return self.manager.ite(self, other, self.manager.true)
+
+    def iff(self, other: "BDD") -> "BDD":
+        return self.manager.ite(self, other, ~other)
+
+    @property
+    def size(self) -> int:
+        return self.manager.size(self.node)
+
+    def is_tautology(self) -> bool:
+        return self.node == TRUE
+
+    def is_satisfiable(self) -> bool:
+        return self.node != FALSE
+
+    def support(self) -> List[str]:
+        return self.manager.support(self.node)
+
+    def sat_count(self, variables: Optional[Iterable[str]] = None) -> int:
+        return self.manager.sat_count(self.node, variables)
+
+    def any_sat(self) -> Optional[Dict[str, bool]]:
+        return self.manager.any_sat(self.node)
+
+    def evaluate(self, assignment: Dict[str, bool]) -> bool:
+        return self.manager.evaluate(self.node, assignment)
+
+class Manager:
+    ORDERINGS = ('appearance', 'frequency', 'force')
+    GC_THRESHOLD = 1 << 14
+
+    def __init__(self, variables: Iterable[str] = (), cache_size: int = 1 << 16, reorder: bool = False, reorder_threshold: int = 4096) -> None:
+        if cache_size < 1 or cache_size & (cache_size - 1):
+            raise ValueError("cache_size must be a power of two.")
+        # Nodes live in parallel lists indexed by id; freed ids are reused.
+        self.__var: List[int] = [_TERMINAL, _TERMINAL]
+        self.__low: List[int] = [FALSE, TRUE]
+        self.__high: List[int] = [FALSE, TRUE]
+        self.__refs: List[int] = [0, 0]
+        self.__free: List[int] = []
+        # One unique table per variable, mapping (low, high) to a node id.
+        self.__unique: List[Dict[Tuple[int, int], int]] = []
+        self.__names: List[str] = []
+        self.__index: Dict[str, int] = {}
+        # __level[var] and __order[level] are inverse permutations. The
+        # extra entry at the end of __level is the constants' level.
+        self.__level: List[int] = [sys.maxsize]
+        self.__order: List[int] = []
+        # The computed table is direct-mapped: a colliding entry simply
+        # replaces the one in its slot.
+        self.__cache: List[Optional[Tuple[int, int, int, int]]] = [None] * cache_size
+        self.__mask = cache_size - 1
+        self.__gc_threshold = self.GC_THRESHOLD
+        self.reorder = reorder
+        self.reorder_threshold = reorder_threshold
+        self.counters: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0, 'collections': 0, 'reorderings': 0, 'swaps': 0}
+        for name in variables:
+            self.add_variable(name)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(variables={len(self.__names)}, nodes={len(self)})'
+
+    def __len__(self) -> int:
+        return len(self.__var) - 2 - len(self.__free)
+
+    @property
+    def variables(self) -> List[str]:
+        return [self.__names[var] for var in self.__order]
+
+    @property
+    def true(self) -> BDD:
+        return BDD(self, TRUE)
+
+    @property
+    def false(self) -> BDD:
+        return BDD(self, FALSE)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters, nodes=len(self), variables=len(self.__names))
+
+    def _reference(self, node: int) -> None:
+        self.__refs[node] += 1
+
+    def _release(self, node: int) -> None:
+        # Dead nodes stay in the unique table, where they may be revived,
+        # until the next collection.
+        self.__refs[node] -= 1
+
+    def add_variable(self, name: str) -> BDD:
+        if name not in self.__index:
+            self.__index[name] = len(self.__names)
+            self.__names.append(name)
+            self.__unique.append({})
+            self.__level.insert(-1, len(self.__order))
+            self.__order.append(len(self.__names) - 1)
+        return self.var(name)
+
+    def var(self, name: str) -> BDD:
+        if name not in self.__index:
+            raise KeyError(f"Unknown variable: {name}")
+        return BDD(self, self.__make(self.__index[name], FALSE, TRUE))
+
+    def __make(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        table = self.__unique[var]
+        node = table.get((low, high))
+        if node is None:
+            if self.__free:
+                node = self.__free.pop()
+                self.__var[node], self.__low[node], self.__high[node], self.__refs[node] = var, low, high, 0
+            else:
+                node = len(self.__var)
+                self.__var.append(var)
+                self.__low.append(low)
+                self.__high.append(high)
+                self.__refs.append(0)
+            self.__refs[low] += 1
+            self.__refs[high] += 1
+            table[(low, high)] = node
+        return node
+
+    def ite(self, f: BDD, g: BDD, h: BDD) -> BDD:
+        # Garbage is only collected and variables only reordered here,
+        # between operations, when everything in use is held by a handle.
+        if len(self) > self.__gc_threshold:
+            self.collect()
+            self.__gc_threshold = max(self.GC_THRESHOLD, 2 * len(self))
+        result = BDD(self, self.__ite(f.node, g.node, h.node))
+        if self.reorder and len(self) > self.reorder_threshold:
+            self.sift()
+            self.reorder_threshold = max(self.reorder_threshold, 2 * len(self))
+        return result
+
+    def __ite(self, f: int, g: int, h: int) -> int:
+        # Shannon expansion on the top variable with an explicit stack: a
+        # frame with var None still has to be expanded, otherwise its two
+        # cofactors are on the result stack.
+        var, low, high, level, order = self.__var, self.__low, self.__high, self.__level, self.__order
+        cache, mask, counters = self.__cache, self.__mask, self.counters
+        results: List[int] = []
+        stack: List[Tuple[int, int, int, Optional[int]]] = [(f, g, h, None)]
+        while stack:
+            f, g, h, top = stack.pop()
+            if top is None:
+                if f == TRUE:
+                    results.append(g)
+                    continue
+                if f == FALSE:
+                    results.append(h)
+                    continue
+                if g == f:
+                    g = TRUE
+                if h == f:
+                    h = FALSE
+                if g == h:
+                    results.append(g)
+                    continue
+                if g == TRUE and h == FALSE:
+                    results.append(f)
+                    continue
+                entry = cache[hash((f, g, h)) & mask]
+                if entry is not None and entry[0] == f and entry[1] == g and entry[2] == h:
+                    counters['hits'] += 1
+                    results.append(entry[3])
+                    continue
+                counters['misses'] += 1
+
+                lf, lg, lh = level[var[f]], level[var[g]], level[var[h]]
+                first = min(lf, lg, lh)
+                f0, f1 = (low[f], high[f]) if lf == first else (f, f)
+                g0, g1 = (low[g], high[g]) if lg == first else (g, g)
+                h0, h1 = (low[h], high[h]) if lh == first else (h, h)
+                stack.append((f, g, h, order[first]))
+                stack.append((f1, g1, h1, None))
+                stack.append((f0, g0, h0, None))
+            else:
+                high_result = results.pop()
+                node = self.__make(top, results.pop(), high_result)
+                slot = hash((f, g, h)) & mask
+                if cache[slot] is not None:
+                    counters['evictions'] += 1
+                cache[slot] = (f, g, h, node)
+                results.append(node)
+        return results[0]
+
+    def __delete(self, dead: List[int]) -> None:
+        var, low, high, refs, unique = self.__var, self.__low, self.__high, self.__refs, self.__unique
+        while dead:
+            node = dead.pop()
+            del unique[var[node]][(low[node], high[node])]
+            var[node] = _FREE
+            self.__free.append(node)
+            for child in (low[node], high[node]):
+                if child > TRUE:
+                    refs[child] -= 1
+                    if refs[child] == 0:
+                        dead.append(child)
+
+    def collect(self) -> None:
+        var, refs = self.__var, self.__refs
+        self.__delete([node for node in range(2, len(var)) if refs[node] == 0 and var[node] != _FREE])
+        # Cached results may name freed ids, which are about to be reused.
+        self.__cache = [None] * len(self.__cache)
+        self.counters['collections'] += 1
+
+    def __swap(self, position: int) -> None:
+        # Exchanges the variables at position and position + 1 in place. A
+        # node of the upper variable x that depends on the lower variable y
+        # is relabelled as a y node over two fresh x nodes, so every id that
+        # is in use keeps denoting the same function.
+        var, low, high, refs = self.__var, self.__low, self.__high, self.__refs
+        x, y = self.__order[position], self.__order[position + 1]
+        nodes = self.__unique[x]
+        kept: Dict[Tuple[int, int], int] = {}
+        moved: List[int] = []
+        for key, node in nodes.items():
+            if var[key[0]] == y or var[key[1]] == y:
+                moved.append(node)
+            else:
+                kept[key] = node
+        self.__unique[x] = kept
+        self.__order[position], self.__order[position + 1] = y, x
+        self.__level[x], self.__level[y] = position + 1, position
+
+        dead: List[int] = []
+        for node in moved:
+            f0, f1 = low[node], high[node]
+            f00, f01 = (low[f0], high[f0]) if var[f0] == y else (f0, f0)
+            f10, f11 = (low[f1], high[f1]) if var[f1] == y else (f1, f1)
+            new_low, new_high = self.__make(x, f00, f10), self.__make(x, f01, f11)
+            refs[new_low] += 1
+            refs[new_high] += 1
+            low[node], high[node], var[node] = new_low, new_high, y
+            self.__unique[y][(new_low, new_high)] = node
+            for child in (f0, f1):
+                if child > TRUE:
+                    refs[child] -= 1
+                    if refs[child] == 0:
+                        dead.append(child)
+        self.__delete(dead)
+        self.counters['swaps'] += 1
+
+    @instrument.timed('bdd.sift')
+    def sift(self, max_growth: float = 1.2) -> None:
+        # Rudell's sifting: each variable, largest level first, is moved
+        # through every position and left where the diagram was smallest.
+        # A direction is abandoned once the size passes max_growth times
+        # the best seen.
+        self.collect()
+        last = len(self.__order) - 1
+        for var in sorted(range(len(self.__names)), key=lambda var: -len(self.__unique[var])):
+            position = best_position = self.__level[var]
+            best = len(self)
+            for step, limit in ((1, last), (-1, 0)):
+                while position != limit:
+                    self.__swap(min(position, position + step))
+                    position += step
+                    if len(self) < best:
+                        best, best_position = len(self), position
+                    elif len(self) > max_growth * best:
+                        break
+            while position < best_position:
+                self.__swap(position)
+                position += 1
+            while position > best_position:
+                self.__swap(position - 1)
+                position -= 1
+        self.__cache = [None] * len(self.__cache)
+        self.counters['reorderings'] += 1
+
+    def reorder_to(self, variables: Sequence[str]) -> None:
+        # Moves the named variables, in this order, to the top by adjacent
+        # swaps; the rest keep their relative order below them.
+        self.collect()
+        for target, name in enumerate(variables):
+            position = self.__level[self.__index[name]]
+            while position > target:
+                self.__swap(position - 1)
+                position -= 1
+        self.__cache = [None] * len(self.__cache)
+
+    @instrument.timed('bdd.compile')
+    def compile(self, formula: Union[ParseTree, str]) -> BDD:
+        if isinstance(formula, str):
+            formula = WellFormedFormula(formula)
+        elif not isinstance(formula, ParseTree):
+            raise TypeError("Expected a ParseTree or a string representation of a formula.")
+        if not formula.is_built:
+            raise ValueError("Cannot compile an empty formula.")
+        for name in formula.variables():
+            self.add_variable(name)
+        return rewrite(formula.root, self.__leave)
+
+    def __leave(self, node: Node, left: Optional[BDD], right: Optional[BDD]) -> BDD:
+        value = node.value
+        if value == '¬':
+            return ~right
+        if value == '∧':
+            return left & right
+        if value == '∨':
+            return left | right
+        if value == '→':
+            return left.implies(right)
+        if value == '⊤':
+            return self.true
+        if value == '⊥':
+            return self.false
+        return self.var(value)
+
+    def __level_of(self, node: int) -> int:
+        return len(self.__order) if node <= TRUE else self.__level[self.__var[node]]
+
+    def __reachable(self, root: int) -> List[int]:
+        seen = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node > TRUE:
+                for child in (self.__low[node], self.__high[node]):
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+        return [node for node in seen if node > TRUE]
+
+    def size(self, node: int) -> int:
+        return len(self.__reachable(node))
+
+    def support(self, node: int) -> List[str]:
+        variables = {self.__var[reached] for reached in self.__reachable(node)}
+        return [self.__names[var] for var in self.__order if var in variables]
+
+    def sat_count(self, node: int, variables: Optional[Iterable[str]] = None) -> int:
+        # Counts over every variable of the manager, each level skipped
+        # between a node and its child doubling the count.
+        low, high = self.__low, self.__high
+        counts = {FALSE: 0, TRUE: 1}
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in counts:
+                stack.pop()
+                continue
+            pending = [child for child in (low[current], high[current]) if child not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            level = self.__level_of(current)
+            counts[current] = sum(counts[child] << (self.__level_of(child) - level - 1) for child in (low[current], high[current]))
+        total = counts[node] << self.__level_of(node)
+        if variables is None:
+            return total
+
+        variables = set(variables)
+        missing = [name for name in self.support(node) if name not in variables]
+        if missing:
+            raise ValueError(f"Variables missing from the count: {', '.join(missing)}")
+        unknown = [name for name in variables if name not in self.__index]
+        return (total << len(unknown)) >> (len(self.__names) - len(variables) + len(unknown))
+
+    def any_sat(self, node: int) -> Optional[Dict[str, bool]]:
+        # Variables the function does not depend on along the chosen path
+        # are left out of the assignment.
+        if node == FALSE:
+            return None
+        assignment: Dict[str, bool] = {}
+        while node > TRUE:
+            name = self.__names[self.__var[node]]
+            if self.__low[node] != FALSE:
+                assignment[name], node = False, self.__low[node]
+            else:
+                assignment[name], node = True, self.__high[node]
+        return assignment
+
+    def evaluate(self, node: int, assignment: Dict[str, bool]) -> bool:
+        while node > TRUE:
+            name = self.__names[self.__var[node]]
+            if name not in assignment:
+                raise ValueError(f"No value for: {name}")
+            node = self.__high[node] if assignment[name] else self.__low[node]
+        return node == TRUE
+
+def ordering(formulas: Sequence[ParseTree], heuristic: str = 'appearance', iterations: int = 20) -> List[str]:
+    # appearance: first occurrence, left to right. frequency: most frequent
+    # first. force: starts from appearance and repeatedly moves each
+    # variable to the mean centre of the subformulas it occurs in, which
+    # pulls variables that are combined together next to each other.
+    if heuristic not in Manager.ORDERINGS:
+        raise ValueError(f"Unknown ordering: {heuristic}. Expected one of {', '.join(Manager.ORDERINGS)}.")
+    appearance: Dict[str, None] = {}
+    for formula in formulas:
+        for name in formula.variables():
+            appearance.setdefault(name, None)
+    names = list(appearance)
+    if heuristic == 'appearance':
+        return names
+
+    if heuristic == 'frequency':
+        frequency = dict.fromkeys(names, 0)
+        for formula in formulas:
+            for node, _ in walk(formula.root):
+                if node.value in frequency:
+                    frequency[node.value] += 1
+        return sorted(names, key=lambda name: -frequency[name])
+
+    edges: List[frozenset] = []
+
+    def leave(node: Node, left: Optional[frozenset], right: Optional[frozenset]) -> frozenset:
+        if left is None and right is None:
+            return frozenset([node.value]) if node.value in appearance else frozenset()
+        support = (left or frozenset()) | (right or frozenset())
+        if len(support) > 1:
+            edges.append(support)
+        return support
+
+    for formula in formulas:
+        rewrite(formula.root, leave)
+    position = {name: float(index) for index, name in enumerate(names)}
+    for _ in range(iterations):
+        totals = dict.fromkeys(names, 0.0)
+        counts = dict.fromkeys(names, 0)
+        for edge in edges:
+            centre = sum(position[name] for name in edge) / len(edge)
+            for name in edge:
+                totals[name] += centre
+                counts[name] += 1
+        ranked = sorted(names, key=lambda name: (totals[name] / counts[name] if counts[name] else position[name], position[name]))
+        updated = {name: float(index) for index, name in enumerate(ranked)}
+        if updated == position:
+            break
+        position = updated
+    return sorted(names, key=position.__getitem__)
+
+def _tree(formula: Union[ParseTree, str]) -> ParseTree:
+    return WellFormedFormula(formula) if isinstance(formula, str) else formula
+
+def build(formula: Union[ParseTree, str], heuristic: str = 'appearance', reorder: bool = False) -> BDD:
+    formula = _tree(formula)
+    return Manager(ordering([formula], heuristic), reorder=reorder).compile(formula)
+
+def equivalent(a: Union[ParseTree, str], b: Union[ParseTree, str], heuristic: str = 'appearance') -> bool:
+    a, b = _tree(a), _tree(b)
+    manager = Manager(ordering([a, b], heuristic))
+    return manager.compile(a) == manager.compile(b)
+
+def is_tautology(formula: Union[ParseTree, str], heuristic: str = 'appearance') -> bool:
+    return build(formula, heuristic).is_tautology()
+
+def sat_count(formula: Union[ParseTree, str], heuristic: str = 'appearance') -> int:
+    return build(formula, heuristic).sat_count()
+
+def any_sat(formula: Union[ParseTree, str], heuristic: str = 'appearance') -> Optional[Dict[str, bool]]:
+    return build(formula, heuristic).any_sat()
@@ -0,0 +1,207 @@
+import os
+import pickle
+import re
+import sqlite3
+import sys
+from collections import OrderedDict
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Pattern, Tuple, Union
+
+# ASCII spellings accepted by HornFormula and the prover, mapped onto the
+# Unicode operators.
+_ASCII_OPERATORS = {'|-': '⊢', '->': '→', '=>': '→', '&': '∧', '^': '∧', '|': '∨', '~': '¬', '!': '¬'}
+_OPERATORS: Dict[Tuple[str, ...], Pattern] = {}
+_PADDING = re.compile(r'\s*([^\w\s])\s*')
+_SPACES = re.compile(r'\s+')
+
+def compact(text: str) -> str:
+    # Spaces only matter between two names ("p q" must not become "pq"),
+    # so they are dropped around operators and brackets and collapsed
+    # elsewhere.
+    return _SPACES.sub(' ', _PADDING.sub(r'\1', text.strip()))
+
+def normalize(text: str, operators: Optional[Iterable[str]] = None) -> str:
+    # Also maps the ASCII operators, all of them or only those given, so
+    # only use it as the key of a function that treats both spellings of
+    # each alike: WellFormedFormula accepts none of them.
+    key = tuple(sorted(_ASCII_OPERATORS if operators is None else operators, key=len, reverse=True))
+    pattern = _OPERATORS.get(key)
+    if pattern is None:
+        unknown = [operator for operator in key if operator not in _ASCII_OPERATORS]
+        if unknown:
+            raise ValueError(f"Unknown ASCII operator(s): {', '.join(unknown)}.")
+        pattern = _OPERATORS[key] = re.compile('|'.join(map(re.escape, key)))
+    return compact(pattern.sub(lambda match: _ASCII_OPERATORS[match.group()], text))
+
+_MISSING = object()
+
+class LRUCache:
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(size={len(self)}, maxsize={self.maxsize})'
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.__entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        entries = self.__entries
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+class SQLiteStore:
+    # Values are pickled, so only point this at a file you trust. Each
+    # process opens its own connection; WAL mode lets readers and one
+    # writer share the file.
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__pid: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(path={self.path!r})'
+
+    def __reduce__(self) -> Tuple:
+        return (SQLiteStore, (self.path, self.timeout))
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None or self.__pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+            self.__connection, self.__pid = connection, os.getpid()
+        return self.__connection
+
+    def __len__(self) -> int:
+        return self.__connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self.__connect().execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        return pickle.loads(row[0]) if row is not None else default
+
+    def put(self, key: str, value: Any) -> None:
+        self.__connect().execute('INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)', (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+    def clear(self) -> None:
+        self.__connect().execute('DELETE FROM results')
+
+    def close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+class ResultCache:
+    # A bounded in-memory LRU in front of an optional SQLite file. Cached
+    # values are shared between callers, so they must not be mutated.
+    def __init__(self, maxsize: int = 4096, path: Optional[str] = None) -> None:
+        self.memory = LRUCache(maxsize)
+        self.store = SQLiteStore(path) if path is not None else None
+        self.disk_hits = 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(memory={len(self.memory)}, path={self.store.path if self.store else None!r})'
+
+    def __reduce__(self) -> Tuple:
+        # A worker process gets its own instance per configuration instead
+        # of a copy of this one's entries.
+        return (shared, (self.memory.maxsize, self.store.path if self.store else None))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.memory.hits + self.disk_hits,
+            'memory_hits': self.memory.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.memory.misses - self.disk_hits,
+            'evictions': self.memory.evictions,
+            'size': len(self.memory),
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.store is not None:
+            value = self.store.get(key, _MISSING)
+            if value is not _MISSING:
+                self.disk_hits += 1
+                self.memory.put(key, value)
+        return default if value is _MISSING else value
+
+    def put(self, key: str, value: Any) -> None:
+        self.memory.put(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def cached(self, namespace: Optional[str] = None, key: Callable[[str], str] = compact) -> Callable[[Callable[..., Any]], "CachedFunction"]:
+        def decorate(function: Callable[..., Any]) -> CachedFunction:
+            return CachedFunction(function, self, namespace or f'{function.__module__}.{function.__qualname__}', key)
+        return decorate
+
+class CachedFunction:
+    def __init__(self, function: Callable[..., Any], cache: ResultCache, namespace: str, key: Callable[[str], str] = compact) -> None:
+        self.function = function
+        self.cache = cache
+        self.namespace = namespace
+        self.key = key
+        update_wrapper(self, function)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.namespace!r})'
+
+    def __reduce__(self) -> Union[str, Tuple]:
+        # A decorated module-level function replaces the original under its
+        # name, so it has to be pickled by reference like a function.
+        name = getattr(self, '__qualname__', None)
+        if name is not None and getattr(sys.modules.get(getattr(self, '__module__', '')), name, None) is self:
+            return name
+        return (CachedFunction, (self.function, self.cache, self.namespace, self.key))
+
+    def __call__(self, text: str, *args: Any, **kwargs: Any) -> Any:
+        key = '\x1f'.join([self.namespace, self.key(text), repr(args), repr(sorted(kwargs.items()))])
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.function(text, *args, **kwargs)
+            self.cache.put(key, value)
+        return value
+
+_SHARED: Dict[Tuple[int, Optional[str]], ResultCache] = {}
+
+def shared(maxsize: int = 4096, path: Optional[str] = None) -> ResultCache:
+    # One cache per configuration and process.
+    key = (maxsize, os.path.abspath(path) if path is not None else None)
+    if key not in _SHARED:
+        _SHARED[key] = ResultCache(maxsize, path)
+    return _SHARED[key]
+
+def cached(namespace: Optional[str] = None, maxsize: int = 4096, path: Optional[str] = None, key: Callable[[str], str] = compact) -> Callable[[Callable[..., Any]], CachedFunction]:
+    return shared(maxsize, path).cached(namespace, key)
@@ -0,0 +1,101 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from logic_toolkit.base import Node, SymbolTable
+
+class ClauseSet:
+    def __init__(self, names: Optional[Iterable[str]] = None, symbols: Optional[SymbolTable] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.literals = array('i')
+        self.offsets = array('i', [0])
+        self.__index: Dict[int, Union[int, List[int]]] = {}
+        for name in names or ():
+            self.symbols.intern(name)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(variables={self.num_variables}, clauses={len(self)})'
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        literals, offsets = self.literals, self.offsets
+        for i in range(len(offsets) - 1):
+            yield tuple(literals[offsets[i]:offsets[i + 1]])
+
+    def __eq__(self, other: "ClauseSet") -> bool:
+        if not isinstance(other, ClauseSet):
+            return False
+        return self.names == other.names and self.literals == other.literals and self.offsets == other.offsets
+
+    @property
+    def names(self) -> List[str]:
+        return self.symbols.names
+
+    @property
+    def variables(self) -> Dict[str, int]:
+        return {name: self.symbols[name] for name in self.symbols}
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def num_literals(self) -> int:
+        return len(self.literals)
+
+    def clause(self, index: int) -> Tuple[int, ...]:
+        return tuple(self.literals[self.offsets[index]:self.offsets[index + 1]])
+
+    def variable(self, name: str) -> int:
+        return self.symbols.intern(name)
+
+    def literal(self, name: str, positive: bool = True) -> int:
+        number = self.variable(name)
+        return number if positive else -number
+
+    def name(self, literal: int) -> str:
+        return self.symbols.name(abs(literal))
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        clause = sorted(set(literals), key=abs)
+        for a, b in zip(clause, clause[1:]):
+            if a == -b:
+                return False
+
+        for literal in clause:
+            if literal == 0 or abs(literal) > len(self.symbols):
+                raise ValueError(f"Unknown variable in literal {literal}.")
+
+        key = hash(tuple(clause))
+        candidates = self.__index.get(key)
+        if candidates is not None:
+            for index in (candidates if isinstance(candidates, list) else [candidates]):
+                if self.clause(index) == tuple(clause):
+                    return False
+
+        index = len(self)
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+        if candidates is None:
+            self.__index[key] = index
+        elif isinstance(candidates, list):
+            candidates.append(index)
+        else:
+            self.__index[key] = [candidates, index]
+        return True
+
+    def to_node(self, node_type: Type[Node] = Node) -> Node:
+        if len(self) == 0:
+            return node_type('⊤')
+
+        root = None
+        for clause in self:
+            disjunction = None
+            for literal in clause:
+                atom = node_type(self.name(literal))
+                atom = atom if literal > 0 else node_type('¬', right=atom)
+                disjunction = atom if disjunction is None else node_type('∨', left=disjunction, right=atom)
+            if disjunction is None:
+                disjunction = node_type('⊥')
+            root = disjunction if root is None else node_type('∧', left=root, right=disjunction)
+        return root
@@ -0,0 +1,165 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from logic_toolkit import batch
+from logic_toolkit.cache import compact, normalize, shared
+from logic_toolkit.cnf import CNF
+from logic_toolkit.instrument import Profiled
+from logic_toolkit.tasks import ASCII_OPERATORS, TASKS, MULTILINE_TASKS, split_test_case
+
+Case = Tuple[str, str, Optional[str]]
+
+def iter_paths(sources: Iterable[str]) -> Iterator[str]:
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith('.txt'):
+                        yield os.path.join(root, name)
+        elif os.path.isfile(source):
+            yield source
+        else:
+            matches = sorted(glob.glob(source, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No input matches {source}")
+            yield from (path for path in matches if os.path.isfile(path))
+
+def iter_file_cases(path: str, multiline: bool) -> Iterator[Case]:
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    body, expected = split_test_case(text)
+    if body is not None:
+        yield path, body if multiline else next((line for line in body.split('\n') if line.strip()), ''), expected
+    elif multiline:
+        yield path, text, None
+    else:
+        for number, line in enumerate(text.split('\n'), 1):
+            if line.strip():
+                yield f'{path}:{number}', line, None
+
+def iter_stream_cases(stream: TextIO, multiline: bool, name: str = '<stdin>') -> Iterator[Case]:
+    block: List[str] = []
+    block_start = 1
+    for number, line in enumerate(stream, 1):
+        line = line.rstrip('\n')
+        if line.lstrip().startswith('{'):
+            record = json.loads(line)
+            text = record.get('input', record.get('formula'))
+            if text is None:
+                raise ValueError(f"{name}:{number}: expected an 'input' or 'formula' field")
+            yield str(record.get('id', f'{name}:{number}')), text, record.get('expected')
+        elif not multiline:
+            if line.strip():
+                yield f'{name}:{number}', line, None
+        elif line.strip():
+            if not block:
+                block_start = number
+            block.append(line)
+        elif block:
+            yield f'{name}:{block_start}', '\n'.join(block), None
+            block = []
+    if block:
+        yield f'{name}:{block_start}', '\n'.join(block), None
+
+def iter_cases(sources: List[str], multiline: bool, stdin: Optional[TextIO] = None) -> Iterator[Case]:
+    for source in sources or ['-']:
+        if source == '-':
+            yield from iter_stream_cases(stdin or sys.stdin, multiline)
+        else:
+            for path in iter_paths([source]):
+                yield from iter_file_cases(path, multiline)
+
+def run_cases(task: Any, cases: Iterable[Case], workers: int = 1, chunksize: int = 64) -> Iterator[Dict]:
+    pending: Deque[Case] = deque()
+
+    def texts() -> Iterator[str]:
+        for case in cases:
+            pending.append(case)
+            yield case[1]
+
+    for result in batch.map(task, texts(), workers=workers, chunksize=chunksize):
+        yield finish_case(pending.popleft(), result)
+
+def finish_case(case: Case, result: Any) -> Dict:
+    case_id, _, expected = case
+    # Copied, as a cached result may be shared with other cases.
+    result = {'error': str(result)} if isinstance(result, batch.TaskError) else dict(result)
+    result['id'] = case_id
+    if expected is not None:
+        result['expected'] = expected
+        result['match'] = _normalize(result.get('output')) == _normalize(expected)
+    return result
+
+def _normalize(output: Optional[str]) -> Optional[List[str]]:
+    if output is None:
+        return None
+    # Model listings are unordered, so compare comma-separated lines as sets.
+    lines = [line.strip() for line in output.split('\n')]
+    return [', '.join(sorted(line.split(', '))) if ', ' in line else line for line in lines if line]
+
+def write_result(result: Dict, out: TextIO, output_format: str) -> None:
+    if output_format == 'jsonl':
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    else:
+        out.write(f"# {result['id']}\n{result.get('output', result.get('error'))}\n")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m logic_toolkit', description="Run logic_toolkit engines over many inputs.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command in TASKS:
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument('sources', nargs='*', help="files, directories or glob patterns; '-' or nothing reads stdin (JSONL or line-delimited)")
+        subparser.add_argument('--format', choices=['jsonl', 'text'], default='jsonl', dest='output_format')
+        subparser.add_argument('--output', '-o', help="write results to this file instead of stdout")
+        subparser.add_argument('--workers', '-j', type=int, default=1, help="worker processes (default: 1, in-process)")
+        subparser.add_argument('--chunksize', type=int, default=64, help="cases sent to a worker at a time")
+        subparser.add_argument('--cache', action='store_true', help="reuse results for repeated inputs")
+        subparser.add_argument('--cache-path', metavar='PATH', help="persist cached results in this SQLite file (implies --cache)")
+        subparser.add_argument('--cache-size', type=int, default=4096, help="results kept in memory per process")
+        subparser.add_argument('--profile', action='store_true', help="add stage timings and engine counters to each result")
+        if command == 'cnf':
+            subparser.add_argument('--encoding', choices=CNF.ENCODINGS, default='distribute')
+            subparser.add_argument('--simplify', action='store_true', help="drop tautologies, duplicate and subsumed clauses, and strengthen clauses")
+            subparser.add_argument('--units', action='store_true', help="also propagate unit clauses (implies --simplify)")
+            subparser.add_argument('--minimize', action='store_true', help="replace the clauses with a small equivalent set of prime implicates")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    task = TASKS[args.command]
+    namespace = args.command
+    if args.command == 'cnf':
+        task = partial(task, encoding=args.encoding, simplify=args.simplify, units=args.units, minimize=args.minimize)
+        namespace = f'cnf:{args.encoding}:{args.simplify}:{args.units}:{args.minimize}'
+    if args.cache or args.cache_path:
+        key = str.strip if args.command in MULTILINE_TASKS else compact
+        if args.command in ASCII_OPERATORS:
+            key = partial(normalize, operators=ASCII_OPERATORS[args.command])
+        task = shared(args.cache_size, args.cache_path).cached(namespace, key)(task)
+    if args.profile:
+        task = Profiled(task)
+
+    cases = iter_cases(args.sources, args.command in MULTILINE_TASKS)
+    results = run_cases(task, cases, workers=args.workers, chunksize=args.chunksize)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    failures = 0
+    try:
+        for result in results:
+            write_result(result, out, args.output_format)
+            failures += 'error' in result or result.get('match') is False
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.output:
+            out.close()
+    return 1 if failures else 0
@@ -1,112 +1,284 @@
-from logic_toolkit.base import ParseTree, Node
+from logic_toolkit import instrument
+from logic_toolkit.base import ParseTree, Node, InternedNode, Revisit, SymbolTable, rewrite
 from logic_toolkit.wff import WellFormedFormula
-from typing import Optional, Union
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.simplify import Simplifier
+from typing import Iterator, Optional, Union, Dict, List, Set, Tuple
 
 class CNF(ParseTree):
-    def __init__(self, formula: Optional[Union[WellFormedFormula, str]] = None) -> None:
+    ENCODINGS = ('distribute', 'tseitin', 'plaisted-greenbaum')
+
+    def __init__(self, formula: Optional[Union[ParseTree, ClauseSet, str]] = None, encoding: Optional[str] = None, auxiliary_prefix: str = 't', simplify: Union[bool, Simplifier] = False) -> None:
+        # encoding defaults to 'distribute'; a ClauseSet is already clausal,
+        # so it takes no encoding and only the optional simplification.
         super().__init__()
-        if isinstance(formula, str):
-            formula = WellFormedFormula(formula)
-        elif not isinstance(formula, WellFormedFormula):
-            raise TypeError("Expected a WellFormedFormula or a string representation of a formula.")
-        
-        self._root = self.__convert_to_cnf(formula.root.copy())
+        self.simplification: Optional[Dict[str, Dict[str, int]]] = None
+        self.auxiliary_variables: Dict[str, ParseTree] = {}
+        if isinstance(formula, ClauseSet):
+            if encoding is not None:
+                raise ValueError("A ClauseSet is already in clausal form and takes no encoding.")
+            self.encoding = None
+            self.__node = Node
+            self._root = formula.to_node()
+        else:
+            if isinstance(formula, str):
+                formula = WellFormedFormula(formula)
+            elif not isinstance(formula, ParseTree):
+                raise TypeError("Expected a ParseTree, a ClauseSet or a string representation of a formula.")
+            encoding = encoding or 'distribute'
+            if encoding not in self.ENCODINGS:
+                raise ValueError(f"Unknown encoding: {encoding}. Expected one of {', '.join(self.ENCODINGS)}.")
+
+            self.encoding = encoding
+            self.__node = InternedNode if isinstance(formula.root, InternedNode) else Node
+            if encoding == 'distribute':
+                self._root = self.__convert_to_cnf(formula.root, clausal=bool(simplify))
+            else:
+                with instrument.stage('cnf.encode'):
+                    self._root = self.__encode(formula.root, auxiliary_prefix, polarity_aware=encoding == 'plaisted-greenbaum')
+        if simplify:
+            simplifier = simplify if isinstance(simplify, Simplifier) else Simplifier()
+            with instrument.stage('cnf.simplify'):
+                self._root = self.__simplify(simplifier)
+            self.simplification = simplifier.report
+
+    def to_clause_set(self, names: Optional[List[str]] = None, symbols: Optional[SymbolTable] = None) -> ClauseSet:
+        # A plain conversion can leave a negation above a compound formula;
+        # such a tree is converted again in clausal mode first.
+        root = self._root if self.__is_clausal(self._root) else self.__convert_to_cnf(self._root, clausal=True)
+        clause_set = ClauseSet(names, symbols)
+        for clause in self.__clauses(clause_set, root):
+            if clause is not None:
+                clause_set.add_clause(clause)
+        return clause_set
+
+    @staticmethod
+    def __is_clausal(root: Node) -> bool:
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            if node.value in ('∧', '∨'):
+                if node.value == '∧' or node.left.value != '∧' and node.right.value != '∧':
+                    nodes.append(node.left)
+                    nodes.append(node.right)
+                    continue
+                return False
+            if node.value == '¬':
+                node = node.right
+            if node.left is not None or node.right is not None:
+                return False
+        return True
+
+    def __clauses(self, clause_set: ClauseSet, root: Node) -> Iterator[Optional[List[int]]]:
+        # Raw clauses in order, with variables numbered through clause_set;
+        # None stands for a clause satisfied by a constant.
+        conjuncts = [root]
+        while conjuncts:
+            node = conjuncts.pop()
+            if node.value == '∧':
+                conjuncts.append(node.right)
+                conjuncts.append(node.left)
+                continue
+
+            clause = []
+            satisfied = False
+            disjuncts = [node]
+            while disjuncts:
+                literal = disjuncts.pop()
+                if literal.value == '∨':
+                    disjuncts.append(literal.right)
+                    disjuncts.append(literal.left)
+                    continue
+                positive = True
+                if literal.value == '¬':
+                    positive = False
+                    literal = literal.right
+                if literal.left is not None or literal.right is not None:
+                    raise ValueError(f"Formula is not in clausal form: {self._node_to_string(node)}")
+                if literal.value in ['⊤', '⊥']:
+                    satisfied = satisfied or (literal.value == '⊤') == positive
+                else:
+                    clause.append(clause_set.literal(literal.value, positive))
+            yield None if satisfied else clause
+
+    def __simplify(self, simplifier: Simplifier) -> Node:
+        clause_set = ClauseSet()
+        clauses = simplifier.run(self.__clauses(clause_set, self._root))
+        if not clauses:
+            return self.__node('⊤')
 
-    def __convert_to_cnf(self, root: Node) -> Node:
+        def literal(number: int) -> Node:
+            atom = self.__node(clause_set.name(number))
+            return atom if number > 0 else self.__node(value='¬', right=atom)
+
+        return self.__from_clauses([[literal(number) for number in clause] or [self.__node('⊥')] for clause in clauses])
+
+    def clauses(self) -> List[Tuple[int, ...]]:
+        return list(self.to_clause_set())
+
+    def __convert_to_cnf(self, root: Node, clausal: bool = False) -> Node:
         if root is None:
             raise ValueError("Cannot convert an empty formula to CNF.")
         
-        root = self.__eliminate_implications(root)
-        root = self.__de_morgan(root)
-        root = self.__distribute_or_over_and(root)
+        with instrument.stage('cnf.eliminate_implications'):
+            root = self.__eliminate_implications(root)
+        with instrument.stage('cnf.de_morgan'):
+            root = self.__de_morgan(root)
+            if clausal:
+                # One De Morgan pass can leave a negation above a compound
+                # formula (¬¬¬(p ∧ q)); clauses need every negation on an atom.
+                pushed = self.__de_morgan(root)
+                while pushed is not root:
+                    root, pushed = pushed, self.__de_morgan(pushed)
+        with instrument.stage('cnf.distribute'):
+            root = self.__distribute_or_over_and(root)
 
         return root
     
-    def __eliminate_implications(self, root: Node) -> Node:
-        if root is None:
-            return None
-
-        root.left = self.__eliminate_implications(root.left)
-        root.right = self.__eliminate_implications(root.right)
+    def __rebuild(self, root: Node, left: Optional[Node], right: Optional[Node]) -> Node:
+        if left is root.left and right is root.right:
+            return root
+        return self.__node(value=root.value, left=left, right=right)
 
-        if root.value == '→':
-            left_node = Node(value='¬', right=root.left)
-            new_root = Node(value='∨', left=left_node, right=root.right)
-            return new_root
+    def __eliminate_implications(self, root: Node) -> Node:
+        def leave(node: Node, left: Optional[Node], right: Optional[Node]) -> Node:
+            if node.value == '→':
+                left_node = self.__node(value='¬', right=left)
+                return self.__node(value='∨', left=left_node, right=right)
+            return self.__rebuild(node, left, right)
 
-        return root
+        return rewrite(root, leave)
 
     def __de_morgan(self, root: Node) -> Node:
-        if root is None:
-            return None
-        
-        if root.value == '¬':
-            match root.right.value:
-                case '¬':
-                    root = root.right.right
-                case '∧':
-                    left_node = Node(value='¬', right=root.right.left)
-                    right_node = Node(value='¬', right=root.right.right)
-                    root = Node(value='∨', left=left_node, right=right_node)
-                case '∨':
-                    left_node = Node(value='¬', right=root.right.left)
-                    right_node = Node(value='¬', right=root.right.right)
-                    root = Node(value='∧', left=left_node, right=right_node)
-                
-
-        root.left = self.__de_morgan(root.left)
-        root.right = self.__de_morgan(root.right)
-    
-        return root
+        # Each node is rewritten once on the way down, before its children.
+        def enter(node: Node) -> Node:
+            if node.value == '¬':
+                match node.right.value:
+                    case '¬':
+                        node = node.right.right
+                    case '∧':
+                        left_node = self.__node(value='¬', right=node.right.left)
+                        right_node = self.__node(value='¬', right=node.right.right)
+                        node = self.__node(value='∨', left=left_node, right=right_node)
+                    case '∨':
+                        left_node = self.__node(value='¬', right=node.right.left)
+                        right_node = self.__node(value='¬', right=node.right.right)
+                        node = self.__node(value='∧', left=left_node, right=right_node)
+            return node
+
+        return rewrite(root, self.__rebuild, enter)
     
     def __distribute_or_over_and(self, root: Node) -> Node:
+        # A distributed node is walked again, as its new disjunctions may
+        # themselves have conjunctions to push down.
+        def leave(node: Node, left: Optional[Node], right: Optional[Node]) -> Union[Node, Revisit]:
+            node = self.__rebuild(node, left, right)
+            if node.value == '∨':
+                if node.left and node.left.value == '∧': # (A ∧ B) ∨ C
+                    left_node = self.__node(value='∨', left=node.left.left, right=node.right)
+                    right_node = self.__node(value='∨', left=node.left.right, right=node.right)
+                    instrument.count('cnf.distributions')
+                    return Revisit(self.__node(value='∧', left=left_node, right=right_node))
+                elif node.right and node.right.value == '∧': # A ∨ (B ∧ C)
+                    left_node = self.__node(value='∨', left=node.left, right=node.right.left)
+                    right_node = self.__node(value='∨', left=node.left, right=node.right.right)
+                    instrument.count('cnf.distributions')
+                    return Revisit(self.__node(value='∧', left=left_node, right=right_node))
+            return node
+
+        return rewrite(root, leave)
+
+    def __encode(self, root: Node, prefix: str, polarity_aware: bool) -> Node:
         if root is None:
-            return None
-        
-        root.left = self.__distribute_or_over_and(root.left)
-        root.right = self.__distribute_or_over_and(root.right)
-        
-        if root.value == '∨':
-            if root.left and root.left.value == '∧': # (A ∧ B) ∨ C
-                left_node = Node(
-                    value='∨',
-                    left=root.left.left.copy(),
-                    right=root.right.copy()
-                )
-
-                right_node = Node(
-                    value='∨',
-                    left=root.left.right.copy(),
-                    right=root.right.copy()
-                )
-
-                root = Node(
-                    value='∧',
-                    left=left_node,
-                    right=right_node
-                )
-                
-                return self.__distribute_or_over_and(root)
-
-            elif root.right and root.right.value == '∧': # A ∨ (B ∧ C) 
-                left_node = Node(
-                    value='∨',
-                    left=root.left.copy(),
-                    right=root.right.left.copy()
-                )
-
-                right_node = Node(
-                    value='∨',
-                    left=root.left.copy(),
-                    right=root.right.right.copy()
-                )
-
-                root = Node(
-                    value='∧',
-                    left=left_node,
-                    right=right_node
-                )
-                
-                return self.__distribute_or_over_and(root)
+            raise ValueError("Cannot convert an empty formula to CNF.")
+
+        # Pass 1: record the polarities each subformula occurs with and the
+        # names already in use. Full Tseitin needs both directions everywhere.
+        polarities: Dict[int, Set[int]] = {}
+        names: Set[str] = set()
+        stack = [(root, 1)]
+        while stack:
+            node, polarity = stack.pop()
+            seen = polarities.setdefault(id(node), set())
+            if polarity in seen:
+                continue
+            seen.update((polarity,) if polarity_aware else (1, -1))
+            if node.value == '¬':
+                stack.append((node.right, -polarity))
+            elif node.value == '→':
+                stack.append((node.left, -polarity))
+                stack.append((node.right, polarity))
+            elif node.value in ['∧', '∨']:
+                stack.append((node.left, polarity))
+                stack.append((node.right, polarity))
+            else:
+                names.add(node.value)
+
+        # Pass 2: post-order, give every binary subformula a fresh variable
+        # and emit the clauses defining it.
+        literals: Dict[int, Node] = {}
+        clauses: List[List[Node]] = []
+        counter = 0
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in literals:
+                continue
+            if node.value == '¬':
+                if not expanded:
+                    stack.extend([(node, True), (node.right, False)])
+                    continue
+                literals[id(node)] = self.__negate(literals[id(node.right)])
+            elif node.value in ['→', '∧', '∨']:
+                if not expanded:
+                    stack.extend([(node, True), (node.right, False), (node.left, False)])
+                    continue
+                counter += 1
+                while f"{prefix}{counter}" in names:
+                    counter += 1
+                name = f"{prefix}{counter}"
+                self.auxiliary_variables[name] = ParseTree(node)
+                gate = self.__node(name)
+                literals[id(node)] = gate
+                left, right = literals[id(node.left)], literals[id(node.right)]
+                clauses.extend(self.__gate_clauses(node.value, gate, left, right, polarities[id(node)]))
+            else:
+                literals[id(node)] = node
+
+        clauses.append([literals[id(root)]])
+        return self.__from_clauses(clauses)
+
+    def __gate_clauses(self, operator: str, gate: Node, left: Node, right: Node, polarities: Set[int]) -> List[List[Node]]:
+        neg = self.__negate
+        clauses = []
+        match operator:
+            case '∧':
+                if 1 in polarities:
+                    clauses += [[neg(gate), left], [neg(gate), right]]
+                if -1 in polarities:
+                    clauses += [[neg(left), neg(right), gate]]
+            case '∨':
+                if 1 in polarities:
+                    clauses += [[neg(gate), left, right]]
+                if -1 in polarities:
+                    clauses += [[neg(left), gate], [neg(right), gate]]
+            case '→':
+                if 1 in polarities:
+                    clauses += [[neg(gate), neg(left), right]]
+                if -1 in polarities:
+                    clauses += [[left, gate], [neg(right), gate]]
+        return clauses
+
+    def __negate(self, literal: Node) -> Node:
+        if literal.value == '¬':
+            return literal.right
+        return self.__node(value='¬', right=literal)
 
+    def __from_clauses(self, clauses: List[List[Node]]) -> Node:
+        root = None
+        for clause in clauses:
+            disjunction = clause[0]
+            for literal in clause[1:]:
+                disjunction = self.__node(value='∨', left=disjunction, right=literal)
+            root = disjunction if root is None else self.__node(value='∧', left=root, right=disjunction)
         return root
\ No newline at end of file
@@ -0,0 +1,190 @@
+import io
+import mmap
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from logic_toolkit.base import ParseTree, SymbolTable
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.cnf import CNF
+
+Source = Union[str, BinaryIO]
+
+class DimacsReader:
+    # Clauses are yielded one at a time straight from the byte stream, so
+    # memory does not grow with the file. Comments of the form
+    # "c var <number> <name>" (as written by write()) restore names.
+    def __init__(self, source: Source, use_mmap: bool = False) -> None:
+        self.num_variables: Optional[int] = None
+        self.num_clauses: Optional[int] = None
+        self.names: Dict[int, str] = {}
+        self.__owned = isinstance(source, str)
+        self.__file = open(source, 'rb') if isinstance(source, str) else source
+        self.__map: Optional[mmap.mmap] = None
+        if use_mmap:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__lines = iter(self.__map.readline, b'') if self.__map is not None else iter(self.__file)
+        self.__line_number = 0
+        self.__read_header()
+
+    def __enter__(self) -> "DimacsReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__owned:
+            self.__file.close()
+
+    def __read_header(self) -> None:
+        owners: Dict[str, int] = {}
+        for line in self.__lines:
+            self.__line_number += 1
+            if isinstance(line, str):
+                line = line.encode()
+            tokens = line.split()
+            if not tokens:
+                continue
+            if tokens[0] == b'c':
+                if len(tokens) == 4 and tokens[1] == b'var':
+                    number, name = int(tokens[2]), tokens[3].decode()
+                    if owners.setdefault(name, number) != number:
+                        raise ValueError(f"line {self.__line_number}: variable name '{name}' is already used by variable {owners[name]}")
+                    self.names[number] = name
+                continue
+            if tokens[0] != b'p' or len(tokens) != 4 or tokens[1] != b'cnf':
+                raise ValueError(f"line {self.__line_number}: expected 'p cnf <variables> <clauses>'")
+            self.num_variables, self.num_clauses = int(tokens[2]), int(tokens[3])
+            return
+        raise ValueError("Missing DIMACS header 'p cnf <variables> <clauses>'")
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        clause: List[int] = []
+        limit = self.num_variables
+        for line in self.__lines:
+            self.__line_number += 1
+            if isinstance(line, str):
+                line = line.encode()
+            tokens = line.split()
+            if not tokens or tokens[0] == b'c':
+                continue
+            if tokens[0] == b'%':
+                break
+            literals = list(map(int, tokens))
+            # Fast path: the usual one complete clause per line.
+            if not clause and literals[-1] == 0 and 0 not in literals[:-1]:
+                if literals[:-1] and (max(literals) > limit or min(literals) < -limit):
+                    bad = max(literals, key=abs)
+                    raise ValueError(f"line {self.__line_number}: variable {abs(bad)} exceeds the declared {limit}")
+                yield tuple(literals[:-1])
+                continue
+            for literal in literals:
+                if literal == 0:
+                    yield tuple(clause)
+                    clause = []
+                elif -limit <= literal <= limit:
+                    clause.append(literal)
+                else:
+                    raise ValueError(f"line {self.__line_number}: variable {abs(literal)} exceeds the declared {limit}")
+        if clause:
+            yield tuple(clause)
+
+    def names_for(self, prefix: str = 'x') -> List[str]:
+        # Unnamed variables get <prefix><number>, or <prefix><number>_<k>
+        # when a "c var" line already took that name.
+        taken = set(self.names.values())
+        names = []
+        for number in range(1, self.num_variables + 1):
+            name = self.names.get(number)
+            if name is None:
+                name = f'{prefix}{number}'
+                suffix = 0
+                while name in taken:
+                    suffix += 1
+                    name = f'{prefix}{number}_{suffix}'
+                taken.add(name)
+            names.append(name)
+        return names
+
+def iter_clauses(source: Source, use_mmap: bool = False) -> Iterator[Tuple[int, ...]]:
+    with DimacsReader(source, use_mmap) as reader:
+        yield from reader
+
+def read(source: Source, use_mmap: bool = False, prefix: str = 'x', symbols: Optional[SymbolTable] = None) -> ClauseSet:
+    with DimacsReader(source, use_mmap) as reader:
+        clause_set = ClauseSet(reader.names_for(prefix), symbols)
+        if symbols is None:
+            for clause in reader:
+                clause_set.add_clause(clause)
+        else:
+            number = [0] + [clause_set.variable(name) for name in reader.names_for(prefix)]
+            for clause in reader:
+                clause_set.add_clause(number[literal] if literal > 0 else -number[-literal] for literal in clause)
+    return clause_set
+
+def read_cnf(source: Source, use_mmap: bool = False, prefix: str = 'x') -> CNF:
+    return CNF(read(source, use_mmap, prefix))
+
+def write(formula: Union[ClauseSet, ParseTree, Iterable[Iterable[int]]], target: Union[str, BinaryIO, TextIO], num_variables: Optional[int] = None, num_clauses: Optional[int] = None, names: bool = True, batch: int = 4096) -> None:
+    # Clauses are formatted in batches and written through a buffered
+    # file, so a large CNF costs one write call per batch. When the counts
+    # of a plain clause stream are not given, the clauses are first spooled
+    # to a temporary file while they are counted, so the real header goes
+    # first without holding the stream in memory or seeking in the target.
+    symbols = None
+    if isinstance(formula, ParseTree):
+        formula = (formula if isinstance(formula, CNF) else CNF(formula, encoding='tseitin')).to_clause_set()
+    if isinstance(formula, ClauseSet):
+        symbols = formula.symbols if names else None
+        num_variables, num_clauses = formula.num_variables, len(formula)
+
+    spool = None
+    if num_variables is None or num_clauses is None:
+        spool = tempfile.TemporaryFile()
+        count, highest = _write_clauses(formula, lambda text: spool.write(text.encode()), batch)
+        num_variables = highest if num_variables is None else num_variables
+        num_clauses = count if num_clauses is None else num_clauses
+        spool.seek(0)
+
+    owned = isinstance(target, str)
+    out = open(target, 'wb', buffering=1 << 16) if owned else target
+    text = isinstance(out, io.TextIOBase)
+    emit = out.write if text else (lambda text: out.write(text.encode()))
+    try:
+        if symbols is not None:
+            emit(''.join(f'c var {i} {symbols.name(i)}\n' for i in range(1, num_variables + 1)))
+        emit(f'p cnf {num_variables} {num_clauses}\n')
+        if spool is None:
+            _write_clauses(formula, emit, batch)
+        elif text:
+            for chunk in iter(lambda: spool.read(1 << 16), b''):
+                out.write(chunk.decode('ascii'))
+        else:
+            shutil.copyfileobj(spool, out, 1 << 16)
+    finally:
+        if spool is not None:
+            spool.close()
+        if owned:
+            out.close()
+        else:
+            out.flush()
+
+def _write_clauses(clauses: Iterable[Iterable[int]], emit: Callable[[str], Any], batch: int) -> Tuple[int, int]:
+    # Returns the number of clauses and the highest variable written.
+    highest = count = 0
+    lines: List[str] = []
+    for clause in clauses:
+        clause = tuple(clause)
+        count += 1
+        if clause:
+            highest = max(highest, max(map(abs, clause)))
+        lines.append(' '.join(map(str, clause)) + ' 0\n' if clause else '0\n')
+        if len(lines) >= batch:
+            emit(''.join(lines))
+            lines = []
+    emit(''.join(lines))
+    return count, highest
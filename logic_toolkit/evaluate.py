@@ -0,0 +1,184 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from logic_toolkit.base import Node, ParseTree
+from logic_toolkit.wff import WellFormedFormula
+
+Instruction = Tuple[str, int, int]
+
+class TruthTable:
+    # Each register holds one column of the truth table as a big integer:
+    # bit a is the value under assignment a, where variable i is bit i of
+    # a. Every instruction therefore evaluates a whole chunk of assignments
+    # with a single bitwise operation.
+    OPERATORS = {'¬', '∧', '∨', '→'}
+
+    def __init__(self, formula: Union[ParseTree, str], variables: Optional[List[str]] = None, chunk_bits: int = 20) -> None:
+        if isinstance(formula, str):
+            formula = WellFormedFormula(formula)
+        elif not isinstance(formula, ParseTree):
+            raise TypeError("Expected a ParseTree or a string representation of a formula.")
+        if not formula.is_built:
+            raise ValueError("Cannot evaluate an empty formula.")
+        if chunk_bits < 0:
+            raise ValueError("chunk_bits must not be negative.")
+
+        self.variables: List[str] = list(variables) if variables is not None else formula.variables()
+        missing = [name for name in formula.variables() if name not in self.variables]
+        if missing:
+            raise ValueError(f"Variables missing from the ordering: {', '.join(missing)}")
+
+        self.chunk_bits = chunk_bits
+        self.instructions: List[Instruction] = []
+        self.__release: List[List[int]] = []
+        self.__output = self.__compile(formula.root)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(variables={len(self.variables)}, instructions={len(self.instructions)})'
+
+    @property
+    def num_assignments(self) -> int:
+        return 1 << len(self.variables)
+
+    def __compile(self, root: Node) -> int:
+        # Registers 0 and 1 hold ⊥ and ⊤, then one register per variable.
+        # Structurally equal subtrees get the same register (value
+        # numbering), so shared or repeated subformulas are computed once.
+        index = {name: i + 2 for i, name in enumerate(self.variables)}
+        numbered: Dict[Tuple, int] = {}
+        registers: Dict[int, int] = {}
+        last_use: Dict[int, int] = {}
+        stack: List[Tuple[Node, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in registers:
+                continue
+            if node.value not in self.OPERATORS:
+                if node.value == '⊥':
+                    registers[id(node)] = 0
+                elif node.value == '⊤':
+                    registers[id(node)] = 1
+                else:
+                    registers[id(node)] = index[node.value]
+                continue
+            if not expanded:
+                stack.append((node, True))
+                if node.right is not None:
+                    stack.append((node.right, False))
+                if node.left is not None:
+                    stack.append((node.left, False))
+                continue
+
+            a = registers[id(node.left)] if node.value != '¬' else registers[id(node.right)]
+            b = registers[id(node.right)] if node.value != '¬' else -1
+            key = (node.value, a, b)
+            if key not in numbered:
+                numbered[key] = len(index) + 2 + len(self.instructions)
+                self.instructions.append(key)
+                last_use[a] = numbered[key]
+                if b >= 0:
+                    last_use[b] = numbered[key]
+            registers[id(node)] = numbered[key]
+
+        output = registers[id(root)]
+        last_use.pop(output, None)
+        first = len(index) + 2
+        self.__release = [[] for _ in self.instructions]
+        for register, user in last_use.items():
+            if register >= first:
+                self.__release[user - first].append(register)
+        return output
+
+    def __run(self, inputs: List[int], full: int) -> int:
+        registers: List[Optional[int]] = [0, full] + inputs
+        release = self.__release
+        for position, (op, a, b) in enumerate(self.instructions):
+            x = registers[a]
+            if op == '¬':
+                registers.append(x ^ full)
+            elif op == '∧':
+                registers.append(x & registers[b])
+            elif op == '∨':
+                registers.append(x | registers[b])
+            else:
+                registers.append((x ^ full) | registers[b])
+            for register in release[position]:
+                registers[register] = None
+        return registers[self.__output]
+
+    def chunks(self) -> Iterator[Tuple[int, int, int]]:
+        # Yields (first assignment, width, column) for consecutive blocks of
+        # at most 2**chunk_bits assignments, so memory stays bounded however
+        # many variables there are.
+        n = len(self.variables)
+        low = min(n, self.chunk_bits)
+        width = 1 << low
+        full = (1 << width) - 1
+
+        patterns = []
+        for i in range(low):
+            span = 1 << i
+            pattern = ((1 << span) - 1) << span
+            size = span << 1
+            while size < width:
+                pattern |= pattern << size
+                size <<= 1
+            patterns.append(pattern)
+
+        for chunk in range(1 << (n - low)):
+            inputs = patterns + [full if chunk >> (i - low) & 1 else 0 for i in range(low, n)]
+            yield chunk << low, width, self.__run(inputs, full)
+
+    def column(self) -> int:
+        if len(self.variables) > self.chunk_bits:
+            raise ValueError(f"{len(self.variables)} variables do not fit in one chunk of {self.chunk_bits} bits; use chunks().")
+        return next(self.chunks())[2]
+
+    def evaluate(self, assignment: Dict[str, bool]) -> bool:
+        missing = [name for name in self.variables if name not in assignment]
+        if missing:
+            raise ValueError(f"No value for: {', '.join(missing)}")
+        return bool(self.__run([1 if assignment[name] else 0 for name in self.variables], 1))
+
+    def is_tautology(self) -> bool:
+        return all(column == (1 << width) - 1 for _, width, column in self.chunks())
+
+    def is_satisfiable(self) -> bool:
+        return any(column for _, _, column in self.chunks())
+
+    def count_models(self) -> int:
+        return sum(column.bit_count() for _, _, column in self.chunks())
+
+    def models(self) -> Iterator[Dict[str, bool]]:
+        variables = self.variables
+        for offset, _, column in self.chunks():
+            while column:
+                lowest = column & -column
+                assignment = offset + lowest.bit_length() - 1
+                column ^= lowest
+                yield {name: bool(assignment >> i & 1) for i, name in enumerate(variables)}
+
+def _ordering(*formulas: ParseTree) -> List[str]:
+    seen: Dict[str, None] = {}
+    for formula in formulas:
+        for name in formula.variables():
+            seen.setdefault(name, None)
+    return list(seen)
+
+def _tree(formula: Union[ParseTree, str]) -> ParseTree:
+    return WellFormedFormula(formula) if isinstance(formula, str) else formula
+
+def is_tautology(formula: Union[ParseTree, str], chunk_bits: int = 20) -> bool:
+    return TruthTable(formula, chunk_bits=chunk_bits).is_tautology()
+
+def is_satisfiable(formula: Union[ParseTree, str], chunk_bits: int = 20) -> bool:
+    return TruthTable(formula, chunk_bits=chunk_bits).is_satisfiable()
+
+def models(formula: Union[ParseTree, str], chunk_bits: int = 20) -> Iterator[Dict[str, bool]]:
+    return TruthTable(formula, chunk_bits=chunk_bits).models()
+
+def equivalent(a: Union[ParseTree, str], b: Union[ParseTree, str], chunk_bits: int = 20) -> bool:
+    a, b = _tree(a), _tree(b)
+    variables = _ordering(a, b)
+    left = TruthTable(a, variables, chunk_bits).chunks()
+    right = TruthTable(b, variables, chunk_bits).chunks()
+    return all(x[2] == y[2] for x, y in zip(left, right))
@@ -1,74 +1,74 @@
-from logic_toolkit.base import ParseTree, Node
+from logic_toolkit import instrument
+from logic_toolkit.base import ParseTree, Node, SymbolTable, is_variable
 from logic_toolkit.wff import WellFormedFormula
-from typing import Optional, Union, Set, List, Tuple
+from typing import Optional, Union, Set, List, Tuple, Dict
+import re
 
 class HornFormula(ParseTree):
-    def __init__(self, formula: Optional[Union[WellFormedFormula, str]] = None) -> None:
+    # ASCII spellings only count as whole tokens, so identifiers such as
+    # "value" or "True_flag" are left alone.
+    __DISJUNCTION = re.compile(r'∨|\||¬|(?<!\w)v(?!\w)')
+    __CONSTANTS = re.compile(r'(?<!\w)(T|F|true|false)(?!\w)')
+
+    def __init__(self, formula: Optional[Union[ParseTree, str]] = None, symbols: Optional[SymbolTable] = None) -> None:
         super().__init__()
         if isinstance(formula, str):
-            if "∨" in formula or "v" in formula or "|" in formula or "¬" in formula:
+            if self.__DISJUNCTION.search(formula):
                 self._root = None
                 self.is_valid_horn = False
                 return
             
             formula = formula.replace('&', '∧').replace('^', '∧').replace('->', '→').replace('=>', '→')
-            formula = formula.replace('T', '⊤').replace('F', '⊥').replace('true', '⊤').replace('false', '⊥')
+            formula = self.__CONSTANTS.sub(lambda match: '⊤' if match.group(1) in ['T', 'true'] else '⊥', formula)
             
-            formula = WellFormedFormula(formula)
-        elif not isinstance(formula, WellFormedFormula):
-            raise TypeError("Expected a WellFormedFormula or a string representation of a formula.")
+            formula = WellFormedFormula(formula, symbols=symbols)
+        elif not isinstance(formula, ParseTree):
+            raise TypeError("Expected a ParseTree or a string representation of a formula.")
         
-        self._root = formula.root.copy()
+        self._root = formula.root
         self.is_valid_horn = self.__validate_horn_formula(self._root)
         
+    def __is_atom(self, value: str) -> bool:
+        return value.islower() and is_variable(value)
+
     def __validate_horn_formula(self, root: Node) -> bool:
-        if root is None:
-            return True
-            
-        if root.value in ['⊤', '⊥']:
-            return root.left is None and root.right is None
-            
-        if root.value.islower() and len(root.value) == 1:
-            return root.left is None and root.right is None
-            
-        if root.value == '∧':
-            left_valid = self.__validate_horn_formula(root.left)
-            right_valid = self.__validate_horn_formula(root.right)
-            return left_valid and right_valid
-        
-        if root.value == '→':
-            if not self.__is_single_literal_or_constant(root.right):
+        # A conjunction tree whose leaves are atoms, constants or rules.
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if node.value in ['⊤', '⊥'] or self.__is_atom(node.value):
+                if node.left is not None or node.right is not None:
+                    return False
+            elif node.value == '∧':
+                stack.append(node.right)
+                stack.append(node.left)
+            elif node.value == '→':
+                if not self.__is_single_literal_or_constant(node.right) or not self.__validate_antecedent(node.left):
+                    return False
+            else:
                 return False
-            
-            return self.__validate_antecedent(root.left)
-        
-        if root.value == '∨':
-            return False
-        
-        return False
+        return True
         
     def __validate_antecedent(self, node: Node) -> bool:
-        if node is None:
-            return True
-            
-        if (node.value.islower() and len(node.value) == 1) or node.value in ['⊤', '⊥']:
-            return node.left is None and node.right is None
-            
-        if node.value == '∧':
-            left_valid = ((node.left.value.islower() and len(node.left.value) == 1) or 
-                         node.left.value in ['⊤', '⊥']) and node.left.left is None and node.left.right is None
-            
-            right_valid = self.__validate_antecedent(node.right)
-            
-            return left_valid and right_valid
-            
-        return False
+        # A conjunction of atoms or constants in any grouping, so the
+        # left-nested p ∧ q ∧ s of the phase 3 workloads is accepted.
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is not None and node.value == '∧':
+                stack.append(node.right)
+                stack.append(node.left)
+            elif not self.__is_single_literal_or_constant(node):
+                return False
+        return True
     
     def __is_single_literal_or_constant(self, node: Node) -> bool:
         if node is None:
             return True
             
-        if node.value.islower() and len(node.value) == 1:
+        if self.__is_atom(node.value):
             return node.left is None and node.right is None
             
         if node.value in ['⊤', '⊥']:
@@ -78,39 +78,45 @@ class HornFormula(ParseTree):
         
     def __extract_horn_clauses(self, root: Node) -> List[Tuple[Set[str], str]]:
         clauses = []
-        
-        if root is None:
-            return clauses
-            
-        if root.value == '→':
-            antecedent_vars = set()
-            self.__extract_antecedent_vars(root.left, antecedent_vars)
-            consequent = root.right.value
-            clauses.append((antecedent_vars, consequent))
-            return clauses
-        elif root.value in ['⊤', '⊥']:
-            return [(set(['⊤']), root.value)]
-        elif root.value.islower() and len(root.value) == 1:
-            return [(set(), root.value)]
-        elif root.value == '∧':
-            left_clauses = self.__extract_horn_clauses(root.left)
-            right_clauses = self.__extract_horn_clauses(root.right)
-            return left_clauses + right_clauses
-            
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if node.value == '→':
+                clauses.append((self.__extract_antecedent_vars(node.left), node.right.value))
+            elif node.value in ['⊤', '⊥']:
+                clauses.append((set(['⊤']), node.value))
+            elif self.__is_atom(node.value):
+                clauses.append((set(), node.value))
+            elif node.value == '∧':
+                stack.append(node.right)
+                stack.append(node.left)
         return clauses
         
-    def __extract_antecedent_vars(self, node: Node, vars_set: Set[str]) -> None:
-        if node is None:
-            return
-            
-        if node.value == '∧':
-            self.__extract_antecedent_vars(node.left, vars_set)
-            self.__extract_antecedent_vars(node.right, vars_set)
-        elif node.value.islower() and len(node.value) == 1:
-            vars_set.add(node.value)
-        elif node.value == '⊤':
-            vars_set.add('⊤')
+    def __extract_antecedent_vars(self, node: Node) -> Set[str]:
+        vars_set = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if node.value == '∧':
+                stack.append(node.right)
+                stack.append(node.left)
+            elif self.__is_atom(node.value):
+                vars_set.add(node.value)
+            elif node.value in ['⊤', '⊥']:
+                # ⊥ is never true, so a rule with a ⊥ premise never fires.
+                vars_set.add(node.value)
+        return vars_set
             
+    def clauses(self) -> List[Tuple[Set[str], str]]:
+        if not self.is_valid_horn:
+            raise ValueError("Not a valid Horn formula.")
+        return self.__extract_horn_clauses(self._root)
+
+    @instrument.timed('horn.check')
     def check_satisfiability(self) -> Tuple[bool, Set[str]]:
         if not self.is_valid_horn:
             return False, set()
@@ -127,27 +133,160 @@ class HornFormula(ParseTree):
             
         horn_clauses = self.__extract_horn_clauses(self._root)
         
+        # Dowling-Gallier: each clause counts its premises that are not yet
+        # true, and each variable lists the clauses waiting on it, so every
+        # clause is touched once per premise instead of once per pass.
         true_vars = set()
         true_vars.add('⊤')
-                
-        changed = True
-        while changed:
-            changed = False
-            for antecedent, consequent in horn_clauses:
-                if '⊤' in antecedent and len(antecedent) == 1:
-                    if consequent not in true_vars and consequent != '⊥':
-                        true_vars.add(consequent)
-                        changed = True
-                    elif consequent == '⊥':
-                        return False, set()
-                
-                elif antecedent and antecedent.issubset(true_vars) and consequent not in true_vars and consequent != '⊥':
-                    true_vars.add(consequent)
-                    changed = True
-                elif antecedent and antecedent.issubset(true_vars) and consequent == '⊥':
-                    return False, set()
+
+        pending: List[int] = []
+        watchers: Dict[str, List[int]] = {}
+        for index, (antecedent, _) in enumerate(horn_clauses):
+            missing = 0
+            for var in antecedent:
+                if var not in true_vars:
+                    missing += 1
+                    watchers.setdefault(var, []).append(index)
+            pending.append(missing)
+
+        queue = [index for index, count in enumerate(pending) if count == 0]
+        iterations = 0
+        while queue:
+            iterations += 1
+            consequent = horn_clauses[queue.pop()][1]
+            if consequent == '⊥':
+                instrument.count('horn.iterations', iterations)
+                return False, set()
+            if consequent in true_vars:
+                continue
+            true_vars.add(consequent)
+            for index in watchers.get(consequent, ()):
+                pending[index] -= 1
+                if pending[index] == 0:
+                    queue.append(index)
+        instrument.count('horn.iterations', iterations)
         
         if '⊤' in true_vars:
             true_vars.remove('⊤')
             
         return True, true_vars
+
+
+class HornKnowledgeBase:
+    def __init__(self, formula: Optional[Union[ParseTree, str]] = None) -> None:
+        self.__clauses: Dict[int, Tuple[Set[str], str]] = {}
+        self.__missing: Dict[int, int] = {}
+        self.__watchers: Dict[str, Set[int]] = {}
+        self.__producers: Dict[str, Set[int]] = {}
+        self.__support: Dict[str, int] = {}
+        self.__conflicts: Set[int] = set()
+        self.__model: Set[str] = {'⊤'}
+        self.__next_id = 0
+        if formula is not None:
+            self.add_clause(formula)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(clauses={len(self.__clauses)}, model={len(self.__model) - 1})'
+
+    def __len__(self) -> int:
+        return len(self.__clauses)
+
+    @property
+    def is_satisfiable(self) -> bool:
+        return not self.__conflicts
+
+    @property
+    def model(self) -> Set[str]:
+        return self.__model - {'⊤'}
+
+    def entails(self, var: str) -> bool:
+        return bool(self.__conflicts) or var in self.__model
+
+    def check_satisfiability(self) -> Tuple[bool, Set[str]]:
+        if self.__conflicts:
+            return False, set()
+        return True, self.model
+
+    def add_clause(self, clause: Union[ParseTree, str, Tuple[Set[str], str]]) -> List[int]:
+        if isinstance(clause, tuple):
+            clauses = [clause]
+        else:
+            horn = HornFormula(clause)
+            if not horn.is_valid_horn:
+                raise ValueError(f"Not a valid Horn formula: {clause}")
+            clauses = horn.clauses()
+        return [self.__insert(set(antecedent), consequent) for antecedent, consequent in clauses]
+
+    def add_fact(self, var: str) -> int:
+        return self.__insert({'⊤'}, var)
+
+    def retract(self, clause_id: int) -> None:
+        if clause_id not in self.__clauses:
+            raise KeyError(f"Unknown clause: {clause_id}")
+
+        antecedent, consequent = self.__clauses.pop(clause_id)
+        del self.__missing[clause_id]
+        for var in antecedent:
+            self.__watchers[var].discard(clause_id)
+        self.__producers[consequent].discard(clause_id)
+        self.__conflicts.discard(clause_id)
+
+        if self.__support.get(consequent) != clause_id:
+            return
+
+        # Truth maintenance: withdraw everything whose support depends on
+        # the retracted clause, then re-derive what still has support.
+        withdrawn = [consequent]
+        seen = {consequent}
+        for var in withdrawn:
+            for dependent in self.__watchers.get(var, ()):
+                derived = self.__clauses[dependent][1]
+                if self.__support.get(derived) == dependent and derived not in seen:
+                    seen.add(derived)
+                    withdrawn.append(derived)
+
+        for var in withdrawn:
+            self.__model.discard(var)
+            del self.__support[var]
+        for var in withdrawn:
+            for dependent in self.__watchers.get(var, ()):
+                self.__missing[dependent] += 1
+                self.__conflicts.discard(dependent)
+
+        queue = [producer for var in withdrawn for producer in self.__producers.get(var, ()) if self.__missing[producer] == 0]
+        self.__propagate(queue)
+
+    def __insert(self, antecedent: Set[str], consequent: str) -> int:
+        if not antecedent:
+            antecedent = {'⊤'}
+        clause_id = self.__next_id
+        self.__next_id += 1
+
+        self.__clauses[clause_id] = (antecedent, consequent)
+        self.__missing[clause_id] = sum(1 for var in antecedent if var not in self.__model)
+        for var in antecedent:
+            self.__watchers.setdefault(var, set()).add(clause_id)
+        self.__producers.setdefault(consequent, set()).add(clause_id)
+
+        if self.__missing[clause_id] == 0:
+            self.__propagate([clause_id])
+        return clause_id
+
+    def __propagate(self, queue: List[int]) -> None:
+        iterations = 0
+        while queue:
+            iterations += 1
+            clause_id = queue.pop()
+            consequent = self.__clauses[clause_id][1]
+            if consequent == '⊥':
+                self.__conflicts.add(clause_id)
+                continue
+            if consequent in self.__model:
+                continue
+            self.__model.add(consequent)
+            self.__support[consequent] = clause_id
+            for dependent in self.__watchers.get(consequent, ()):
+                self.__missing[dependent] -= 1
+                if self.__missing[dependent] == 0:
+                    queue.append(dependent)
+        instrument.count('horn.kb.iterations', iterations)
@@ -0,0 +1,184 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from logic_toolkit.base import Node
+
+# Engines test this flag before recording anything, so instrumentation
+# costs one global lookup per stage while it is off. Node allocations and
+# copies are too frequent even for that: their counting wrappers are only
+# installed while instrumentation is on.
+enabled = False
+
+Hook = Callable[[str, str, float], None]
+
+_timers: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, int] = {}
+_hooks: List[Hook] = []
+_PROBES: List[Tuple[type, str, str]] = [(Node, '__init__', 'node.allocations'), (Node, 'copy', 'node.copies')]
+_originals: Dict[Tuple[type, str], Callable] = {}
+# Probe counts live in one-element lists bumped by the wrappers and are
+# only folded into the counters by snapshot(); hooks do not see them.
+_probed: Dict[str, List[int]] = {}
+
+def enable(hook: Optional[Hook] = None) -> None:
+    global enabled
+    if hook is not None and hook not in _hooks:
+        _hooks.append(hook)
+    if enabled:
+        return
+    for cls, attribute, name in _PROBES:
+        original = cls.__dict__[attribute]
+        _originals[(cls, attribute)] = original
+        setattr(cls, attribute, _probe(original, name))
+    enabled = True
+
+def disable() -> None:
+    global enabled
+    if not enabled:
+        return
+    for (cls, attribute), original in _originals.items():
+        setattr(cls, attribute, original)
+    _originals.clear()
+    enabled = False
+
+def _probe(function: Callable, name: str) -> Callable:
+    cell = _probed.setdefault(name, [0])
+
+    @wraps(function)
+    def counting(*args: Any, **kwargs: Any) -> Any:
+        cell[0] += 1
+        return function(*args, **kwargs)
+    return counting
+
+def reset() -> None:
+    _timers.clear()
+    _counters.clear()
+    for cell in _probed.values():
+        cell[0] = 0
+
+def add_hook(hook: Hook) -> None:
+    # Hooks see every event as it is recorded: ('timer', name, seconds),
+    # ('count', name, amount) or ('failure', name, 1).
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+def remove_hook(hook: Hook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def _emit(kind: str, name: str, value: float) -> None:
+    for hook in _hooks:
+        hook(kind, name, value)
+
+def count(name: str, amount: int = 1) -> None:
+    if not enabled:
+        return
+    _counters[name] = _counters.get(name, 0) + amount
+    if _hooks:
+        _emit('count', name, amount)
+
+def fail(name: str) -> None:
+    if not enabled:
+        return
+    _timer(name)['failures'] += 1
+    if _hooks:
+        _emit('failure', name, 1)
+
+def _timer(name: str) -> Dict[str, float]:
+    timer = _timers.get(name)
+    if timer is None:
+        timer = _timers[name] = {'calls': 0, 'seconds': 0.0, 'failures': 0}
+    return timer
+
+def _record(name: str, seconds: float, failed: bool) -> None:
+    timer = _timer(name)
+    timer['calls'] += 1
+    timer['seconds'] += seconds
+    if _hooks:
+        _emit('timer', name, seconds)
+    if failed:
+        fail(name)
+
+def call(name: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    # Times one call; an exception counts as a failure and is re-raised.
+    if not enabled:
+        return function(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        result = function(*args, **kwargs)
+    except BaseException:
+        _record(name, time.perf_counter() - start, True)
+        raise
+    _record(name, time.perf_counter() - start, False)
+    return result
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not enabled:
+                return function(*args, **kwargs)
+            return call(name, function, *args, **kwargs)
+        return wrapper
+    return decorate
+
+class _Stage:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, kind: Optional[type], value: Optional[BaseException], traceback: Any) -> None:
+        _record(self.name, time.perf_counter() - self.start, kind is not None)
+
+_IDLE = nullcontext()
+
+def stage(name: str) -> ContextManager[None]:
+    # with stage(name): ... times the block; an exception counts as a
+    # failure.
+    return _Stage(name) if enabled else _IDLE
+
+def snapshot() -> Dict[str, Any]:
+    return {
+        'enabled': enabled,
+        'timers': {name: dict(timer) for name, timer in sorted(_timers.items())},
+        'counters': dict(sorted({**_counters, **{name: cell[0] for name, cell in _probed.items() if cell[0]}}.items())),
+    }
+
+def to_json(**kwargs: Any) -> str:
+    return json.dumps(snapshot(), ensure_ascii=False, **kwargs)
+
+@contextmanager
+def profiling(hook: Optional[Hook] = None) -> Iterator[Dict[str, Any]]:
+    # Records only what runs inside the block; the yielded dict is filled
+    # with the snapshot on exit. The previous state and figures are lost.
+    report: Dict[str, Any] = {}
+    was_enabled = enabled
+    reset()
+    enable(hook)
+    try:
+        yield report
+    finally:
+        report.update(snapshot())
+        if hook is not None:
+            remove_hook(hook)
+        if not was_enabled:
+            disable()
+
+class Profiled:
+    # Wraps a batch task so each result carries the profile of its own
+    # run, which works the same in worker processes.
+    def __init__(self, function: Callable[[str], Dict]) -> None:
+        self.function = function
+
+    def __call__(self, text: str) -> Dict:
+        with profiling() as report:
+            result = self.function(text)
+        return dict(result, profile=report)
@@ -0,0 +1,244 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from logic_toolkit import instrument
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.cnf import CNF
+from logic_toolkit.sat import Solver
+from logic_toolkit.simplify import Simplifier
+
+Clause = Tuple[int, ...]
+# A clause over the variables in use as two bitsets: bit i of the first is
+# set when variable i occurs positively, of the second when negated.
+Bits = Tuple[int, int]
+
+class Minimizer:
+    # A clause is false exactly on the cube of assignments falsifying all
+    # its literals, so a CNF is a cover of the function's zeros and a
+    # minimum CNF is a minimum cover by prime implicates. Up to exact_limit
+    # variables the zeros are enumerated and the primes generated
+    # Quine-McCluskey style; beyond that an Espresso-like loop of expand,
+    # irredundant and reduce improves the given clauses, using the SAT
+    # solver to decide whether a candidate clause is still implied.
+    # exact_limit=0 always uses the heuristic.
+    def __init__(self, exact_limit: int = 10, iterations: int = 4, branch_limit: int = 20000) -> None:
+        self.exact_limit = exact_limit
+        self.branch_limit = branch_limit
+        self.iterations = iterations
+        self.method: Optional[str] = None
+        self.report: Dict[str, Dict[str, int]] = {}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(exact_limit={self.exact_limit})'
+
+    @instrument.timed('minimize')
+    def run(self, clauses: Iterable[Optional[Iterable[int]]]) -> List[Clause]:
+        clauses = list(clauses)
+        self.report = {'input': self.__cost(clause for clause in clauses if clause is not None)}
+        # Cheap equivalence-preserving clean-up first: tautologies,
+        # repeated literals and subsumed clauses.
+        simplified = Simplifier().run(clauses)
+        if any(not clause for clause in simplified):
+            result: List[Clause] = [()]
+            self.method = 'simplify'
+        elif not simplified:
+            result = []
+            self.method = 'simplify'
+        else:
+            variables = sorted({abs(literal) for clause in simplified for literal in clause})
+            bit = {variable: 1 << i for i, variable in enumerate(variables)}
+            cover = [self.__encode(clause, bit) for clause in simplified]
+            if len(variables) <= self.exact_limit:
+                self.method = 'exact'
+                cover = self.__exact(cover, len(variables))
+            else:
+                self.method = 'heuristic'
+                cover = self.__heuristic(cover)
+            result = sorted((self.__decode(bits, variables) for bits in cover), key=lambda clause: (len(clause), [abs(literal) for literal in clause]))
+        self.report['output'] = self.__cost(result)
+        return result
+
+    def minimize(self, clause_set: ClauseSet) -> ClauseSet:
+        minimized = ClauseSet(symbols=clause_set.symbols)
+        for clause in self.run(clause_set):
+            minimized.add_clause(clause)
+        return minimized
+
+    @staticmethod
+    def __cost(clauses: Iterable[Iterable[int]]) -> Dict[str, int]:
+        sizes = [len(tuple(clause)) for clause in clauses]
+        return {'clauses': len(sizes), 'literals': sum(sizes)}
+
+    @staticmethod
+    def __encode(clause: Clause, bit: Dict[int, int]) -> Bits:
+        positive = negative = 0
+        for literal in clause:
+            if literal > 0:
+                positive |= bit[literal]
+            else:
+                negative |= bit[-literal]
+        return positive, negative
+
+    @staticmethod
+    def __decode(bits: Bits, variables: List[int]) -> Clause:
+        positive, negative = bits
+        return tuple(variable if positive >> i & 1 else -variable for i, variable in enumerate(variables) if (positive | negative) >> i & 1)
+
+    def __exact(self, cover: List[Bits], n: int) -> List[Bits]:
+        # Zeros are assignments a (variable i is bit i) falsifying a clause.
+        # An implicant is (care, value): the assignments agreeing with value
+        # on the bits in care.
+        full = (1 << n) - 1
+        zeros = [a for a in range(1 << n) if any(not a & positive and a & negative == negative for positive, negative in cover)]
+        level: Set[Tuple[int, int]] = {(full, a) for a in zeros}
+        primes: List[Tuple[int, int]] = []
+        while level:
+            merged: Set[Tuple[int, int]] = set()
+            combined: Set[Tuple[int, int]] = set()
+            for care, value in level:
+                bits = care
+                while bits:
+                    bit = bits & -bits
+                    bits ^= bit
+                    if (care, value ^ bit) in level:
+                        merged.add((care ^ bit, value & ~bit))
+                        combined.add((care, value))
+            primes.extend(implicant for implicant in level if implicant not in combined)
+            level = merged
+
+        # Essential primes first, then greedily the prime covering the most
+        # zeros still uncovered, preferring fewer literals.
+        covers = [{a for a in zeros if a & care == value} for care, value in primes]
+        owners: Dict[int, List[int]] = {}
+        for index, covered in enumerate(covers):
+            for a in covered:
+                owners.setdefault(a, []).append(index)
+        essential = {candidates[0] for candidates in owners.values() if len(candidates) == 1}
+        remaining = set(zeros).difference(*(covers[index] for index in essential))
+        chosen = set(essential)
+        uncovered = set(remaining)
+        while uncovered:
+            best = max(range(len(primes)), key=lambda index: (len(covers[index] & uncovered), -primes[index][0].bit_count()))
+            chosen.add(best)
+            uncovered -= covers[best]
+        # Later picks can make earlier ones redundant.
+        for index in sorted(chosen, key=lambda index: primes[index][0].bit_count(), reverse=True):
+            others = chosen - {index}
+            if covers[index] <= set().union(*(covers[other] for other in others)):
+                chosen = others
+
+        # Branch and bound from the greedy cover: branch on the prime that
+        # covers the uncovered zero with the fewest candidates, giving up
+        # after branch_limit steps.
+        def cost(selection: Set[int]) -> Tuple[int, int]:
+            return len(selection), sum(primes[index][0].bit_count() for index in selection)
+
+        best_cost = cost(chosen)
+        stack = [(frozenset(essential), frozenset(remaining))]
+        for _ in range(self.branch_limit):
+            if not stack:
+                break
+            selection, uncovered = stack.pop()
+            if not uncovered:
+                if cost(selection) < best_cost:
+                    chosen, best_cost = set(selection), cost(selection)
+                continue
+            if len(selection) + 1 > best_cost[0]:
+                continue
+            zero = min(uncovered, key=lambda a: len(owners[a]))
+            for index in sorted(owners[zero], key=lambda index: len(covers[index] & uncovered)):
+                stack.append((selection | {index}, uncovered - covers[index]))
+        # The clause of an implicant has x where the zero needs x false.
+        return [(care & ~value, care & value) for care, value in (primes[index] for index in sorted(chosen))]
+
+    def __implied(self, cover: List[Optional[Bits]], clause: Bits, skip: int = -1) -> bool:
+        # The cover (without clause skip) implies clause exactly when it is
+        # unsatisfiable once every literal of clause is false.
+        positive, negative = clause
+        residual: List[List[int]] = []
+        for index, bits in enumerate(cover):
+            if bits is None or index == skip:
+                continue
+            p, n = bits
+            if p & negative or n & positive:
+                continue
+            p &= ~positive
+            n &= ~negative
+            if not p | n:
+                return True
+            residual.append([i + 1 for i in range(p.bit_length()) if p >> i & 1] + [-(i + 1) for i in range(n.bit_length()) if n >> i & 1])
+        return Solver(residual).solve() is False
+
+    def __expand(self, cover: List[Optional[Bits]], reverse: bool) -> None:
+        # Drops every literal the clause can do without, shortest clauses
+        # first, and removes the clauses the result subsumes.
+        order = sorted((index for index, bits in enumerate(cover) if bits is not None), key=lambda index: sum(part.bit_count() for part in cover[index]))
+        for index in order:
+            if cover[index] is None:
+                continue
+            positive, negative = cover[index]
+            literals = [(bit, True) for bit in self.__bits(positive)] + [(bit, False) for bit in self.__bits(negative)]
+            for bit, sign in (reversed(literals) if reverse else literals):
+                candidate = (positive & ~bit, negative) if sign else (positive, negative & ~bit)
+                if self.__implied(cover, candidate):
+                    positive, negative = candidate
+            cover[index] = (positive, negative)
+            for other, bits in enumerate(cover):
+                if other != index and bits is not None and not positive & ~bits[0] and not negative & ~bits[1]:
+                    cover[other] = None
+
+    def __irredundant(self, cover: List[Optional[Bits]]) -> None:
+        order = sorted((index for index, bits in enumerate(cover) if bits is not None), key=lambda index: -sum(part.bit_count() for part in cover[index]))
+        for index in order:
+            if self.__implied(cover, cover[index], skip=index):
+                cover[index] = None
+
+    def __reduce(self, cover: List[Optional[Bits]], width: int) -> None:
+        # Weakens each clause by every literal l for which the others still
+        # imply clause ∨ ¬l, so the next expand can head somewhere else.
+        for index, bits in enumerate(cover):
+            if bits is None:
+                continue
+            positive, negative = bits
+            for i in range(width):
+                bit = 1 << i
+                if (positive | negative) & bit:
+                    continue
+                if self.__implied(cover, (positive, negative | bit), skip=index):
+                    positive |= bit
+                elif self.__implied(cover, (positive | bit, negative), skip=index):
+                    negative |= bit
+            cover[index] = (positive, negative)
+
+    @staticmethod
+    def __bits(mask: int) -> List[int]:
+        bits = []
+        while mask:
+            bit = mask & -mask
+            bits.append(bit)
+            mask ^= bit
+        return bits
+
+    def __heuristic(self, clauses: List[Bits]) -> List[Bits]:
+        def cost(cover: List[Optional[Bits]]) -> Tuple[int, int]:
+            kept = [bits for bits in cover if bits is not None]
+            return len(kept), sum(p.bit_count() + n.bit_count() for p, n in kept)
+
+        width = max((p | n).bit_length() for p, n in clauses)
+        cover: List[Optional[Bits]] = list(clauses)
+        self.__expand(cover, reverse=False)
+        self.__irredundant(cover)
+        best = [bits for bits in cover if bits is not None]
+        for iteration in range(self.iterations):
+            cover = list(best)
+            self.__reduce(cover, width)
+            self.__expand(cover, reverse=iteration % 2 == 0)
+            self.__irredundant(cover)
+            if cost(cover) >= cost(best):
+                break
+            best = [bits for bits in cover if bits is not None]
+        return best
+
+def minimize(formula: CNF, minimizer: Optional[Minimizer] = None) -> CNF:
+    minimized = CNF((minimizer or Minimizer()).minimize(formula.to_clause_set()))
+    minimized.auxiliary_variables = dict(formula.auxiliary_variables)
+    return minimized
@@ -1,8 +1,34 @@
-from typing import List, Dict, Union, Tuple, Optional
+from collections.abc import Mapping
+from typing import Iterator, List, Dict, Union, Tuple, Optional
+from logic_toolkit import instrument
 from logic_toolkit.base import Node, ParseTree
+from logic_toolkit.proof import Proof, ProofLine, Scope, parse_references
+
+class _DictLines(Mapping):
+    __slots__ = ('__lines',)
+
+    def __init__(self, lines: Dict[int, Dict]) -> None:
+        self.__lines = lines
+
+    def __getitem__(self, line_number: int) -> ProofLine:
+        line = self.__lines[line_number]
+        return ProofLine(line_number, line['formula'], line['rule'], line['references'], scope_level=line['scope_level'])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__lines)
+
+    def __len__(self) -> int:
+        return len(self.__lines)
+
+    def __contains__(self, line_number: object) -> bool:
+        return line_number in self.__lines
 
 class NaturalDeduction:
+    # These rules take the line being justified as their last reference.
+    SELF_REFERENCING_RULES = ['⊥e', '∨i1', '∨i2', 'LEM']
+
     def __init__(self) -> None:
+        self.__verdicts: Dict[Tuple, bool] = {}
         self.__rules = {
             '∧i': self.__and_introduction,
             '∧e1': self.__and_elimination_1,
@@ -23,10 +49,21 @@ class NaturalDeduction:
             'Copy': self.__copy
         }
 
-    def __find_scope(self, scopes: List[Dict], start: int, end: int) -> Optional[Dict]:
-        return next((s for s in scopes if s['start'] == start and s['end'] == end), None)
-
-    def __is_reference_valid(self, reference: Union[int, Tuple[int, int]], current_line_number: int, lines: List[Dict], scopes: Optional[List[Dict]] = None) -> bool:
+    def __coerce(self, lines: Union[Proof, Dict[int, ProofLine], Dict[int, Dict]], scopes: Optional[List[Union[Scope, Dict]]]) -> Tuple[Dict[int, ProofLine], Optional[List[Scope]]]:
+        # Proofs and ProofLines are used as they are; the older dict-of-dicts
+        # form is wrapped so each line is converted only when a rule reads it.
+        if isinstance(lines, Proof):
+            lines, scopes = lines.lines, lines.scopes if scopes is None else scopes
+        elif lines and not isinstance(next(iter(lines.values())), ProofLine):
+            lines = _DictLines(lines)
+        if scopes and not isinstance(scopes[0], Scope):
+            scopes = [Scope(scope['start'], scope['end']) for scope in scopes]
+        return lines, scopes
+
+    def __find_scope(self, scopes: List[Scope], start: int, end: int) -> Optional[Scope]:
+        return next((s for s in scopes if s.start == start and s.end == end), None)
+
+    def __is_reference_valid(self, reference: Union[int, Tuple[int, int]], current_line_number: int, lines: Dict[int, ProofLine], scopes: Optional[List[Scope]] = None) -> bool:
         if isinstance(reference, int):
             if reference not in lines or reference >= current_line_number:
                 return False
@@ -34,8 +71,8 @@ class NaturalDeduction:
             if scopes is None:
                 return True
             
-            current_scope_level = lines[current_line_number]['scope_level']
-            referenced_scope_level = lines[reference]['scope_level']
+            current_scope_level = lines[current_line_number].scope_level
+            referenced_scope_level = lines[reference].scope_level
             
             if referenced_scope_level < current_scope_level:
                 return True
@@ -45,12 +82,12 @@ class NaturalDeduction:
                     return True
                 
                 for scope in scopes:
-                    if scope['start'] is not None:
-                        if scope['end'] is None:
-                            if (scope['start'] <= reference and scope['start'] <= current_line_number):
+                    if scope.start is not None:
+                        if scope.end is None:
+                            if (scope.start <= reference and scope.start <= current_line_number):
                                 return True
                         else:
-                            if (scope['start'] <= reference <= scope['end'] and scope['start'] <= current_line_number <= scope['end']):
+                            if (scope.start <= reference <= scope.end and scope.start <= current_line_number <= scope.end):
                                 return True
                 return False
             
@@ -66,20 +103,29 @@ class NaturalDeduction:
         
         return False
 
-    def __validate_all_references(self, references: List[Union[int, Tuple[int, int]]], current_line_number: int, lines: List[Dict], scopes: Optional[List[Dict]] = None) -> bool:
+    def __validate_all_references(self, references: List[Union[int, Tuple[int, int]]], current_line_number: int, lines: Dict[int, ProofLine], scopes: Optional[List[Scope]] = None) -> bool:
         return all(self.__is_reference_valid(ref, current_line_number, lines, scopes) for ref in references)
 
-    def apply_rule(self, rule_name: str, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def apply_rule(self, rule_name: str, lines: Union[Proof, Dict[int, ProofLine], Dict[int, Dict]], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Union[Scope, Dict]]] = None) -> ParseTree:
         if rule_name not in self.__rules:
             raise ValueError(f"Unknown rule: {rule_name}")
 
+        lines, scopes = self.__coerce(lines, scopes)
+        return self.__apply(rule_name, lines, references, scopes)
+
+    def __apply(self, rule_name: str, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]]) -> ParseTree:
+        # Each rule is timed under its own name; a rule that raises counts
+        # as a failure there.
+        if instrument.enabled:
+            return instrument.call(f'rule.{rule_name}', self.__rules[rule_name], lines, references, scopes)
         return self.__rules[rule_name](lines, references, scopes)
 
-    def check_rule(self, line_number: int, lines: List[Dict], scopes: Optional[List[Dict]] = None) -> bool:
+    def check_rule(self, line_number: int, lines: Union[Proof, Dict[int, ProofLine], Dict[int, Dict]], scopes: Optional[List[Union[Scope, Dict]]] = None) -> bool:
+        lines, scopes = self.__coerce(lines, scopes)
         line = lines[line_number]
-        rule_name: str = line['rule']
-        references: List[Union[int, Tuple[int, int]]] = line['references']
-        formula: ParseTree = line['formula']
+        rule_name: str = line.rule
+        references: List[Union[int, Tuple[int, int]]] = line.references
+        formula: ParseTree = line.formula
 
         if rule_name in ["Premise", "Assumption"]:
             return True
@@ -89,66 +135,81 @@ class NaturalDeduction:
 
         if not self.__validate_all_references(references, line_number, lines, scopes):
             return False
-        if rule_name in ['⊥e', '∨i1', '∨i2', 'LEM']:
-            references.append(line_number)
-        expected_tree = self.apply_rule(rule_name, lines, references, scopes)
-        return expected_tree == formula
+        if rule_name in self.SELF_REFERENCING_RULES:
+            references = references + [line_number]
+        expected_tree = self.__apply(rule_name, lines, references, scopes)
+        if expected_tree == formula:
+            return True
+        if instrument.enabled:
+            instrument.fail(f'rule.{rule_name}')
+        return False
+
+    def check_proof(self, proof: Proof) -> Dict[int, bool]:
+        # Verdicts are remembered across calls, so re-checking an edited
+        # proof only re-derives the lines whose own content or cited lines
+        # changed.
+        checker = ProofChecker(self, cache=self.__verdicts)
+        checker.check(proof, stop_at_first=False)
+        return checker.verdicts
+
+    def clear_cache(self) -> None:
+        self.__verdicts.clear()
 
-    def __and_introduction(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __and_introduction(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for ∧i rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]        
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]        
 
         root = Node(
             value='∧',
-            left=formulas[0].root.copy(),
-            right=formulas[1].root.copy()
+            left=formulas[0].root,
+            right=formulas[1].root
         )
         return ParseTree(root)
 
-    def __and_elimination_1(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __and_elimination_1(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for ∧e1 rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
         if formula.root.value != '∧':
             raise ValueError("Expected a conjunction (A ∧ B) for ∧e1 rule.")
 
-        return ParseTree(root=formula.root.left.copy())
+        return ParseTree(root=formula.root.left)
 
-    def __and_elimination_2(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __and_elimination_2(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for ∧e2 rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
         if formula.root.value != '∧':
             raise ValueError("Expected a conjunction (A ∧ B) for ∧e2 rule.")
 
-        return ParseTree(root=formula.root.right.copy())
+        return ParseTree(root=formula.root.right)
 
-    def __or_introduction_1(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __or_introduction_1(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for ∨i1 rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
         if formulas[0].root == formulas[1].root.left:
             return formulas[1]
         
         raise ValueError("Incorrect Use of ∨i1 rule.")
     
 
-    def __or_introduction_2(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __or_introduction_2(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for ∨i2 rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
         if formulas[0].root == formulas[1].root.right:
             return formulas[1]
         
         raise ValueError("Incorrect Use of ∨i2 rule.")
 
-    def __or_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __or_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 3:
             raise ValueError("Expected three references for ∨e rule.")
         if not isinstance(references[0], int) or not all(isinstance(r, tuple) for r in references[1:]):
@@ -156,27 +217,27 @@ class NaturalDeduction:
 
         line, (s1, e1), (s2, e2) = references
 
-        or_formula: ParseTree = lines[line]['formula']
+        or_formula: ParseTree = lines[line].formula
         if or_formula.root.value != '∨':
             raise ValueError("Expected a disjunction (A ∨ B) for ∨e rule.")
         if not self.__find_scope(scopes, s1, e1) or \
             not self.__find_scope(scopes, s2, e2) or \
-            lines[s1]['scope_level'] != lines[s2]['scope_level']:
+            lines[s1].scope_level != lines[s2].scope_level:
             raise ValueError("Invalid scopes for ∨e rule.")
-        if (or_formula.root.left != lines[s1]['formula'].root and or_formula.root.right != lines[s1]['formula'].root) or (or_formula.root.left != lines[s2]['formula'].root and or_formula.root.right != lines[s2]['formula'].root):
+        if (or_formula.root.left != lines[s1].formula.root and or_formula.root.right != lines[s1].formula.root) or (or_formula.root.left != lines[s2].formula.root and or_formula.root.right != lines[s2].formula.root):
             raise ValueError("The formulas in the scopes must match the operands of the disjunction.")
 
-        if lines[s1]['formula'] != ParseTree(or_formula.root.left.copy()):
+        if lines[s1].formula != ParseTree(or_formula.root.left):
             raise ValueError("Left scope does not match the left operand of the disjunction.")
-        if lines[s2]['formula'] != ParseTree(or_formula.root.right.copy()):
+        if lines[s2].formula != ParseTree(or_formula.root.right):
             raise ValueError("Right scope does not match the right operand of the disjunction.")
         
-        if lines[e1]['formula'] != lines[e2]['formula']:
+        if lines[e1].formula != lines[e2].formula:
             raise ValueError("The formulas in the scopes must be equal for ∨e rule.")
         
-        return lines[e1]['formula']
+        return lines[e1].formula
 
-    def __implication_introduction(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __implication_introduction(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1 or not isinstance(references[0], tuple):
             raise ValueError("Expected one scope for →i rule.")
 
@@ -184,37 +245,37 @@ class NaturalDeduction:
         if not self.__find_scope(scopes, start, end):
             raise ValueError("Invalid scope for →i rule.")
 
-        if lines[start]['rule'] != 'Assumption':
+        if lines[start].rule != 'Assumption':
             raise ValueError("The starting line must be an assumption for →i rule.")
 
-        antecedent: ParseTree = lines[start]['formula']
-        consequent: ParseTree = lines[end]['formula']
+        antecedent: ParseTree = lines[start].formula
+        consequent: ParseTree = lines[end].formula
 
         root = Node(
             value='→',
-            left=antecedent.root.copy(),
-            right=consequent.root.copy()
+            left=antecedent.root,
+            right=consequent.root
         )
         return ParseTree(root)
 
-    def __implication_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __implication_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for →e rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
 
         if formulas[0].root.value != '→' and formulas[1].root.value != '→':
             raise ValueError("Expected an implication (A → B) for →e rule.")
 
         if formulas[0].root.value == '→' and formulas[0].root.left == formulas[1].root:
-            return ParseTree(root=formulas[0].root.right.copy())
+            return ParseTree(root=formulas[0].root.right)
 
         elif formulas[1].root.value == '→' and formulas[1].root.left == formulas[0].root:
-            return ParseTree(root=formulas[1].root.right.copy())
+            return ParseTree(root=formulas[1].root.right)
 
         raise ValueError("Cannot apply →e rule to the given references.")
 
-    def __negation_introduction(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __negation_introduction(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1 or not isinstance(references[0], tuple):
             raise ValueError("Expected one scope for ¬i rule.")
         
@@ -222,22 +283,22 @@ class NaturalDeduction:
         if not self.__find_scope(scopes, start, end):
             raise ValueError("Invalid scope for ¬i rule.")
 
-        if lines[start]['rule'] != 'Assumption':
+        if lines[start].rule != 'Assumption':
             raise ValueError("The starting line must be an assumption for ¬i rule.")
-        if lines[end]['formula'].root.value != '⊥':
+        if lines[end].formula.root.value != '⊥':
             raise ValueError("The ending line must be false (⊥) for ¬i rule.")
         
         negated_formula = Node(
             value='¬',
-            right=lines[start]['formula'].root.copy()
+            right=lines[start].formula.root
         )
         return ParseTree(negated_formula)
 
-    def __negation_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __negation_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for ¬e rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
 
         if (formulas[0].root.value == '¬' and formulas[0].root.right == formulas[1].root) or \
            (formulas[1].root.value == '¬' and formulas[1].root.right == formulas[0].root):
@@ -245,45 +306,45 @@ class NaturalDeduction:
 
         raise ValueError("Cannot apply ¬e rule to the given references.")
 
-    def __false_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __false_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for ⊥e rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
 
         if formulas[0].root.value == '⊥':
             return formulas[1]
 
         raise ValueError("Cannot apply ⊥e rule to the given references.")
 
-    def __double_negation_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __double_negation_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for ¬¬e rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
 
         if formula.root.value == '⊥':
             return formula
 
         raise ValueError("Cannot apply ⊥e rule to the given reference.")
 
-    def __double_negation_elimination(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __double_negation_elimination(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for ¬¬e rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
 
         if (formula.root.value == '¬' and
             formula.root.right.value == '¬'):
-            return ParseTree(formula.root.right.right.copy())
+            return ParseTree(formula.root.right.right)
 
         raise ValueError("Cannot apply ¬¬e rule to the given references.")
 
-    def __modus_tollens(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __modus_tollens(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 2:
             raise ValueError("Expected two references for MT rule.")
 
-        formulas: List[ParseTree] = [lines[ref]['formula'] for ref in references]
+        formulas: List[ParseTree] = [lines[ref].formula for ref in references]
         implication, negation = (formulas[0], formulas[1]) if formulas[0].root.value == '→' else (formulas[1], formulas[0])
 
         if implication.root.value != '→' or negation.root.value != '¬':
@@ -292,28 +353,28 @@ class NaturalDeduction:
         if implication.root.right == negation.root.right:
             root = Node(
                 value='¬',
-                right=implication.root.left.copy()
+                right=implication.root.left
             )
             return ParseTree(root)
 
         raise ValueError("Cannot apply MT rule to the given references.")
 
-    def __double_negation_introduction(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __double_negation_introduction(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for ¬¬i rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
 
         root = Node(
             value='¬',
             right=Node(
                 value='¬',
-                right=formula.root.copy()
+                right=formula.root
             )
         )
         return ParseTree(root)
 
-    def __proof_by_contradiction(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __proof_by_contradiction(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1 or not isinstance(references[0], tuple):
             raise ValueError("Expected one scope for PBC rule.")
 
@@ -321,24 +382,24 @@ class NaturalDeduction:
         if not self.__find_scope(scopes, start, end):
             raise ValueError("Invalid scope for PBC rule.")
 
-        if lines[start]['rule'] != 'Assumption':
+        if lines[start].rule != 'Assumption':
             raise ValueError("The starting line must be an assumption for PBC rule.")
 
-        assumption: ParseTree = lines[start]['formula']
-        if lines[end]['formula'].root.value != '⊥':
+        assumption: ParseTree = lines[start].formula
+        if lines[end].formula.root.value != '⊥':
             raise ValueError("The ending line must be false (⊥) for PBC rule.")
         
         if assumption.root.value == '¬':
-            return ParseTree(assumption.root.right.copy())
+            return ParseTree(assumption.root.right)
         else:
             root = Node(value='¬', right=assumption.root)
             return ParseTree(root)
 
-    def __law_of_excluded_middle(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __law_of_excluded_middle(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for LEM rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
+        formula: ParseTree = lines[references[0]].formula
         if formula.root.value != '∨':
             raise ValueError("Expected a disjunction (A ∨ ¬A) for LEM rule.")
         if formula.root.left.value == '¬' and formula.root.left.right == formula.root.right or \
@@ -347,22 +408,142 @@ class NaturalDeduction:
 
         raise ValueError("Incorrect use of LEM rule. The formula must be of the form A ∨ ¬A.")
 
-    def __copy(self, lines: List[Dict], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Dict]] = None) -> ParseTree:
+    def __copy(self, lines: Dict[int, ProofLine], references: List[Union[int, Tuple[int, int]]], scopes: Optional[List[Scope]] = None) -> ParseTree:
         if len(references) != 1:
             raise ValueError("Expected one reference for copy rule.")
 
-        formula: ParseTree = lines[references[0]]['formula']
-        return ParseTree(formula.root.copy())
+        formula: ParseTree = lines[references[0]].formula
+        return ParseTree(formula.root)
 
     @classmethod
     def parse_references(cls, ref_str: str) -> Tuple[str, List[Union[int, Tuple[int, int]]]]:
-        parts = ref_str.split(", ")
-        rule = parts[0]
-        references = []
-        for ref in parts[1:]:
-            if "-" in ref:
-                start, end = map(int, ref.split("-"))
-                references.append((start, end))
+        return parse_references(ref_str)
+
+class ProofChecker:
+    # Lines and boxes are checked as they arrive. Every scope knows its
+    # parent and whether it is still open; the open scopes are exactly the
+    # chain enclosing the current line, so visibility checks are O(1).
+    def __init__(self, natural_deduction: Optional[NaturalDeduction] = None, cache: Optional[Dict[Tuple, bool]] = None) -> None:
+        self.__nd = natural_deduction or NaturalDeduction()
+        self.__cache = cache
+        self.proof = Proof()
+        self.verdicts: Dict[int, bool] = {}
+        self.__scope_by_start: Dict[int, Scope] = {}
+        self.first_invalid: Optional[int] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.first_invalid is None
+
+    @property
+    def lines(self) -> Dict[int, ProofLine]:
+        return self.proof.lines
+
+    @property
+    def scopes(self) -> List[Scope]:
+        return self.proof.scopes
+
+    @property
+    def scope_level(self) -> int:
+        return self.proof.scope_level
+
+    def begin_scope(self) -> None:
+        self.proof.begin_scope()
+
+    def end_scope(self) -> None:
+        scope = self.proof.end_scope()
+        if scope.start is not None:
+            self.__scope_by_start[scope.start] = scope
+
+    def add_line(self, line_number: int, formula: ParseTree, rule: str, references: List[Union[int, Tuple[int, int]]]) -> bool:
+        lines = self.proof.lines
+        if lines and line_number <= next(reversed(lines)):
+            raise ValueError(f"Line {line_number} is out of order.")
+
+        self.proof.add_line(line_number, formula, rule, list(references))
+        valid = self.__check(line_number, formula, rule, references)
+        self.verdicts[line_number] = valid
+        if not valid and self.first_invalid is None:
+            self.first_invalid = line_number
+        return valid
+
+    def check(self, proof: Proof, stop_at_first: bool = True) -> bool:
+        # Replays a parsed proof, re-deriving the BeginScope/EndScope events
+        # from each line's scope.
+        opened: List[Scope] = []
+        for line in proof:
+            chain: List[Scope] = []
+            scope = line.scope
+            while scope is not None:
+                chain.append(scope)
+                scope = scope.parent
+            chain.reverse()
+
+            common = 0
+            while common < len(opened) and common < len(chain) and opened[common] is chain[common]:
+                common += 1
+            for _ in range(len(opened) - common):
+                self.end_scope()
+            for _ in range(len(chain) - common):
+                self.begin_scope()
+            opened = chain
+
+            if not self.add_line(line.number, line.formula, line.rule, line.references) and stop_at_first:
+                return False
+        for _ in opened:
+            self.end_scope()
+        return self.is_valid
+
+    def is_visible(self, reference: Union[int, Tuple[int, int]]) -> bool:
+        if isinstance(reference, int):
+            line = self.proof.lines.get(reference)
+            return line is not None and (line.scope is None or line.scope.is_open)
+
+        if isinstance(reference, tuple) and len(reference) == 2:
+            start, end = reference
+            scope = self.__scope_by_start.get(start)
+            return scope is not None and scope.end == end and (scope.parent is None or scope.parent.is_open)
+
+        return False
+
+    def __check(self, line_number: int, formula: ParseTree, rule: str, references: List[Union[int, Tuple[int, int]]]) -> bool:
+        if rule in ["Premise", "Assumption"]:
+            return True
+
+        if not all(self.is_visible(reference) and (isinstance(reference, tuple) or reference < line_number) for reference in references):
+            return False
+
+        key = None
+        if self.__cache is not None:
+            key = self.__key(formula, rule, references)
+            verdict = self.__cache.get(key)
+            if verdict is not None:
+                return verdict
+
+        boxes = [self.__scope_by_start[r[0]] for r in references if isinstance(r, tuple)]
+        if rule in self.__nd.SELF_REFERENCING_RULES:
+            references = references + [line_number]
+        try:
+            verdict = self.__nd.apply_rule(rule, self.proof.lines, references, boxes) == formula
+            if not verdict and instrument.enabled:
+                instrument.fail(f'rule.{rule}')
+        except (ValueError, KeyError, IndexError, AttributeError, TypeError):
+            verdict = False
+
+        if key is not None:
+            self.__cache[key] = verdict
+        return verdict
+
+    def __key(self, formula: ParseTree, rule: str, references: List[Union[int, Tuple[int, int]]]) -> Tuple:
+        # Once every reference is known to be visible, a verdict depends only
+        # on the contents of the line and of the lines it cites, not on their
+        # numbers, so the key is built from interned formulas.
+        lines = self.proof.lines
+        cited: List[Tuple] = []
+        for reference in references:
+            if isinstance(reference, tuple):
+                start, end = lines[reference[0]], lines[reference[1]]
+                cited.append((start.formula.root.intern(), start.rule, start.scope_level, end.formula.root.intern()))
             else:
-                references.append(int(ref))
-        return rule, references
\ No newline at end of file
+                cited.append((lines[reference].formula.root.intern(),))
+        return (rule, formula.root.intern(), tuple(cited))
@@ -0,0 +1,120 @@
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from weakref import WeakKeyDictionary
+
+class Printer:
+    FORMATS = ('unicode', 'ascii', 'latex', 'prefix')
+    SYMBOLS: Dict[str, Dict[str, str]] = {
+        'unicode': {'¬': '¬', '∧': ' ∧ ', '∨': ' ∨ ', '→': ' → ', '⊤': '⊤', '⊥': '⊥'},
+        'ascii': {'¬': '~', '∧': ' & ', '∨': ' | ', '→': ' -> ', '⊤': 'true', '⊥': 'false'},
+        'latex': {'¬': '\\lnot ', '∧': ' \\land ', '∨': ' \\lor ', '→': ' \\rightarrow ', '⊤': '\\top', '⊥': '\\bot'},
+        'prefix': {'¬': '(not ', '∧': '(and ', '∨': '(or ', '→': '(implies ', '⊤': 'true', '⊥': 'false'},
+    }
+    PRECEDENCE = {'→': 1, '∨': 2, '∧': 3}
+
+    def __init__(self, format: str = 'unicode', exact: bool = False) -> None:
+        # exact=False brackets like ParseTree.__str__ always has, leaving
+        # p ∨ (q ∨ r) as p ∨ q ∨ r; exact=True also brackets a right operand
+        # of the same precedence, so the text parses back to the same tree.
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown format: {format}. Expected one of {', '.join(self.FORMATS)}.")
+        self.format = format
+        self.exact = exact
+        self.__symbols = self.SYMBOLS[format]
+        # Only interned nodes are hashable, and those are immutable, so their
+        # rendered text can be kept for as long as the node lives.
+        self.__cache: "WeakKeyDictionary[Any, str]" = WeakKeyDictionary()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(format={self.format!r}, exact={self.exact})'
+
+    def render(self, node: Optional[Any]) -> str:
+        if node is None:
+            return ""
+        cacheable = node.__hash__ is not None
+        if cacheable:
+            text = self.__cache.get(node)
+            if text is not None:
+                return text
+        text = ''.join(self.__pieces(node))
+        if cacheable:
+            self.__cache[node] = text
+        return text
+
+    def write(self, node: Optional[Any], out: TextIO, batch: int = 8192) -> None:
+        # For very large formulas: pieces are joined and written a batch at
+        # a time instead of building the whole string first.
+        if node is None:
+            return
+        pieces: List[str] = []
+        for piece in self.__pieces(node):
+            pieces.append(piece)
+            if len(pieces) >= batch:
+                out.write(''.join(pieces))
+                pieces = []
+        out.write(''.join(pieces))
+
+    def __pieces(self, root: Any) -> Iterator[str]:
+        # Items are pushed in reverse and emitted in one iterative pass, so
+        # output is linear in the size of the formula at any depth.
+        symbols = self.__symbols
+        precedence = self.PRECEDENCE
+        prefix = self.format == 'prefix'
+        exact = self.exact
+        cache = self.__cache
+        stack: List[Any] = [root]
+        while stack:
+            item = stack.pop()
+            if item is None:
+                continue
+            if item.__class__ is str:
+                yield item
+                continue
+            if cache and item.__hash__ is not None:
+                text = cache.get(item)
+                if text is not None:
+                    yield text
+                    continue
+
+            value, left, right = item.value, item.left, item.right
+            if prefix:
+                if value == '¬':
+                    stack += [')', right]
+                    yield symbols['¬']
+                elif value in precedence:
+                    stack += [')', right, ' ', left]
+                    yield symbols[value]
+                else:
+                    yield symbols.get(value, value)
+            elif value == '¬':
+                yield symbols['¬']
+                if right is not None and (right.value in precedence or right.value == '¬'):
+                    stack += [')', right, '(']
+                else:
+                    stack.append(right)
+            elif value in precedence:
+                current = precedence[value]
+                if right is not None and right.value in precedence and (
+                        precedence[right.value] < current or (exact and precedence[right.value] == current and value != '→')):
+                    stack += [')', right, '(']
+                else:
+                    stack.append(right)
+                stack.append(symbols[value])
+                if left is not None and left.value in precedence and (
+                        precedence[left.value] < current or (precedence[left.value] == current and value == '→')):
+                    stack += [')', left, '(']
+                else:
+                    stack.append(left)
+            else:
+                yield symbols.get(value, value)
+
+_PRINTERS: Dict[Tuple[str, bool], Printer] = {}
+
+def printer(format: str = 'unicode', exact: bool = False) -> Printer:
+    # Shared instances, so every caller benefits from the same caches.
+    key = (format, exact)
+    if key not in _PRINTERS:
+        _PRINTERS[key] = Printer(format, exact)
+    return _PRINTERS[key]
+
+def render(node: Optional[Any], format: str = 'unicode', exact: bool = False) -> str:
+    return printer(format, exact).render(node)
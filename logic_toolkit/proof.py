@@ -0,0 +1,134 @@
+import re
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from logic_toolkit.base import ParseTree, SymbolTable
+from logic_toolkit.wff import WellFormedFormula
+
+Reference = Union[int, Tuple[int, int]]
+
+def parse_references(ref_str: str) -> Tuple[str, List[Reference]]:
+    parts = ref_str.split(", ")
+    rule = parts[0]
+    references: List[Reference] = []
+    for ref in parts[1:]:
+        if "-" in ref:
+            start, end = ref.split("-")
+            references.append((int(start), int(end)))
+        else:
+            references.append(int(ref))
+    return rule, references
+
+class Scope:
+    __slots__ = ('start', 'end', 'parent', 'level', 'is_open')
+
+    def __init__(self, start: Optional[int] = None, end: Optional[int] = None, parent: Optional["Scope"] = None) -> None:
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.level = parent.level + 1 if parent is not None else 1
+        self.is_open = end is None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(start={self.start}, end={self.end}, level={self.level})'
+
+class ProofLine:
+    __slots__ = ('number', 'formula', 'rule', 'references', 'scope', 'scope_level')
+
+    def __init__(self, number: int, formula: ParseTree, rule: Optional[str], references: List[Reference], scope: Optional[Scope] = None, scope_level: Optional[int] = None) -> None:
+        self.number = number
+        self.formula = formula
+        self.rule = rule
+        self.references = references
+        self.scope = scope
+        self.scope_level = scope_level if scope_level is not None else (scope.level if scope is not None else 0)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(number={self.number}, formula="{self.formula}", rule={self.rule!r}, references={self.references})'
+
+class Proof:
+    # Lines are keyed by line number; scopes are kept in the order they were
+    # opened, each with a pointer to its enclosing scope.
+    __WIDE_GAP = re.compile(r'\s{4,}')
+
+    def __init__(self) -> None:
+        self.lines: Dict[int, ProofLine] = {}
+        self.scopes: List[Scope] = []
+        self.__open: List[Scope] = []
+        self.__last_line_number: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(lines={len(self.lines)}, scopes={len(self.scopes)})'
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __iter__(self) -> Iterator[ProofLine]:
+        return iter(self.lines.values())
+
+    def __contains__(self, line_number: int) -> bool:
+        return line_number in self.lines
+
+    def __getitem__(self, line_number: int) -> ProofLine:
+        return self.lines[line_number]
+
+    @property
+    def scope(self) -> Optional[Scope]:
+        return self.__open[-1] if self.__open else None
+
+    @property
+    def scope_level(self) -> int:
+        return len(self.__open)
+
+    def begin_scope(self) -> Scope:
+        scope = Scope(parent=self.scope)
+        self.scopes.append(scope)
+        self.__open.append(scope)
+        return scope
+
+    def end_scope(self) -> Scope:
+        if not self.__open:
+            raise ValueError("Unmatched EndScope command")
+        scope = self.__open.pop()
+        if scope.start is not None:
+            scope.end = self.__last_line_number
+        scope.is_open = False
+        return scope
+
+    def add_line(self, number: int, formula: ParseTree, rule: Optional[str], references: List[Reference]) -> ProofLine:
+        scope = self.scope
+        # As in the original phase5 parser, a box is only addressable when
+        # it opens with an assumption.
+        if rule == 'Assumption' and scope is not None and scope.start is None:
+            scope.start = number
+
+        line = ProofLine(number, formula, rule, references, scope, len(self.__open))
+        self.lines[number] = line
+        self.__last_line_number = number
+        return line
+
+    @classmethod
+    def parse(cls, text: str, interned: bool = False, symbols: Optional[SymbolTable] = None) -> "Proof":
+        proof = cls()
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line or line == 'input:':
+                continue
+            if line == 'output:':
+                break
+            if line == 'BeginScope':
+                proof.begin_scope()
+                continue
+            if line == 'EndScope':
+                proof.end_scope()
+                continue
+
+            number, rest = line.split(None, 1)
+            match = cls.__WIDE_GAP.search(rest) if '\t' in rest else None
+            split = match.start() if match else rest.find('    ')
+            if split >= 0:
+                formula_str, rule_and_refs = rest[:split], rest[split:]
+            else:
+                formula_str, rule_and_refs = rest.split(None, 1)
+            rule, references = parse_references(rule_and_refs.strip())
+            proof.add_line(int(number), WellFormedFormula(formula_str.strip(), interned=interned, symbols=symbols), rule, references)
+        return proof
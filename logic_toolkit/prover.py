@@ -0,0 +1,277 @@
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from logic_toolkit import instrument
+from logic_toolkit.base import InternedNode, ParseTree
+from logic_toolkit.printer import render
+from logic_toolkit.wff import WellFormedFormula
+
+BOTTOM = InternedNode('⊥')
+
+class Derivation:
+    __slots__ = ('formula', 'rule', 'premises')
+
+    def __init__(self, formula: InternedNode, rule: str, premises: Tuple[Union["Derivation", "Box"], ...] = ()) -> None:
+        self.formula = formula
+        self.rule = rule
+        self.premises = premises
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(formula="{ParseTree(self.formula)}", rule={self.rule!r})'
+
+class Box:
+    __slots__ = ('assumption', 'conclusion')
+
+    def __init__(self, assumption: Derivation, conclusion: Derivation) -> None:
+        self.assumption = assumption
+        self.conclusion = conclusion
+
+class _Context:
+    # Everything derivable by elimination rules from the hypotheses of one
+    # scope, saturated eagerly. Child scopes start from a copy.
+    __slots__ = ('facts', 'implications', '__key')
+
+    def __init__(self, parent: Optional["_Context"] = None) -> None:
+        self.facts: Dict[InternedNode, Derivation] = dict(parent.facts) if parent else {}
+        self.implications: Dict[InternedNode, List[Derivation]] = {k: list(v) for k, v in parent.implications.items()} if parent else {}
+        self.__key: Optional[frozenset] = None
+
+    @property
+    def key(self) -> frozenset:
+        if self.__key is None:
+            self.__key = frozenset(self.facts)
+        return self.__key
+
+    def add(self, derivation: Derivation) -> None:
+        facts = self.facts
+        work = [derivation]
+        while work:
+            derivation = work.pop()
+            formula = derivation.formula
+            if formula in facts:
+                continue
+            facts[formula] = derivation
+            self.__key = None
+
+            if formula.value == '∧':
+                work.append(Derivation(formula.left, '∧e1', (derivation,)))
+                work.append(Derivation(formula.right, '∧e2', (derivation,)))
+            elif formula.value == '→':
+                self.implications.setdefault(formula.left, []).append(derivation)
+                if formula.left in facts:
+                    work.append(Derivation(formula.right, '→e', (derivation, facts[formula.left])))
+            elif formula.value == '¬':
+                if formula.right.value == '¬':
+                    work.append(Derivation(formula.right.right, '¬¬e', (derivation,)))
+                if formula.right in facts:
+                    work.append(Derivation(BOTTOM, '¬e', (facts[formula.right], derivation)))
+
+            for implication in self.implications.get(formula, ()):
+                work.append(Derivation(implication.formula.right, '→e', (implication, derivation)))
+            negation = InternedNode('¬', right=formula)
+            if negation in facts:
+                work.append(Derivation(BOTTOM, '¬e', (derivation, facts[negation])))
+
+class _Exhausted(Exception):
+    pass
+
+class ProofSearch:
+    def __init__(self, max_nodes: int = 200000, timeout: Optional[float] = 5.0, max_depth: int = 12) -> None:
+        self.max_nodes = max_nodes
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.nodes = 0
+        self.exhausted = False
+        self.__deadline: Optional[float] = None
+        self.__failed: Dict[Tuple, int] = {}
+
+    @instrument.timed('prove')
+    def search(self, premises: List[Union[str, ParseTree]], goal: Union[str, ParseTree]) -> Optional[str]:
+        premises = [self.__formula(premise) for premise in premises]
+        goal = self.__formula(goal)
+
+        self.nodes = 0
+        self.exhausted = False
+        self.__failed = {}
+        self.__deadline = time.perf_counter() + self.timeout if self.timeout is not None else None
+
+        context = _Context()
+        leaves = []
+        for premise in premises:
+            leaf = Derivation(premise, 'Premise')
+            leaves.append(leaf)
+            context.add(leaf)
+
+        # Iterative deepening keeps the first proof found short; failures
+        # are remembered with the depth they were tried at.
+        try:
+            for depth in range(1, self.max_depth + 1):
+                derivation = self.__prove(goal, context, depth)
+                if derivation is not None:
+                    return self.__linearize(leaves, derivation)
+        except _Exhausted:
+            self.exhausted = True
+        finally:
+            instrument.count('prove.nodes', self.nodes)
+        return None
+
+    def __formula(self, formula: Union[str, ParseTree]) -> InternedNode:
+        if isinstance(formula, str):
+            return WellFormedFormula(formula, interned=True).root
+        if isinstance(formula, ParseTree):
+            return formula.root.intern()
+        raise TypeError("Expected a ParseTree or a string representation of a formula.")
+
+    def __tick(self) -> None:
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise _Exhausted()
+        if self.__deadline is not None and self.nodes % 256 == 0 and time.perf_counter() > self.__deadline:
+            raise _Exhausted()
+
+    def __box(self, context: _Context, assumption: InternedNode, goal: InternedNode, depth: int) -> Optional[Box]:
+        leaf = Derivation(assumption, 'Assumption')
+        inner = _Context(context)
+        inner.add(leaf)
+        conclusion = self.__prove(goal, inner, depth)
+        return Box(leaf, conclusion) if conclusion is not None else None
+
+    def __prove(self, goal: InternedNode, context: _Context, depth: int) -> Optional[Derivation]:
+        self.__tick()
+        facts = context.facts
+        if goal in facts:
+            return facts[goal]
+        if BOTTOM in facts:
+            return Derivation(goal, '⊥e', (facts[BOTTOM],))
+        if depth == 0:
+            return None
+
+        key = (goal, context.key)
+        if self.__failed.get(key, -1) >= depth:
+            return None
+
+        derivation = self.__introduce(goal, context, depth) or self.__eliminate(goal, context, depth)
+        if derivation is None and goal.value != '⊥' and InternedNode('¬', right=goal) not in facts:
+            box = self.__box(context, InternedNode('¬', right=goal), BOTTOM, depth - 1)
+            if box is not None:
+                derivation = Derivation(goal, 'PBC', (box,))
+
+        if derivation is None:
+            self.__failed[key] = depth
+        return derivation
+
+    def __introduce(self, goal: InternedNode, context: _Context, depth: int) -> Optional[Derivation]:
+        if goal.value == '∧':
+            left = self.__prove(goal.left, context, depth - 1)
+            right = self.__prove(goal.right, context, depth - 1) if left is not None else None
+            if right is not None:
+                return Derivation(goal, '∧i', (left, right))
+        elif goal.value == '→':
+            box = self.__box(context, goal.left, goal.right, depth - 1)
+            if box is not None:
+                return Derivation(goal, '→i', (box,))
+        elif goal.value == '¬':
+            box = self.__box(context, goal.right, BOTTOM, depth - 1)
+            if box is not None:
+                return Derivation(goal, '¬i', (box,))
+        elif goal.value == '∨':
+            for side, rule in [(goal.left, '∨i1'), (goal.right, '∨i2')]:
+                derivation = self.__prove(side, context, depth - 1)
+                if derivation is not None:
+                    return Derivation(goal, rule, (derivation,))
+        return None
+
+    def __eliminate(self, goal: InternedNode, context: _Context, depth: int) -> Optional[Derivation]:
+        facts = context.facts
+
+        if goal.value == '⊥':
+            for formula, negation in list(facts.items()):
+                if formula.value == '¬' and formula.right not in facts:
+                    derivation = self.__prove(formula.right, context, depth - 1)
+                    if derivation is not None:
+                        return Derivation(BOTTOM, '¬e', (derivation, negation))
+
+        for formula, disjunction in list(facts.items()):
+            if formula.value != '∨' or formula.left in facts or formula.right in facts:
+                continue
+            left = self.__box(context, formula.left, goal, depth - 1)
+            right = self.__box(context, formula.right, goal, depth - 1) if left is not None else None
+            if right is not None:
+                return Derivation(goal, '∨e', (disjunction, left, right))
+
+        # Backward chaining: establish the antecedent of an implication whose
+        # consequent could help, then continue with the consequent known.
+        for formula, implication in list(facts.items()):
+            if formula.value != '→' or formula.left in facts or formula.right in facts:
+                continue
+            if goal.value != '⊥' and not self.__occurs(goal, formula.right):
+                continue
+            antecedent = self.__prove(formula.left, context, depth - 1)
+            if antecedent is None:
+                continue
+            extended = _Context(context)
+            extended.add(Derivation(formula.right, '→e', (implication, antecedent)))
+            derivation = self.__prove(goal, extended, depth - 1)
+            if derivation is not None:
+                return derivation
+        return None
+
+    def __occurs(self, needle: InternedNode, haystack: InternedNode) -> bool:
+        stack = [haystack]
+        while stack:
+            node = stack.pop()
+            if node is needle:
+                return True
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        return False
+
+    def __linearize(self, premises: List[Derivation], derivation: Derivation) -> str:
+        # Each scope maps formulas to the line that states them, so a
+        # formula is written once per scope and reused while it is visible.
+        output: List[str] = []
+        scopes: List[Dict[InternedNode, int]] = [{}]
+        last = [0]
+
+        def write(formula: InternedNode, rule: str, references: List[str]) -> int:
+            last[0] += 1
+            justification = ', '.join([rule] + references)
+            output.append((last[0], f"{'  ' * (len(scopes) - 1)}{render(formula, exact=True)}    {justification}"))
+            scopes[-1][formula] = last[0]
+            return last[0]
+
+        def lookup(formula: InternedNode) -> Optional[int]:
+            for scope in reversed(scopes):
+                if formula in scope:
+                    return scope[formula]
+            return None
+
+        def emit(derivation: Derivation) -> int:
+            number = lookup(derivation.formula)
+            if number is not None:
+                return number
+            references = [emit_box(p) if isinstance(p, Box) else str(emit(p)) for p in derivation.premises]
+            return write(derivation.formula, derivation.rule, references)
+
+        def emit_box(box: Box) -> str:
+            output.append((None, f"{'  ' * (len(scopes) - 1)}BeginScope"))
+            scopes.append({})
+            start = write(box.assumption.formula, 'Assumption', [])
+            end = emit(box.conclusion)
+            if end != last[0]:
+                end = write(box.conclusion.formula, 'Copy', [str(end)])
+            scopes.pop()
+            output.append((None, f"{'  ' * (len(scopes) - 1)}EndScope"))
+            return f'{start}-{end}'
+
+        for premise in premises:
+            if lookup(premise.formula) is None:
+                write(premise.formula, 'Premise', [])
+        conclusion = emit(derivation)
+        if conclusion != last[0]:
+            write(derivation.formula, 'Copy', [str(conclusion)])
+
+        width = len(str(last[0]))
+        return '\n'.join(f'{number:>{width}} {text}' if number is not None else f"{'':>{width}} {text}" for number, text in output)
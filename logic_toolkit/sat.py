@@ -0,0 +1,389 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Union
+
+from logic_toolkit import instrument
+from logic_toolkit.base import ParseTree
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.cnf import CNF
+
+# Variables are numbered from 1 as in ClauseSet and DIMACS. Internally the
+# literal x is coded 2x and ¬x is 2x + 1, so negation is code ^ 1 and
+# per-literal state lives in flat lists indexed by code.
+TRUE, FALSE, UNASSIGNED = 1, 0, -1
+
+class Clause:
+    __slots__ = ('literals', 'learnt', 'activity', 'lbd', 'deleted')
+
+    def __init__(self, literals: List[int], learnt: bool = False, lbd: int = 0) -> None:
+        self.literals = literals
+        self.learnt = learnt
+        self.activity = 0.0
+        self.lbd = lbd
+        self.deleted = False
+
+class Solver:
+    VAR_DECAY = 0.95
+    CLAUSE_DECAY = 0.999
+    RESTART_UNIT = 100
+
+    def __init__(self, formula: Optional[Union[ClauseSet, Iterable[Iterable[int]]]] = None, num_variables: int = 0) -> None:
+        self.symbols = formula.symbols if isinstance(formula, ClauseSet) else None
+        self.num_variables = 0
+        self.clauses: List[Clause] = []
+        self.learnts: List[Clause] = []
+        self.model: Optional[List[int]] = None
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.deleted = 0
+
+        self.__ok = True
+        self.__value: List[int] = [UNASSIGNED, UNASSIGNED]
+        self.__watches: List[List[Clause]] = [[], []]
+        self.__level: List[int] = [0]
+        self.__reason: List[Optional[Clause]] = [None]
+        self.__activity: List[float] = [0.0]
+        self.__phase: List[int] = [1]
+        self.__seen: List[bool] = [False]
+        self.__heap: List = []
+        self.__trail: List[int] = []
+        self.__trail_lim: List[int] = []
+        self.__qhead = 0
+        self.__var_inc = 1.0
+        self.__clause_inc = 1.0
+        self.__max_learnts = 0.0
+
+        self.__grow(max(num_variables, formula.num_variables if isinstance(formula, ClauseSet) else 0))
+        for clause in formula or ():
+            self.add_clause(clause)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(variables={self.num_variables}, clauses={len(self.clauses)}, learnts={len(self.learnts)})'
+
+    def __grow(self, num_variables: int) -> None:
+        for variable in range(self.num_variables + 1, num_variables + 1):
+            self.__value += [UNASSIGNED, UNASSIGNED]
+            self.__watches += [[], []]
+            self.__level.append(0)
+            self.__reason.append(None)
+            self.__activity.append(0.0)
+            self.__phase.append(1)
+            self.__seen.append(False)
+            heapq.heappush(self.__heap, (-0.0, variable))
+        self.num_variables = max(self.num_variables, num_variables)
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        if self.__trail_lim:
+            raise ValueError("Clauses can only be added between calls to solve().")
+        codes = set()
+        for literal in literals:
+            if literal == 0:
+                raise ValueError("0 is not a literal.")
+            self.__grow(abs(literal))
+            codes.add(2 * abs(literal) + (literal < 0))
+
+        value = self.__value
+        clause = []
+        for code in codes:
+            if code ^ 1 in codes or value[code] == TRUE:
+                return True
+            if value[code] == UNASSIGNED:
+                clause.append(code)
+
+        if not self.__ok:
+            return False
+        if not clause:
+            self.__ok = False
+        elif len(clause) == 1:
+            self.__assign(clause[0], None)
+            self.__ok = self.__propagate() is None
+        else:
+            stored = Clause(clause)
+            self.clauses.append(stored)
+            self.__watches[clause[0]].append(stored)
+            self.__watches[clause[1]].append(stored)
+        return self.__ok
+
+    def __assign(self, code: int, reason: Optional[Clause]) -> None:
+        variable = code >> 1
+        self.__value[code] = TRUE
+        self.__value[code ^ 1] = FALSE
+        self.__level[variable] = len(self.__trail_lim)
+        self.__reason[variable] = reason
+        self.__trail.append(code)
+
+    def __propagate(self) -> Optional[Clause]:
+        # Two watched literals: a clause is only visited when one of its
+        # first two literals becomes false, and then either finds another
+        # non-false literal to watch, becomes unit, or is the conflict.
+        value = self.__value
+        watches = self.__watches
+        trail = self.__trail
+        while self.__qhead < len(trail):
+            false_code = trail[self.__qhead] ^ 1
+            self.__qhead += 1
+            self.propagations += 1
+            watchers = watches[false_code]
+            i = j = 0
+            count = len(watchers)
+            while i < count:
+                clause = watchers[i]
+                i += 1
+                if clause.deleted:
+                    continue
+                literals = clause.literals
+                if literals[0] == false_code:
+                    literals[0], literals[1] = literals[1], false_code
+                first = literals[0]
+                if value[first] == TRUE:
+                    watchers[j] = clause
+                    j += 1
+                    continue
+
+                for k in range(2, len(literals)):
+                    if value[literals[k]] != FALSE:
+                        literals[1], literals[k] = literals[k], false_code
+                        watches[literals[1]].append(clause)
+                        break
+                else:
+                    watchers[j] = clause
+                    j += 1
+                    if value[first] == FALSE:
+                        watchers[j:] = watchers[i:]
+                        self.__qhead = len(trail)
+                        return clause
+                    self.__assign(first, clause)
+            del watchers[j:]
+        return None
+
+    def __analyze(self, conflict: Clause) -> List[int]:
+        # First-UIP learning: resolve backwards along the trail until only
+        # one literal of the current decision level remains.
+        seen = self.__seen
+        level = self.__level
+        reason = self.__reason
+        trail = self.__trail
+        current = len(self.__trail_lim)
+
+        learnt = [0]
+        pending = 0
+        code = None
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            if clause.learnt:
+                self.__bump_clause(clause)
+            for literal in clause.literals if code is None else clause.literals[1:]:
+                variable = literal >> 1
+                if not seen[variable] and level[variable] > 0:
+                    seen[variable] = True
+                    self.__bump_variable(variable)
+                    if level[variable] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(literal)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            code = trail[index]
+            index -= 1
+            clause = reason[code >> 1]
+            seen[code >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = code ^ 1
+
+        # Drop literals implied by the rest of the clause.
+        minimized = [learnt[0]]
+        for literal in learnt[1:]:
+            antecedent = reason[literal >> 1]
+            if antecedent is None or any(not seen[other >> 1] and level[other >> 1] > 0 for other in antecedent.literals[1:]):
+                minimized.append(literal)
+        for literal in learnt:
+            seen[literal >> 1] = False
+        return minimized
+
+    def __bump_variable(self, variable: int) -> None:
+        activity = self.__activity
+        activity[variable] += self.__var_inc
+        if activity[variable] > 1e100:
+            for v in range(1, self.num_variables + 1):
+                activity[v] *= 1e-100
+            self.__var_inc *= 1e-100
+            self.__heap = [(-activity[v], v) for v in range(1, self.num_variables + 1) if self.__value[2 * v] == UNASSIGNED]
+            heapq.heapify(self.__heap)
+        elif self.__value[2 * variable] == UNASSIGNED:
+            heapq.heappush(self.__heap, (-activity[variable], variable))
+
+    def __bump_clause(self, clause: Clause) -> None:
+        clause.activity += self.__clause_inc
+        if clause.activity > 1e20:
+            for learnt in self.learnts:
+                learnt.activity *= 1e-20
+            self.__clause_inc *= 1e-20
+
+    def __backtrack(self, target: int) -> None:
+        if len(self.__trail_lim) <= target:
+            return
+        value, phase, activity, heap = self.__value, self.__phase, self.__activity, self.__heap
+        trail = self.__trail
+        start = self.__trail_lim[target]
+        for code in trail[start:]:
+            variable = code >> 1
+            value[code] = value[code ^ 1] = UNASSIGNED
+            self.__reason[variable] = None
+            phase[variable] = code & 1
+            heapq.heappush(heap, (-activity[variable], variable))
+        del trail[start:]
+        del self.__trail_lim[target:]
+        self.__qhead = start
+
+    def __decide(self) -> Optional[int]:
+        # VSIDS with a lazy heap: stale entries (assigned variables or an
+        # outdated activity) are discarded when they reach the top.
+        heap, value, activity = self.__heap, self.__value, self.__activity
+        if len(heap) > 4 * self.num_variables + 1024:
+            self.__heap = heap = [(-activity[v], v) for v in range(1, self.num_variables + 1) if value[2 * v] == UNASSIGNED]
+            heapq.heapify(heap)
+        while heap:
+            priority, variable = heapq.heappop(heap)
+            if value[2 * variable] == UNASSIGNED and -priority == activity[variable]:
+                return 2 * variable + self.__phase[variable]
+        for variable in range(1, self.num_variables + 1):
+            if value[2 * variable] == UNASSIGNED:
+                return 2 * variable + self.__phase[variable]
+        return None
+
+    def __reduce_learnts(self) -> None:
+        # Keep glue clauses and the more active half of the rest; clauses
+        # that are the reason for a current assignment are locked.
+        reason, value = self.__reason, self.__value
+        candidates = sorted((c for c in self.learnts if c.lbd > 2), key=lambda c: c.activity)
+        remove = set()
+        for clause in candidates[:len(candidates) // 2]:
+            first = clause.literals[0]
+            if value[first] == TRUE and reason[first >> 1] is clause:
+                continue
+            clause.deleted = True
+            remove.add(id(clause))
+        self.deleted += len(remove)
+        self.learnts = [c for c in self.learnts if id(c) not in remove]
+
+    @staticmethod
+    def luby(index: int) -> int:
+        size, power = 1, 0
+        while size < index + 1:
+            power += 1
+            size = 2 * size + 1
+        while size - 1 != index:
+            size = (size - 1) >> 1
+            power -= 1
+            index %= size
+        return 1 << power
+
+    @instrument.timed('sat.solve')
+    def solve(self, max_conflicts: Optional[int] = None) -> Optional[bool]:
+        if not instrument.enabled:
+            return self.__solve(max_conflicts)
+        before = (self.conflicts, self.decisions, self.propagations, self.restarts)
+        try:
+            return self.__solve(max_conflicts)
+        finally:
+            after = (self.conflicts, self.decisions, self.propagations, self.restarts)
+            for name, start, end in zip(('conflicts', 'decisions', 'propagations', 'restarts'), before, after):
+                instrument.count(f'sat.{name}', end - start)
+
+    def __solve(self, max_conflicts: Optional[int]) -> Optional[bool]:
+        self.model = None
+        if not self.__ok:
+            return False
+        if self.__propagate() is not None:
+            self.__ok = False
+            return False
+
+        self.__max_learnts = max(len(self.clauses) / 3, 1000.0)
+        budget = max_conflicts
+        while True:
+            limit = self.luby(self.restarts) * self.RESTART_UNIT
+            status = self.__search(limit if budget is None else min(limit, budget))
+            if status is not None:
+                return status
+            if budget is not None:
+                budget -= limit
+                if budget <= 0:
+                    self.__backtrack(0)
+                    return None
+            self.restarts += 1
+
+    def __search(self, limit: int) -> Optional[bool]:
+        conflicts = 0
+        while True:
+            conflict = self.__propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.__trail_lim:
+                    self.__ok = False
+                    return False
+
+                learnt = self.__analyze(conflict)
+                level = self.__level
+                target = 0
+                if len(learnt) > 1:
+                    back = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+                    learnt[1], learnt[back] = learnt[back], learnt[1]
+                    target = level[learnt[1] >> 1]
+                self.__backtrack(target)
+
+                if len(learnt) == 1:
+                    self.__assign(learnt[0], None)
+                else:
+                    clause = Clause(learnt, learnt=True, lbd=len({level[code >> 1] for code in learnt}))
+                    self.learnts.append(clause)
+                    self.__watches[learnt[0]].append(clause)
+                    self.__watches[learnt[1]].append(clause)
+                    self.__bump_clause(clause)
+                    self.__assign(learnt[0], clause)
+                self.__var_inc /= self.VAR_DECAY
+                self.__clause_inc /= self.CLAUSE_DECAY
+                continue
+
+            if conflicts >= limit:
+                self.__backtrack(0)
+                return None
+            if len(self.learnts) - len(self.__trail) >= self.__max_learnts:
+                self.__reduce_learnts()
+                self.__max_learnts *= 1.1
+
+            decision = self.__decide()
+            if decision is None:
+                self.model = [v if self.__value[2 * v] == TRUE else -v for v in range(1, self.num_variables + 1)]
+                self.__backtrack(0)
+                return True
+            self.decisions += 1
+            self.__trail_lim.append(len(self.__trail))
+            self.__assign(decision, None)
+
+    def assignment(self) -> Dict[str, bool]:
+        if self.model is None:
+            raise ValueError("No model: the last call to solve() did not return True.")
+        if self.symbols is None:
+            return {str(abs(literal)): literal > 0 for literal in self.model}
+        return {self.symbols.name(abs(literal)): literal > 0 for literal in self.model if abs(literal) <= len(self.symbols)}
+
+def solve(formula: Union[ParseTree, str], encoding: str = 'tseitin', max_conflicts: Optional[int] = None) -> Optional[Dict[str, bool]]:
+    if isinstance(formula, str):
+        formula = CNF(formula, encoding=encoding)
+    elif not isinstance(formula, CNF):
+        formula = CNF(formula, encoding=encoding)
+
+    clause_set = formula.to_clause_set()
+    solver = Solver(clause_set)
+    status = solver.solve(max_conflicts)
+    if status is None:
+        raise TimeoutError(f"No answer within {max_conflicts} conflicts.")
+    if not status:
+        return None
+    model = solver.assignment()
+    return {name: value for name, value in model.items() if name not in formula.auxiliary_variables}
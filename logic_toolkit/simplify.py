@@ -0,0 +1,186 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from logic_toolkit.clauses import ClauseSet
+
+Clause = Tuple[int, ...]
+
+class Simplifier:
+    # Every stage preserves equivalence: unit clauses are kept while the
+    # clauses they satisfy are dropped and the literals they falsify are
+    # removed. A clause given as None is one satisfied by a constant; it
+    # has no integer form, so it is always dropped (and counted as a
+    # tautology).
+    STAGES = ('tautologies', 'literals', 'duplicates', 'units', 'subsumption', 'self_subsumption')
+
+    def __init__(self, tautologies: bool = True, literals: bool = True, duplicates: bool = True, units: bool = False, subsumption: bool = True, self_subsumption: bool = True) -> None:
+        self.enabled: Dict[str, bool] = {
+            'tautologies': tautologies,
+            'literals': literals,
+            'duplicates': duplicates,
+            'units': units,
+            'subsumption': subsumption,
+            'self_subsumption': self_subsumption,
+        }
+        self.report: Dict[str, Dict[str, int]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(stage for stage in self.STAGES if self.enabled[stage])})"
+
+    def __count(self, stage: str, clauses: int = 0, literals: int = 0) -> None:
+        entry = self.report[stage]
+        entry['clauses'] += clauses
+        entry['literals'] += literals
+
+    def run(self, clauses: Iterable[Optional[Iterable[int]]]) -> List[Clause]:
+        self.report = {stage: {'clauses': 0, 'literals': 0} for stage in self.STAGES if self.enabled[stage]}
+        enabled = self.enabled
+
+        result: List[Clause] = []
+        seen: Set[Clause] = set()
+        for clause in clauses:
+            if clause is None:
+                if enabled['tautologies']:
+                    self.__count('tautologies', clauses=1)
+                continue
+            clause = tuple(clause)
+            if enabled['tautologies'] and any(-literal in clause for literal in clause):
+                self.__count('tautologies', 1, len(clause))
+                continue
+            if enabled['literals']:
+                unique = tuple(dict.fromkeys(clause))
+                self.__count('literals', literals=len(clause) - len(unique))
+                clause = unique
+            if enabled['duplicates']:
+                key = tuple(sorted(clause))
+                if key in seen:
+                    self.__count('duplicates', 1, len(clause))
+                    continue
+                seen.add(key)
+            result.append(clause)
+
+        return self.__reduce(result)
+
+    def __reduce(self, clauses: List[Clause]) -> List[Clause]:
+        enabled = self.enabled
+        if not (enabled['units'] or enabled['subsumption'] or enabled['self_subsumption']):
+            return clauses
+
+        # Clauses live in a list of sets indexed by position, with an
+        # occurrence list per literal; removed clauses become None.
+        store: List[Optional[Set[int]]] = [set(clause) for clause in clauses]
+        occurrences: Dict[int, Set[int]] = {}
+        for index, clause in enumerate(store):
+            for literal in clause:
+                occurrences.setdefault(literal, set()).add(index)
+
+        # Strengthening can create new units, so the two take turns until
+        # neither changes anything.
+        while True:
+            if enabled['units']:
+                self.__propagate(store, occurrences)
+            strengthened = (enabled['subsumption'] or enabled['self_subsumption']) and self.__subsume(store, occurrences)
+            if any(clause is not None and not clause for clause in store):
+                return [()]
+            if not (strengthened and enabled['units']):
+                break
+        return [tuple(literal for literal in original if literal in clause) for original, clause in zip(clauses, store) if clause is not None]
+
+    def __remove(self, store: List[Optional[Set[int]]], occurrences: Dict[int, Set[int]], index: int, stage: str) -> None:
+        clause = store[index]
+        for literal in clause:
+            occurrences[literal].discard(index)
+        store[index] = None
+        self.__count(stage, 1, len(clause))
+
+    def __strengthen(self, store: List[Optional[Set[int]]], occurrences: Dict[int, Set[int]], index: int, literal: int, stage: str) -> None:
+        store[index].discard(literal)
+        occurrences[literal].discard(index)
+        self.__count(stage, literals=1)
+
+    def __propagate(self, store: List[Optional[Set[int]]], occurrences: Dict[int, Set[int]]) -> None:
+        reasons: Dict[int, int] = {}
+        queue: Deque[int] = deque()
+        for index, clause in enumerate(store):
+            if clause is not None and len(clause) == 1:
+                literal = next(iter(clause))
+                if literal not in reasons:
+                    reasons[literal] = index
+                    queue.append(literal)
+
+        while queue:
+            literal = queue.popleft()
+            reason = reasons[literal]
+            if store[reason] is None:
+                continue
+            for index in list(occurrences.get(literal, ())):
+                if index != reason:
+                    self.__remove(store, occurrences, index, 'units')
+            for index in list(occurrences.get(-literal, ())):
+                self.__strengthen(store, occurrences, index, -literal, 'units')
+                clause = store[index]
+                if not clause:
+                    return
+                if len(clause) == 1:
+                    unit = next(iter(clause))
+                    if unit not in reasons:
+                        reasons[unit] = index
+                        queue.append(unit)
+                    elif reasons[unit] != index and store[reasons[unit]] is not None:
+                        self.__remove(store, occurrences, index, 'units')
+
+    def __subsume(self, store: List[Optional[Set[int]]], occurrences: Dict[int, Set[int]]) -> bool:
+        # Backward subsumption: each clause C looks for clauses D it
+        # subsumes, or that it strengthens by resolving on the one literal
+        # of C that D contains negated. Every candidate mentions the variable
+        # of C with the fewest occurrences, so only that variable's
+        # occurrence lists are scanned.
+        subsume = self.enabled['subsumption']
+        strengthen = self.enabled['self_subsumption']
+        order = sorted((index for index, clause in enumerate(store) if clause is not None), key=lambda index: len(store[index]))
+        queue: Deque[int] = deque(order)
+        queued = set(order)
+        strengthened = False
+        while queue:
+            index = queue.popleft()
+            queued.discard(index)
+            clause = store[index]
+            if not clause:
+                continue
+            pivot = min(clause, key=lambda literal: len(occurrences.get(literal, ())) + len(occurrences.get(-literal, ())))
+            candidates = set(occurrences.get(pivot, ()))
+            if strengthen:
+                candidates |= occurrences.get(-pivot, set())
+            for other in candidates:
+                target = store[other]
+                if other == index or target is None or store[index] is None or len(target) < len(clause):
+                    continue
+                flipped = None
+                for literal in clause:
+                    if literal in target:
+                        continue
+                    if flipped is None and strengthen and -literal in target:
+                        flipped = literal
+                        continue
+                    break
+                else:
+                    if flipped is None:
+                        if subsume:
+                            self.__remove(store, occurrences, other, 'subsumption')
+                    else:
+                        self.__strengthen(store, occurrences, other, -flipped, 'self_subsumption')
+                        strengthened = True
+                        if other not in queued:
+                            queue.append(other)
+                            queued.add(other)
+        return strengthened
+
+    def simplify(self, clause_set: ClauseSet) -> ClauseSet:
+        simplified = ClauseSet(symbols=clause_set.symbols)
+        for clause in self.run(clause_set):
+            simplified.add_clause(clause)
+        return simplified
+
+def simplify(clause_set: ClauseSet, **stages: bool) -> Tuple[ClauseSet, Dict[str, Dict[str, int]]]:
+    simplifier = Simplifier(**stages)
+    return simplifier.simplify(clause_set), simplifier.report
@@ -0,0 +1,127 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from logic_toolkit.cnf import CNF
+from logic_toolkit.horn import HornFormula
+from logic_toolkit.minimize import Minimizer, minimize as minimize_cnf
+from logic_toolkit.natural_deduction import NaturalDeduction, ProofChecker
+from logic_toolkit.proof import Proof, parse_references
+from logic_toolkit.prover import ProofSearch
+from logic_toolkit.sat import solve
+from logic_toolkit.simplify import Simplifier
+from logic_toolkit.wff import WellFormedFormula
+
+def parse_formula(text: str) -> Dict:
+    try:
+        formula = WellFormedFormula(text.strip())
+    except ValueError as e:
+        return {'valid': False, 'reason': str(e), 'output': 'Invalid Formula'}
+    preorder = formula.preorder()
+    return {'valid': True, 'formula': str(formula), 'output': f'Valid Formula\n{preorder}'}
+
+def convert_to_cnf(text: str, encoding: str = 'distribute', simplify: bool = False, units: bool = False, minimize: bool = False) -> Dict:
+    cnf = CNF(text.strip(), encoding=encoding, simplify=Simplifier(units=units) if simplify or units else False)
+    minimizer = Minimizer() if minimize else None
+    if minimizer is not None:
+        simplification = cnf.simplification
+        cnf = minimize_cnf(cnf, minimizer)
+        cnf.simplification = simplification
+    result = {'cnf': str(cnf), 'output': str(cnf)}
+    if cnf.auxiliary_variables:
+        result['auxiliary_variables'] = {name: str(tree) for name, tree in cnf.auxiliary_variables.items()}
+    if cnf.simplification is not None:
+        result['simplification'] = cnf.simplification
+    if minimizer is not None:
+        result['minimization'] = dict(minimizer.report, method=minimizer.method)
+    return result
+
+def check_horn(text: str) -> Dict:
+    horn = HornFormula(text.strip())
+    if not horn.is_valid_horn:
+        return {'valid_horn': False, 'output': 'Invalid Horn Formula'}
+
+    satisfiable, true_vars = horn.check_satisfiability()
+    result = {'valid_horn': True, 'satisfiable': satisfiable, 'true_vars': sorted(true_vars)}
+    if not satisfiable:
+        result['output'] = 'Unsatisfiable'
+    elif true_vars:
+        result['output'] = 'Satisfiable\n' + ', '.join(sorted(true_vars))
+    else:
+        result['output'] = 'Satisfiable'
+    return result
+
+def check_sat(text: str) -> Dict:
+    model = solve(text.strip())
+    if model is None:
+        return {'satisfiable': False, 'output': 'Unsatisfiable'}
+    true_vars = sorted(name for name, value in model.items() if value)
+    result = {'satisfiable': True, 'model': model}
+    result['output'] = 'Satisfiable\n' + ', '.join(true_vars) if true_vars else 'Satisfiable'
+    return result
+
+def apply_rule(text: str) -> Dict:
+    proof = Proof()
+    nd = NaturalDeduction()
+    results = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        parts = line.split(None, 1)
+        if parts[0].isdigit():
+            proof.add_line(int(parts[0]), WellFormedFormula(parts[1].strip()), None, [])
+            continue
+
+        rule, refs = parse_references(line)
+        try:
+            results.append(str(nd.apply_rule(rule, proof, refs)))
+        except Exception:
+            results.append(None)
+    return {'results': results, 'output': '\n'.join(r if r is not None else 'Rule Cannot Be Applied' for r in results)}
+
+def check_proof(text: str) -> Dict:
+    checker = ProofChecker()
+    if not checker.check(Proof.parse(text)):
+        line_number = checker.first_invalid
+        return {'valid': False, 'line': line_number, 'output': f'Invalid Deduction at Line {line_number}'}
+    return {'valid': True, 'line': None, 'output': 'Valid Deduction'}
+
+def prove_sequent(text: str) -> Dict:
+    separator = '⊢' if '⊢' in text else '|-'
+    if separator not in text:
+        raise ValueError("Expected a sequent of the form 'premise, ... ⊢ goal'.")
+    premises, goal = text.split(separator, 1)
+    search = ProofSearch()
+    proof = search.search([premise for premise in premises.split(',') if premise.strip()], goal.strip())
+    if proof is None:
+        return {'proved': False, 'nodes': search.nodes, 'exhausted': search.exhausted, 'output': 'No Proof Found'}
+    return {'proved': True, 'nodes': search.nodes, 'output': proof}
+
+def split_test_case(text: str) -> Tuple[Optional[str], Optional[str]]:
+    lines = text.split('\n')
+    stripped = [line.strip() for line in lines]
+    if 'input:' not in stripped:
+        return None, None
+    start = stripped.index('input:') + 1
+    end = stripped.index('output:') if 'output:' in stripped else len(lines)
+    expected = '\n'.join(line.rstrip() for line in lines[end + 1:]).strip() if end < len(lines) else None
+    return '\n'.join(lines[start:end]), expected
+
+TASKS: Dict[str, Callable[[str], Dict]] = {
+    'parse': parse_formula,
+    'cnf': convert_to_cnf,
+    'horn': check_horn,
+    'sat': check_sat,
+    'rule': apply_rule,
+    'check-proof': check_proof,
+    'prove': prove_sequent,
+}
+
+MULTILINE_TASKS = {'rule', 'check-proof'}
+
+# The ASCII operators each single-line task treats exactly like their
+# Unicode spelling; the rest are parsed by WellFormedFormula, which accepts
+# none.
+ASCII_OPERATORS: Dict[str, Tuple[str, ...]] = {
+    'horn': ('&', '^', '->', '=>'),
+    'prove': ('|-',),
+}
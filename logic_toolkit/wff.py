@@ -1,97 +1,196 @@
-from logic_toolkit.base import ParseTree, Node
+from logic_toolkit import instrument
+from logic_toolkit.base import ParseTree, Node, InternedNode, SymbolTable, is_variable
+from typing import Iterator, List, Optional, Tuple
+import sys
 
 class WellFormedFormula(ParseTree):
-    def __init__(self, formula: str) -> None:
+    # Operator precedence (lower number = lower precedence)
+    PRECEDENCE = {'→': 1, '∨': 2, '∧': 3, '¬': 4}
+    RIGHT_ASSOCIATIVE = {'→', '¬'}
+    CONSTANTS = {'⊤', '⊥'}
+
+    def __init__(self, formula: str, interned: bool = False, symbols: Optional[SymbolTable] = None) -> None:
         super().__init__()
+        self.__node = InternedNode if interned else Node
+        self.__symbols = symbols
         self.__from_string(formula)
 
     def __from_string(self, formula: str) -> "WellFormedFormula":
         if self.is_built:
             raise ValueError("ParseTree is already built. Create a new instance to parse a different formula.")
-        
-        formula = formula.replace(' ', '')
-        if not formula:
+
+        if not formula.replace(' ', ''):
             raise ValueError("Empty formula")
 
-        self._root = self.__parse_expression(formula)
+        with instrument.stage('parse'):
+            try:
+                self._root = self.__parse_tokens(formula, self.__tokenize(formula))
+            except ValueError as e:
+                # The single pass stops at the first bad token; the message
+                # names the fragment the earlier slicing parser reported.
+                raise ValueError(self.__slicing_error(formula.replace(' ', '')) or str(e)) from None
         return self
-    
-    def __parse_expression(self, formula: str) -> Node:
-        if not formula:
-            raise ValueError("Empty expression")
 
-        while formula.startswith('(') and formula.endswith(')') and self.__matching_parenthesis(formula, 0) == len(formula) - 1:
-            formula = formula[1:-1]
-        
-        main_op_pos = self.__find_main_operator(formula)
-        
-        if main_op_pos == -1:
-            if formula.startswith('¬'):
-                operand = formula[1:]
-                if not operand:
-                    raise ValueError("Missing operand for negation")
-                neg_node = Node('¬')
-                neg_node.right = self.__parse_expression(operand)
-                return neg_node
-            # Special constants first
-            elif formula in ['⊤', '⊥']:
-                return Node(formula)
-            # Then check for propositional variables
-            elif len(formula) == 1 and formula.isalpha():
-                return Node(formula)
+    def __tokenize(self, formula: str) -> Iterator[Tuple[str, str]]:
+        i = 0
+        length = len(formula)
+        while i < length:
+            char = formula[i]
+            if char == ' ':
+                i += 1
+            elif char in self.PRECEDENCE:
+                yield ('op', char)
+                i += 1
+            elif char in '()':
+                yield (char, char)
+                i += 1
+            elif char in self.CONSTANTS:
+                yield ('atom', char)
+                i += 1
+            elif char.isalpha():
+                start = i
+                i += 1
+                while i < length and (formula[i].isalnum() or formula[i] == '_'):
+                    i += 1
+                yield ('atom', self.__symbol(formula[start:i]))
             else:
-                raise ValueError(f"Invalid expression: {formula}")
-        
-        left_expr = formula[:main_op_pos]
-        operator = formula[main_op_pos]
-        right_expr = formula[main_op_pos + 1:]
-        
-        if not left_expr or not right_expr:
-            raise ValueError(f"Missing operand for operator {operator}")
-        
-        op_node = Node(operator)
-        op_node.left = self.__parse_expression(left_expr)
-        op_node.right = self.__parse_expression(right_expr)
-        
-        return op_node
-    
-    def __find_main_operator(self, formula: str) -> int:
-        # Operator precedence (lower number = lower precedence)
-        precedence = {'→': 1, '∨': 2, '∧': 3}
-        
-        main_op_pos = -1
-        main_op_precedence = float('inf')
-        paren_level = 0
-        
+                raise ValueError(f"Invalid expression: {char}")
+
+    def __symbol(self, name: str) -> str:
+        if self.__symbols is None:
+            return sys.intern(name)
+        return self.__symbols.name(self.__symbols.intern(name))
+
+    def __parse_tokens(self, formula: str, tokens: Iterator[Tuple[str, str]]) -> Node:
+        # Shunting-yard: operands are reduced into Nodes as soon as the
+        # operator stack allows it, so no recursion and no re-scanning.
+        operands: List[Node] = []
+        operators: List[str] = []
+        expect_operand = True
+        previous = None
+
+        for kind, value in tokens:
+            if kind == 'atom':
+                if not expect_operand:
+                    self.__raise_invalid(formula)
+                operands.append(self.__node(value))
+                expect_operand = False
+            elif kind == '(':
+                if not expect_operand:
+                    self.__raise_invalid(formula)
+                operators.append('(')
+            elif kind == ')':
+                if expect_operand:
+                    self.__raise_missing_operand(previous, value)
+                while operators and operators[-1] != '(':
+                    self.__reduce(operators.pop(), operands)
+                if not operators:
+                    self.__raise_invalid(formula)
+                operators.pop()
+            elif value == '¬':
+                if not expect_operand:
+                    self.__raise_invalid(formula)
+                operators.append(value)
+            else:
+                if expect_operand:
+                    self.__raise_missing_operand(previous, value)
+                precedence = self.PRECEDENCE[value]
+                while operators and operators[-1] != '(':
+                    top_precedence = self.PRECEDENCE[operators[-1]]
+                    if top_precedence > precedence or (top_precedence == precedence and value not in self.RIGHT_ASSOCIATIVE):
+                        self.__reduce(operators.pop(), operands)
+                    else:
+                        break
+                operators.append(value)
+                expect_operand = True
+            previous = value
+
+        if expect_operand:
+            self.__raise_missing_operand(previous, None)
+
+        while operators:
+            operator = operators.pop()
+            if operator == '(':
+                self.__raise_invalid(formula)
+            self.__reduce(operator, operands)
+
+        return operands[0]
+
+    def __reduce(self, operator: str, operands: List[Node]) -> None:
+        if operator == '¬':
+            operands.append(self.__node('¬', right=operands.pop()))
+        else:
+            right = operands.pop()
+            left = operands.pop()
+            operands.append(self.__node(operator, left=left, right=right))
+
+    def __raise_invalid(self, formula: str) -> None:
+        raise ValueError(f"Invalid expression: {formula.replace(' ', '')}")
+
+    def __raise_missing_operand(self, previous: str, current: str) -> None:
+        if previous == '¬':
+            raise ValueError("Missing operand for negation")
+        if previous == '(' and current == ')':
+            raise ValueError("Empty expression")
+        if previous in self.PRECEDENCE:
+            raise ValueError(f"Missing operand for operator {previous}")
+        if current in self.PRECEDENCE:
+            raise ValueError(f"Missing operand for operator {current}")
+        raise ValueError("Empty expression")
+
+    def __slicing_error(self, formula: str) -> Optional[str]:
+        # Only run on malformed input: fragments are split at their main
+        # operator and checked depth-first, left before right, as the
+        # slicing parser did, and the first failure is its error.
+        fragments = [formula]
+        while fragments:
+            fragment = fragments.pop()
+            if not fragment:
+                return "Empty expression"
+            while fragment.startswith('(') and fragment.endswith(')') and self.__closing_parenthesis(fragment) == len(fragment) - 1:
+                fragment = fragment[1:-1]
+            position = self.__main_operator(fragment)
+            if position == -1:
+                if fragment.startswith('¬'):
+                    if not fragment[1:]:
+                        return "Missing operand for negation"
+                    fragments.append(fragment[1:])
+                elif fragment not in self.CONSTANTS and not is_variable(fragment):
+                    return f"Invalid expression: {fragment}"
+                continue
+            left, right = fragment[:position], fragment[position + 1:]
+            if not left or not right:
+                return f"Missing operand for operator {fragment[position]}"
+            fragments.append(right)
+            fragments.append(left)
+        return None
+
+    def __main_operator(self, formula: str) -> int:
+        # The rightmost loosest operator outside brackets; for → the
+        # leftmost, as it groups to the right.
+        position = -1
+        loosest = 5
+        level = 0
         for i, char in enumerate(formula):
             if char == '(':
-                paren_level += 1
+                level += 1
             elif char == ')':
-                paren_level -= 1
-            elif paren_level == 0 and char in precedence:
-                char_precedence = precedence[char]
-                if char_precedence < main_op_precedence:
-                    main_op_pos = i
-                    main_op_precedence = char_precedence
-                elif char_precedence == main_op_precedence:
-                    if char == '→':
-                        pass
-                    else:
-                        main_op_pos = i
-        
-        return main_op_pos
-
-    def __matching_parenthesis(self, formula: str, start: int) -> int:
-        if formula[start] != '(':
-            return -1
-        
-        paren_count = 1
-        for i in range(start + 1, len(formula)):
-            if formula[i] == '(':
-                paren_count += 1
-            elif formula[i] == ')':
-                paren_count -= 1
-                if paren_count == 0:
+                level -= 1
+            elif level == 0 and char in self.PRECEDENCE and char != '¬':
+                precedence = self.PRECEDENCE[char]
+                if precedence < loosest or (precedence == loosest and char != '→'):
+                    position = i
+                    loosest = precedence
+        return position
+
+    @staticmethod
+    def __closing_parenthesis(formula: str) -> int:
+        level = 0
+        for i, char in enumerate(formula):
+            if char == '(':
+                level += 1
+            elif char == ')':
+                level -= 1
+                if level == 0:
                     return i
-        
-        return -1
\ No newline at end of file
+        return -1
@@ -1,12 +1,13 @@
 from logic_toolkit.wff import WellFormedFormula
 from logic_toolkit.natural_deduction import NaturalDeduction
+from logic_toolkit.proof import Proof
 
 input_file = "tests/test41.txt"
 
 with open(input_file, 'r', encoding='utf-8') as f:
     input_lines = f.readlines()
 
-lines = {}
+proof = Proof()
 for line in input_lines:
     line = line.rstrip('\n')
     if not line or line.strip() == "input:":
@@ -19,17 +20,12 @@ for line in input_lines:
     if parts[0].strip().isdigit():
         line_number = int(parts[0].strip())
         formula_str = parts[1].strip()
-        lines[line_number] = {
-            'formula': WellFormedFormula(formula_str),
-            'rule': None,
-            'references': [],
-            'scope_level': 0
-        }
+        proof.add_line(line_number, WellFormedFormula(formula_str), None, [])
     else:
         rule, refs = NaturalDeduction.parse_references(line.strip())
         try:
             nd = NaturalDeduction()
-            tree = nd.apply_rule(rule, lines, refs)
+            tree = nd.apply_rule(rule, proof, refs)
             print(tree)
         except:
             print("Rule Cannot Be Applied")
@@ -0,0 +1,22 @@
+from logic_toolkit import batch
+from logic_toolkit.cnf import CNF
+from logic_toolkit.wff import WellFormedFormula
+
+FORMULAS = ['p ∨ (q ∨ r)', '(p ∨ q) ∨ r', '¬(p ∧ ⊤) → (q → r)', 'p ∧']
+
+
+def test_results_do_not_depend_on_workers():
+    for task in [WellFormedFormula, CNF, 'cnf', 'parse']:
+        assert list(batch.map(task, FORMULAS, workers=1)) == list(batch.map(task, FORMULAS, workers=2, chunksize=1))
+
+
+def test_compacted_trees_parse_back_to_the_same_tree():
+    results = list(batch.map(WellFormedFormula, FORMULAS[:3], workers=1))
+    assert results[0] == 'p ∨ (q ∨ r)'
+    assert [WellFormedFormula(text).root for text in results] == [WellFormedFormula(text).root for text in FORMULAS[:3]]
+
+
+def test_without_compaction_trees_are_returned():
+    results = list(batch.map(WellFormedFormula, FORMULAS[:3], workers=1, compact=False))
+    assert all(isinstance(result, WellFormedFormula) for result in results)
+    assert [str(result) for result in results] == [str(WellFormedFormula(text)) for text in FORMULAS[:3]]
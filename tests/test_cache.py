@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from logic_toolkit.cache import ResultCache, compact, normalize
+from logic_toolkit.cli import main
+from logic_toolkit.tasks import ASCII_OPERATORS, TASKS
+
+
+def run(tmp_path, *argv):
+    output = tmp_path / 'results.jsonl'
+    main([*argv, '--output', str(output)])
+    return [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+
+
+@pytest.mark.parametrize('command, inputs', [
+    ('parse', ['p → q', 'p -> q', 'p→q', 'p & q']),
+    ('horn', ['(p ∧ q) → r', '(p & q) -> r', 'p ^ q => r', 'p ∧ q ~ r', 'p ¬ q']),
+    ('prove', ['p ⊢ p', 'p |- p', 'p, p → q ⊢ q']),
+])
+def test_cache_does_not_change_results(tmp_path, command, inputs):
+    source = tmp_path / 'inputs.txt'
+    source.write_text('\n'.join(inputs) + '\n', encoding='utf-8')
+    assert run(tmp_path, command, str(source), '--cache') == run(tmp_path, command, str(source))
+
+
+def test_horn_spellings_share_an_entry():
+    cache = ResultCache()
+    task = cache.cached('horn', key=lambda text: normalize(text, ASCII_OPERATORS['horn']))(TASKS['horn'])
+    assert task('(p ∧ q) → r') == task('(p & q) -> r') == task(' (p ^ q) => r ')
+    assert cache.stats['misses'] == 1 and cache.stats['hits'] == 2
+
+
+def test_keys():
+    assert compact('  p  ∧ ( q ∨ r ) ') == 'p∧(q∨r)'
+    assert compact('p -> q') == 'p->q'
+    assert normalize('p -> q & ~r') == 'p→q∧¬r'
+    assert normalize('p -> q |- ~r', ['->']) == 'p→q|-~r'
+    with pytest.raises(ValueError):
+        normalize('p', ['<->'])
@@ -0,0 +1,16 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from logic_toolkit.cli import main
+
+TESTS = Path(__file__).parent
+
+
+@pytest.mark.parametrize('path', sorted(TESTS.glob('test3*.txt')), ids=lambda path: path.stem)
+def test_horn_matches_phase3_workloads(path, tmp_path):
+    output = tmp_path / 'results.jsonl'
+    assert main(['horn', str(path), '--output', str(output)]) == 0
+    result = json.loads(output.read_text(encoding='utf-8'))
+    assert result['match'], result
@@ -0,0 +1,28 @@
+import pytest
+
+from logic_toolkit import bdd
+from logic_toolkit.clauses import ClauseSet
+from logic_toolkit.cnf import CNF
+
+
+def test_clause_set_is_simplified_when_asked():
+    clause_set = ClauseSet(['p', 'q'])
+    for clause in [(1, 2), (1, 2, -2), (1,), (1, 2)]:
+        clause_set.add_clause(clause)
+    plain = CNF(clause_set)
+    simplified = CNF(clause_set, simplify=True)
+    assert plain.simplification is None and plain.encoding is None
+    assert simplified.simplification is not None
+    assert simplified.clauses() == [(1,)]
+    assert bdd.equivalent(plain, simplified)
+
+
+def test_clause_set_takes_no_encoding():
+    with pytest.raises(ValueError):
+        CNF(ClauseSet(['p']), encoding='tseitin')
+
+
+def test_negation_left_above_a_compound_is_pushed_down_for_clauses():
+    formula = '(q ∨ ((¬((r → s)) → (r ∨ (s ∨ q))) → ((¬(p) ∧ (p ∨ r)) ∧ ((p ∨ r) ∨ q))))'
+    cnf = CNF(formula)
+    assert bdd.equivalent(CNF(cnf.to_clause_set()), formula)
@@ -0,0 +1,36 @@
+import io
+
+from logic_toolkit import dimacs
+
+
+CLAUSES = [(1, -2), (2, 3), ()]
+
+
+def test_clause_stream_in_append_mode(tmp_path):
+    path = tmp_path / 'out.cnf'
+    path.write_bytes(b'c existing comment\n')
+    with open(path, 'ab') as f:
+        dimacs.write(iter(CLAUSES), f)
+    assert path.read_bytes() == b'c existing comment\np cnf 3 3\n1 -2 0\n2 3 0\n0\n'
+    assert list(dimacs.iter_clauses(str(path))) == CLAUSES
+
+
+def test_clause_stream_to_text_and_unseekable_targets():
+    text = io.StringIO()
+    dimacs.write(iter(CLAUSES), text)
+    assert text.getvalue() == 'p cnf 3 3\n1 -2 0\n2 3 0\n0\n'
+
+    class Pipe(io.BytesIO):
+        def seekable(self):
+            return False
+
+    pipe = Pipe()
+    dimacs.write(iter(CLAUSES), pipe, batch=1)
+    assert pipe.getvalue().decode() == text.getvalue()
+
+
+def test_unique_names_for_unnamed_variables(tmp_path):
+    path = tmp_path / 'named.cnf'
+    path.write_text('c var 1 x2\np cnf 3 2\n1 -2 0\n2 3 0\n')
+    clause_set = dimacs.read(str(path))
+    assert [clause_set.name(i) for i in range(1, 4)] == ['x2', 'x2_1', 'x3']
@@ -0,0 +1,23 @@
+import pytest
+
+from logic_toolkit.horn import HornFormula, HornKnowledgeBase
+
+
+@pytest.mark.parametrize('formula, expected', [
+    ('⊥ → p', (True, set())),
+    ('p ∧ (p ∧ ⊥ → q)', (True, {'p'})),
+    ('(⊥ → p) ∧ (p → ⊥)', (True, set())),
+    ('p ∧ (p → q)', (True, {'p', 'q'})),
+    ('p ∧ (p → ⊥)', (False, set())),
+])
+def test_formula_and_knowledge_base_agree(formula, expected):
+    assert HornFormula(formula).check_satisfiability() == expected
+    assert HornKnowledgeBase(formula).check_satisfiability() == expected
+
+
+def test_bottom_premise_is_never_true():
+    kb = HornKnowledgeBase('⊥ → p')
+    assert kb.model == set()
+    kb.add_clause('q ∧ (q ∧ ⊥ → p)')
+    assert kb.model == {'q'}
+    assert not kb.entails('p')
@@ -0,0 +1,40 @@
+import pytest
+
+from logic_toolkit.wff import WellFormedFormula
+
+
+# The messages the slicing parser gave before the single-pass parser
+# replaced it.
+@pytest.mark.parametrize('formula, message', [
+    ('', 'Empty formula'),
+    ('   ', 'Empty formula'),
+    ('()', 'Invalid expression: '),
+    ('p ∧', 'Missing operand for operator ∧'),
+    ('∧ p', 'Missing operand for operator ∧'),
+    ('p ∧ ∨ q', 'Missing operand for operator ∧'),
+    ('¬', 'Missing operand for negation'),
+    ('p ¬', 'Invalid expression: p¬'),
+    ('(p', 'Invalid expression: (p'),
+    ('p)', 'Invalid expression: p)'),
+    ('(p ∧ q', 'Invalid expression: (p∧q'),
+    ('p ∧ q)', 'Invalid expression: q)'),
+    ('p ∧ (q ∨ )', 'Missing operand for operator ∨'),
+    ('(p ∧ q) r', 'Invalid expression: (p∧q)r'),
+    ('p & q', 'Invalid expression: p&q'),
+    ('p -> q', 'Invalid expression: p->q'),
+    ('((p) → (¬))', 'Missing operand for negation'),
+    ('p ∧ (q → r) ∨ %', 'Invalid expression: %'),
+    ('¬(p ∨ ) ∧ q', 'Missing operand for operator ∨'),
+    ('p → → q', 'Missing operand for operator →'),
+])
+def test_error_messages_match_the_slicing_parser(formula, message):
+    with pytest.raises(ValueError) as error:
+        WellFormedFormula(formula)
+    assert str(error.value) == message
+
+
+def test_adjacent_identifiers_are_rejected():
+    # "pq" is one identifier now, so the slicing parser's reading of
+    # "p q" no longer applies; the single pass names the formula.
+    with pytest.raises(ValueError, match='^Invalid expression: p∧qr$'):
+        WellFormedFormula('p ∧ q r')